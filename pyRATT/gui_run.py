@@ -19,6 +19,7 @@ from src.obj_simulation import Thermal_Sim_1D
 from src.obj_flightprofile import FlightProfile
 from src.obj_wallcomponents import WallStack
 from src.materials_gas import AirModel
+from src.tools_catalog import catalog_run
 
 
 """
@@ -67,6 +68,7 @@ def gui_run_simulation(values):
     wallthick       = [float(i) for i in [values["-wallthick-"]]]
     deflection      = [float(i) for i in [values["-deflection-"]]]
     aerosurf        = [values["-aerosurf_type-"]]         
+    use_run_cache   = bool(values["-run_cache-"])
     
     
     
@@ -95,7 +97,8 @@ def gui_run_simulation(values):
                                     t_step                  = t_step[i],
                                     t_end                   = t_end[i],
                                     boundary_layer_model    = 'transition',
-                                    wall_thermal_bcs        = thermal_bcs)
+                                    wall_thermal_bcs        = thermal_bcs,
+                                    use_run_cache           = use_run_cache)
 
 
         #Time Entire Simulation
@@ -114,6 +117,9 @@ def gui_run_simulation(values):
         #Pickle output to outFile
         with open(outFiles[i]+".sim", "wb") as f: pickle.dump(MySimulation, f)
 
+        #Record in the run catalog, so it can be found later (see src/tools_catalog.py)
+        catalog_run(MySimulation, result_file = outFiles[i]+".sim", name = outFiles[i])
+
         print("Done!")
 
 
@@ -194,6 +200,9 @@ Instructions:
 
     simulation_endtime_instructions = """- By default, the simulation will go until the end of the trajectory file. Use this if you want to cut the simulation short (i.e. only simulate ascent)"""
 
+    run_cache_instructions = """- If checked, re-running the exact same simulation (same inputs, trajectory contents, and pyRATT version) just loads the results from last time, instead of re-simulating.
+        - Cached runs are kept in ~/.cache/pyratt/runs (safe to delete), see src/tools_run_cache.py"""
+
     along_body_instructions = """- This should *ideally* be the boundary layer running length of the point you are looking to analyze. In other words, the length from the stagnation point to 
         the point you are looking to analyze, as measured along the body (think of it as putting a string between these two points and measuring its length).
         - However, in most cases, because nosecone and fin chamfer angles are small, you can just use axial coordinates/distances and get close enough.
@@ -252,6 +261,9 @@ Instructions:
                 #Simulation End Time Override
                 [sg.Text('Simulation End Time (s): ') , sg.InputText("optional", s=8, key='-t_end-'), sg.Text(simulation_endtime_instructions) ],
 
+                #Run Cache
+                [sg.Checkbox('Re-use Identical Runs', default=False, key='-run_cache-'), sg.Text(run_cache_instructions)],
+
 
 
                 ### SIM CONFIG PARAMETERS ###
@@ -102,7 +102,6 @@ NOTES:
 TODO : 
 - Fix Bug with Coordinates when using multi-component walls
 - Add additional Hifire heatflux comparison plots
-- Add Thermal Interface Resistances
 - Ablation Modelling
 - Expand Fin/Root Heating
 - Stagnation Point Heating
@@ -35,3 +35,13 @@ C_M = 0.2
     # Fuselage/No Sweep Wing: 0.2
     # Swept Wing: 0.1
 
+
+
+#Prandtl Number used in the Fay-Riddell Stagnation Point Heating Correlation
+FAY_RIDDELL_PR = 0.71
+
+#Sutton-Graves Stagnation Point Heating Constant for Air
+SUTTON_GRAVES_K = 1.7415e-4 #[kg^0.5/m] (SI units, q in W/m^2)
+
+#Velocity above which the high-speed form of the Tauber turbulent heating correlation is used
+TAUBER_V_SPLIT = 3962.0 #[m/s]
@@ -2,7 +2,6 @@ import numpy as np
 import scipy
 import pandas as pd
 from pathlib import Path
-from math import pow
 
 
 
@@ -20,7 +19,9 @@ class AirModel:
         file path pointing to .csv containing cp, mu, k, etc. vs. temperature for air
     Cp_interp : scipy interp1d object 
         1D interpolation lookup object for interpolating Cp at a specific temperature. 
-        Intended for use internally by specific_heat() below
+    Cp_table : numpy float 2D array
+        the Temp [K], Cp [J/KgK] lookup table, used by specific_heat() below (np.interp has much less 
+        per-call overhead than the interp1d object, which adds up in the step-by-step runs)
     
     Methods:
     -------
@@ -36,6 +37,7 @@ class AirModel:
     Notes: 
     -------
     -Only uses the .CSV lookup table for Cp. Using Sutherland expressions (Bertin) for mu and k
+    -All the property functions work on numpy arrays of temperatures too
 
     """
 
@@ -58,11 +60,21 @@ class AirModel:
 
         # Create Scipy Interpolation Object
         self.Cp_interp = scipy.interpolate.interp1d(df[:,0], df[:,1], kind='linear')
+        self.Cp_table  = np.ascontiguousarray(df[:,:2].T, dtype=float)
 
 
     def specific_heat(self, T):
-        """ Interpolates and returns Cp at T [K] using Lookup table interpolation object"""
-        return self.Cp_interp(T)
+        """ Interpolates and returns Cp at T [K] using the lookup table. Out of range temperatures raise a ValueError (like interp1d) """
+
+        T_table, Cp_table = self.Cp_table
+
+        if np.ndim(T) == 0:
+            if not T_table[0] <= T <= T_table[-1]:
+                raise ValueError(f"Temperature {T} K is outside of the air property table ({T_table[0]} to {T_table[-1]} K)")
+        elif np.min(T) < T_table[0] or np.max(T) > T_table[-1]:
+            raise ValueError(f"Temperatures are outside of the air property table ({T_table[0]} to {T_table[-1]} K)")
+
+        return np.interp(T, T_table, Cp_table)
 
 
     def thermal_conductivity(self, T):
@@ -71,7 +83,7 @@ class AirModel:
         # Using Thermal Conductivity Model Provided in Ambience Documentation
         # Appears similar to that used in 1976 Standard Atmosphere
         # Bertin Sutherland Law is Different...?
-        return (2.648151e-3 * pow(T, 3.0/2.0)) / (T + (245.4 * pow(10, -12.0/T)))
+        return (2.648151e-3 * T**(3.0/2.0)) / (T + (245.4 * 10.0**(-12.0/T)))
 
 
     def dynamic_viscosity(self, T):
@@ -79,7 +91,7 @@ class AirModel:
         
         # Sutherland Law 
         # Source: Bertin, Hypersonic Aerothermodynamics
-        return (1.458e-6 * pow(T, 3.0/2.0)) / (T + 110.4)
+        return (1.458e-6 * T**(3.0/2.0)) / (T + 110.4)
 
 
 
@@ -14,6 +14,9 @@ Notes:
 - ALL MATERIAL PROPERTIES MUST BE INPUT IN THE UNITS SPECIFIED IN 'TEMPLATE_MATERIAL'
     (kg/m^3 for density, J/KgK or J/KgC for Specific Heat, W/mK for Thermal Conductivity)
 - Any materials added here will automatically show up in the GUI
+- Ablative materials can also specify 'T_abl' [K], the surface temperature at which they start 
+    ablating, and 'h_abl' [J/kg], their (effective) heat of ablation. These are only used when a Sim is 
+    run with an ablation_model (see tools_ablation.py), and only for the exposed (first) wall component.
 - For anisotropic materials (i.e. fibreglass, carbon fiber, etc.), the thermal conductivity
     value we care about is going to be in the THROUGH-WALL or TRANSVERSE direction. 
 
@@ -108,10 +111,17 @@ MATERIALS_DICT = {
     },
 
 
-    
-
-
-    
+    # P50 Cork Sheet (Ablative)
+    'CORK_P50': {
+        # Source: manufacturer datasheets for the thermal properties. T_abl and h_abl are ROUGH ESTIMATES,
+        # pyrolysis of cork starts around 500-600C. Calibrate these against test data if you can.
+        'rho':  480.0,  #[kg/m^3] Density
+        'cp':   1900.0, #[J/KgC] Specific Heat
+        'k':    0.07,   #[W/mK]Thermal Conductivity
+        'emis': 0.8,    #[] Black Body Emissivity Coefficient - NO SOURCE, JUST PUTTING AS 0.8 AS DEFAULT
+        'T_abl': 800.0, #[K] Ablation Temperature
+        'h_abl': 2.0e6  #[J/kg] Effective Heat of Ablation
+    },
 
 
     # TEMPLATE MATERIAL, please do not actually use this material in simulations.
@@ -0,0 +1,94 @@
+"""
+Contains the prescribed (tabulated) wall boundary condition objects, for when you already have a heat flux
+or temperature history (from CFD, wind tunnel or flight data) and only need the conduction.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+
+class PrescribedBC:
+    """
+    Time-tabulated heat flux or temperature history, which can be used in place of "q_in_aerothermal" or
+    "adiabatic" for either face in Thermal_Sim_1D's wall_thermal_bcs, i.e.
+        wall_thermal_bcs = [PrescribedBC("q", "my_cfd_heatflux.csv"), "adiabatic"]
+
+    The history gets interpolated onto the simulation time grid once (see on_grid()), so the run loop just
+    indexes into it. If neither face is "q_in_aerothermal", the aero is skipped entirely.
+
+    Inputs
+    ----------
+        kind: str
+            "q" for a prescribed heat flux INTO the wall [W/m^2], or "T" for a prescribed face temperature [K]
+        filename: str, optional
+            .csv file to read the history from
+        time, values: numpy float arrays, optional
+            the history itself, if not reading it from a file
+        time_col, value_col: int or str
+            columns of the .csv with the time and the value, by position or name
+        scale: float
+            multiplies the values, for unit conversions (i.e. 1e3 for kW/m^2, like the HiFIRE heat flux data)
+        time_offset: float
+            added to the times, to line the data up with the simulation time [s]
+        **read_csv_kwargs:
+            passed on to pandas.read_csv(), i.e. header = 1 to skip a row of header (like the HiFIRE data)
+
+    Attributes
+    ----------
+        kind: str, "q" or "T"
+        time: numpy float array, tabulated times [s]
+        values: numpy float array, tabulated heat flux [W/m^2] or temperature [K]
+
+    Methods
+    -------
+    on_grid(self, t_vec)
+        returns the history interpolated onto the simulation times
+
+    Notes
+    -------
+    - Rows with missing values get dropped, so columns of different lengths in the same .csv are fine
+    - Outside of the tabulated times, the first/last values are held
+    - "T" faces are forced to the prescribed temperature at every step, and the heat flux it takes to do that 
+    is estimated and written to Sim.q_net (hot face). Not supported by the "modal" conduction solver, whose
+    modes assume heat flux faces.
+    """
+
+    def __init__(self, kind, filename = None, time = None, values = None, time_col = 0, value_col = 1,
+                    scale = 1.0, time_offset = 0.0, **read_csv_kwargs):
+
+        if kind not in ["q", "T"]:
+            raise ValueError(f'Unsupported prescribed boundary condition kind: {kind}. Use "q" or "T"')
+
+        if filename is not None:
+            df = pd.read_csv(filename, **read_csv_kwargs)
+            col = lambda c: df.iloc[:, c] if isinstance(c, int) else df[c]
+            data = pd.concat([col(time_col), col(value_col)], axis=1).apply(pd.to_numeric, errors="coerce").dropna().to_numpy()
+            time, values = data[:,0], data[:,1]
+
+        elif time is None or values is None:
+            raise ValueError("PrescribedBC needs either a filename, or the time and values arrays")
+
+        # Sorted, since np.interp needs increasing times
+        order = np.argsort(time)
+
+        self.kind       = kind
+        self.filename   = filename
+        self.time       = np.asarray(time, dtype=float)[order] + time_offset
+        self.values     = np.asarray(values, dtype=float)[order] * scale
+
+
+
+    def on_grid(self, t_vec):
+        """ Tabulated history interpolated onto the simulation times (holding the end values outside the data) """
+
+        if t_vec[0] < self.time[0] or t_vec[-1] > self.time[-1]:
+            print(f"Note: Prescribed {self.kind} history ({self.time[0]:.3g} to {self.time[-1]:.3g} s) doesn't cover the simulation "
+                    f"({t_vec[0]:.3g} to {t_vec[-1]:.3g} s), holding its end values")
+
+        return np.interp(t_vec, self.time, self.values)
+
+
+
+    def __repr__(self):
+        return f"PrescribedBC({self.kind!r}, {self.filename!r})"
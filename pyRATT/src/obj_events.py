@@ -0,0 +1,158 @@
+"""
+Contains the simulation event objects, for recording when things happen during a run (a node crossing a
+material limit, the peak temperature passing, etc.), and optionally stopping the run right there.
+See tools_events.py for how they get checked in the run loop.
+"""
+
+import numpy as np
+
+
+
+class SimEvent:
+    """
+    Something to watch for during Thermal_Sim_1D.run(), i.e.
+        Sim.run(events = [temperature_limit(450.0, nodes = -1), peak_passed()])
+
+    Works like the events in scipy's solve_ivp: the event happens when its value(Sim, i) function changes sign,
+    and the time it happened is linearly interpolated between the two timesteps on either side.
+
+    Inputs
+    ----------
+        name: str
+            name the event gets logged under
+        value: function
+            value(Sim, i) -> float, evaluated after each step at the new timestep i
+        terminal: bool
+            if True, the run stops as soon as this event happens
+        direction: int
+            +1 to only count negative-to-positive crossings, -1 positive-to-negative, 0 either
+        t_min: float
+            ignore the event before this time [s]
+
+    Attributes
+    ----------
+        last: float, value at the last timestep it was checked (None before the first check)
+        times: float list, interpolated times at which the event happened this run
+        state: dict, scratch space for value functions that need to remember things during a run (cleared by reset())
+
+    Methods
+    -------
+    reset(self)
+        clears the event for a new run
+    crossed(self, v)
+        True if going from self.last to v counts as the event happening
+    """
+
+    def __init__(self, name, value, terminal = True, direction = 0, t_min = None):
+
+        if direction not in [-1, 0, 1]:
+            raise ValueError(f"Event direction has to be -1, 0, or 1, not {direction}")
+
+        self.name       = name
+        self.value      = value
+        self.terminal   = terminal
+        self.direction  = direction
+        self.t_min      = t_min
+
+        self.reset()
+
+
+    def reset(self):
+        self.last  = None
+        self.times = []
+        self.state = {}
+
+
+    def crossed(self, v):
+
+        if self.last is None:
+            return False
+        if self.direction >= 0 and self.last < 0.0 <= v:
+            return True
+        if self.direction <= 0 and self.last > 0.0 >= v:
+            return True
+
+        return False
+
+
+    def __repr__(self):
+        return f"SimEvent({self.name!r}, terminal={self.terminal}, direction={self.direction})"
+
+
+
+def temperature_limit(T_limit, nodes = None, name = None, terminal = True):
+    """
+    Event for a wall temperature going above T_limit [K], i.e. a material or bondline limit.
+
+    Inputs:
+        T_limit:    float, temperature limit [K]
+        nodes:      int, list or slice of the wall nodes to watch (i.e. -1 for the back face). All of them if None
+        name:       str, defaults to "T > {T_limit} K"
+    """
+
+    nodes = slice(None) if nodes is None else nodes
+
+    def value(Sim, i):
+        return np.max(Sim.wall_temps[nodes, i]) - T_limit
+
+    return SimEvent(name or f"T > {T_limit:g} K", value, terminal, direction = 1)
+
+
+
+def peak_passed(node = 0, min_rise = 1.0, q_fraction = 0.2, T_drop = 1.0, name = None, terminal = True):
+    """
+    Event for the peak temperature of a node having passed, for good: the net heat flux has decayed to below 
+    q_fraction of its peak and is still falling, and the node has cooled T_drop below the hottest it got. The 
+    logged time is when all of that is true, which is a bit after the actual peak. The peak itself gets kept
+    in event.state["T_peak"] and event.state["t_peak"].
+
+    Little humps in the heating (i.e. a trajectory that eases off for a few seconds before the main heat pulse)
+    turn the node around too, but the heat flux doesn't drop off enough for them to count. 
+
+    Inputs:
+        node:       int, wall node to watch (0 is the hot wall)
+        min_rise:   float, the node has to have heated up by at least this much first [K], so that little
+                    wiggles before the heating starts don't count
+        q_fraction: float, the net heat flux has to be below this fraction of its peak so far
+        T_drop:     float, how far below its peak the node has to have cooled [K]
+    """
+
+    event = SimEvent(name or f"node {node} peak", None, terminal, direction = -1)
+
+    def value(Sim, i):
+
+        # Heat flux isn't evaluated at i yet, so go by the step before it
+        q = Sim.q_net[i-1]
+        q_last = event.state.get("q_last", q)
+        event.state["q_last"] = q
+        event.state["q_peak"] = max(event.state.get("q_peak", q), q)
+
+        T = Sim.wall_temps[node]
+        if T[i] > event.state.get("T_peak", -np.inf):
+            event.state["T_peak"] = T[i]
+            event.state["t_peak"] = Sim.t_vec[i]
+
+        # How far the node is above its "peak has passed" temperature
+        margin = T[i] - (event.state["T_peak"] - T_drop)
+
+        # Only "counts" once the node heated up and the heating is dying off, otherwise held positive so a 
+        # crossing can happen later
+        decaying = event.state["T_peak"] - T[0] >= min_rise and q < q_fraction*event.state["q_peak"] and q < q_last
+        return margin if decaying else abs(margin) + 1e-12
+
+    event.value = value
+    return event
+
+
+
+def steady_state(rate_tol = 0.01, name = None, terminal = True):
+    """
+    Event for the wall reaching steady state, when every node's temperature is changing by less than
+    rate_tol [K/s]. Only counts once the wall has been changing faster than that (so not sitting on the pad).
+    """
+
+    def value(Sim, i):
+        rate = np.max(np.abs(Sim.wall_temps[:, i] - Sim.wall_temps[:, i-1])) / (Sim.t_vec[i] - Sim.t_vec[i-1])
+        return rate - rate_tol
+
+    return SimEvent(name or "steady state", value, terminal, direction = -1)
@@ -1,4 +1,6 @@
-import pandas as pd
+import copy
+from bisect import bisect_right
+
 import numpy as np
 import scipy
 
@@ -9,7 +11,8 @@ from typing import Optional
 # https://ambiance.readthedocs.io/en/latest/index.html
 from ambiance import Atmosphere
 
-from . import constants
+from .tools_trajectory_cache import load_cached_trajectory
+from .tools_trajectory_readers import read_trajectory, detect_reader, clean_trajectory, reader_version
 
 
 class FlightProfile:
@@ -21,20 +24,33 @@ class FlightProfile:
     Attributes:
     ----------
     trajectory_file : string 
-        filename/path to external trajectory file
+        filename/path to external trajectory file (None if made with from_arrays())
+    reader : string
+        trajectory file reader, i.e. "rasaero", "openrocket", "csv", see tools_trajectory_readers.py. Detected from the file if None
+    reader_options : dict
+        any options for the reader, i.e. the column mapping for the "csv" reader
     time_raw : numpy array
         array containing raw time values contained in the flight trajectory file
     mach_raw : numpy array
         array containing raw mach values contained in the flight trajectory file
     alt_raw : numpy array
         array containing raw altitude values contained in the flight trajectory file
-    mach_raw_interp : scipy interp1d object
-        interpolation object to interpolate upon raw_time-raw_mach to get mach values at any time in the trajectory
-    alt_raw_interp : scipy interp1d object
-        interpolation object to interpolate upon raw_time-raw_alt to get alt values at any time in the trajectory
+    interpolation : string
+        how the trajectory gets interpolated between the raw points, "linear" (np.interp) or "pchip" (monotone cubic, 
+        smoother rates for the adaptive solvers, and doesn't overshoot)
+    extra_columns : str list
+        any additional (numeric) trajectory file columns to pull out, i.e. ["Velocity (ft/sec)"]
+    extra : dict
+        {column name: numpy array} of the extra columns (raw, as in the file)
+    use_cache : bool
+        if the parsed trajectory gets loaded from/saved to the binary trajectory cache (see tools_trajectory_cache.py)
+    mach_scale : float
+        Mach number scale factor, see scaled()
 
     Methods:
     -------
+    from_arrays(time, mach, alt, extra = None)
+        Make a FlightProfile straight from numpy arrays (no file), i.e. for sweeps/Monte Carlo
     RAS_traj_CSV_Parse(self, trajectory_filepath)
         Parse the RASAero Flight Trajectory .csv and pull Time, Mach, and Alt
     get_sim_time_properties(self, t_sim_vec)
@@ -42,42 +58,159 @@ class FlightProfile:
         in the arbitrary RASAero or Flight Traj. CSV time, and aligns them with the Simulation time step and time vector
     get_current_state(self, curr_time)
         Interpolate Mach and Alt to whatver the current time is, return this M-Alt state
+    sample(self, t)
+        Interpolate Mach, Alt, velocity and dynamic pressure to a time or array of times (dense output)
+    scaled(self, mach_scale)
+        Returns a copy of this FlightProfile with the Mach numbers scaled, i.e. for "hotter" or "cooler" trajectories
 
 
     Notes:
     -------
-    - Only "officially" supports RASAero files rn, but if you manipulate an arbitrary .CSV files
-    to have the same units and column names specified below it'll read in just fine
+    - Reads RASAero and OpenRocket .csv exports, plus arbitrary .csv/.parquet files with a column mapping, i.e.
+        FlightProfile("traj.csv", reader = "csv", reader_options = {"time": "t", "mach": "M", "alt": "h"})
+    See tools_trajectory_readers.py for the reader options, and for adding new readers
 
     """
 
-    def __init__(self, trajectory_file):
+    def __init__(self, trajectory_file, extra_columns: Optional[list] = None, use_cache = True, cache_dir: Optional[str] = None,
+                    reader: Optional[str] = None, reader_options: Optional[dict] = None, interpolation = "linear"):
         
         self.trajectory_file = trajectory_file
+        self.extra_columns   = list(extra_columns) if extra_columns else []
+        self.reader          = reader if reader is not None else detect_reader(trajectory_file)
+        self.reader_options  = dict(reader_options) if reader_options else {}
+        self.use_cache       = use_cache
+        self.cache_dir       = cache_dir
+        self.mach_scale      = 1.0
+        self.interpolation   = interpolation
+
+        self.load_trajectory()
+
+
+    def load_trajectory(self):
+        """ 
+        Parses (or loads from the trajectory cache) the trajectory file, and sets up the interpolation objects 
+
+        With the cache, the arrays are read-only memory-maps, so be sure to copy them before modifying them in-place
+        """
+
+        # Parsed, unit converted columns, data[column, row]
+        if self.use_cache:
+            # (the reader's code version too, so changes to the parsing don't get stale cached trajectories)
+            key_columns = [self.reader, reader_version(self.reader), sorted(self.reader_options.items())] + self.extra_columns
+            data = load_cached_trajectory(self.trajectory_file, key_columns, self.parse_trajectory, self.cache_dir)
+        else:
+            data = self.parse_trajectory(self.trajectory_file)
+
+        self.set_trajectory_data(data)
+
+
+    def set_trajectory_data(self, data):
+        """ Sets the raw trajectory arrays from a 2D array of time, Mach, Alt[m] and any extra columns, data[column, row] """
 
         #Create time, mach, and alt numpy arrays
-        self.time_raw, self.mach_raw, self.alt_raw = self.RAS_traj_CSV_Parse(trajectory_file)
+        self.time_raw, self.mach_raw, self.alt_raw = data[0], data[1], data[2]
+        self.extra = dict(zip(self.extra_columns, data[3:]))
+
+        self.reset_interpolation()
+
+
+    def reset_interpolation(self):
+        """ 
+        Clears the lazily-built interpolation data, call this if the raw arrays get changed.
+
+        Linear interpolation is just np.interp on the raw arrays (much less per-call overhead than the scipy interp1d 
+        objects this used to use), the rest gets built the first time it's needed:
+            _pchip:         monotone cubic interpolants of Mach and Alt, if interpolation = "pchip"
+            _derived_raw:   velocity and dynamic pressure at the raw points (standard atmosphere)
+            _raw_lists:     the raw time, Mach and Alt as plain python lists, for the scalar get_current_state() 
+                            (bisect + lerp on floats is a few times quicker than a numpy call for single points)
+        """
+
+        if self.interpolation not in ["linear", "pchip"]:
+            raise ValueError(f'Unsupported trajectory interpolation: {self.interpolation}. Use "linear" or "pchip"')
+
+        self._pchip = None
+        self._derived_raw = None
+        self._raw_lists = None
+
+
+    @classmethod
+    def from_arrays(cls, time, mach, alt, extra: Optional[dict] = None, interpolation = "linear"):
+        """
+        Makes a FlightProfile straight from arrays, instead of a trajectory file (nothing gets cached).
+
+        Inputs:
+            time:   numpy float array, time [s]
+            mach:   numpy float array, Mach number []
+            alt:    numpy float array, altitude [m]
+            extra:  dict, optional. {name: numpy float array} of any extra columns, see Attributes
+            interpolation:  str, see Attributes
+        """
+
+        extra = extra if extra else {}
+
+        Flight = cls.__new__(cls)
+        Flight.trajectory_file = None
+        Flight.extra_columns   = list(extra)
+        Flight.reader          = None
+        Flight.reader_options  = {}
+        Flight.use_cache       = False
+        Flight.cache_dir       = None
+        Flight.mach_scale      = 1.0
+        Flight.interpolation   = interpolation
+
+        data = np.vstack([np.asarray(v, dtype=float) for v in [time, mach, alt] + list(extra.values())])
+        Flight.set_trajectory_data(clean_trajectory(data))
 
-        #Create interpolation functions for both Mach and Alt, so we don't have to create these every time we want to interpolate (which we do a lot)
-        self.mach_raw_interp = scipy.interpolate.interp1d(self.time_raw, self.mach_raw, kind='linear')
-        self.alt_raw_interp  = scipy.interpolate.interp1d(self.time_raw, self.alt_raw, kind='linear')
+        return Flight
+
+
+    def parse_trajectory(self, trajectory_filepath):
+        """Parse the trajectory file with this FlightProfile's reader, return a 2D array of Time, Mach, Alt[m] and any extra columns, data[column, row]"""
+
+        return read_trajectory(trajectory_filepath, self.reader, self.extra_columns, **self.reader_options)
 
 
     def RAS_traj_CSV_Parse(self, trajectory_filepath):
         """Parse RASAero Flight Trajectory .csv and return Time, Mach, and Alt[m] numpy vectors"""
 
-        #Parse the Trajectory CSV file for Mach, Alt, Time, etc. into a Pandas Dataframe
-        df = pd.read_csv(trajectory_filepath, usecols=['Time (sec)', 'Mach Number', 'Altitude (ft)'])
+        data = self.RAS_traj_CSV_Parse_Array(trajectory_filepath)
+
+        return data[0], data[1], data[2]
+
+
+    def RAS_traj_CSV_Parse_Array(self, trajectory_filepath):
+        """Parse RASAero Flight Trajectory .csv, and return a 2D array of the Time, Mach, Alt[m] and any extra columns, data[column, row]"""
+
+        return read_trajectory(trajectory_filepath, "rasaero", self.extra_columns)
+
+
+    def __getstate__(self):
+        """ 
+        For pickling (i.e. sending to worker processes). Cached trajectories don't send their arrays along, the 
+        workers just re-load (memory-map) them from the cache, so they all share the same memory.
+        """
+
+        state = self.__dict__.copy()
+
+        if self.use_cache:
+            for name in ["time_raw", "mach_raw", "alt_raw", "extra", "_pchip", "_derived_raw", "_raw_lists"]:
+                state.pop(name, None)
 
+        return state
 
-        # Mach = 0.0 breaks a lot of the math later so just overwriting it here with a small value
-        df["Mach Number"].replace(to_replace = 0, value = 0.001, inplace=True)
 
-        #Convert Pandas Dataframe Object to a Numpy Array
-        df = df.to_numpy()
+    def __setstate__(self, state):
 
-        #Split array into Time, Mach, and Altitude Vectors and Return
-        return df[:,0], df[:,1], df[:,2]*constants.FT2M
+        self.__dict__.update(state)
+
+        if "time_raw" not in state:
+            self.load_trajectory()
+
+            if self.mach_scale != 1.0:
+                self.mach_raw = self.mach_raw * self.mach_scale
+                self.reset_interpolation()
 
 
     def get_sim_time_properties(self, t_sim_vec):
@@ -87,8 +220,7 @@ class FlightProfile:
         """
 
         #Interpolate Mach and altitude to Sim-time
-        mach = self.mach_raw_interp(t_sim_vec)
-        alt = self.alt_raw_interp(t_sim_vec)
+        mach, alt = self.interpolate(t_sim_vec)
 
         # Check if Clipping is needed, then Clip alt vector
         # Ambience can only handle values from [-5004 81020] m. 
@@ -103,28 +235,78 @@ class FlightProfile:
 
 
     def get_current_state(self, curr_time):
-        """Interpolate Mach and Alt to whatver the current time is, return this Mach, Alt state"""
-
-        return self.mach_interp(curr_time), self.alt_interp(curr_time)
+        """Interpolate Mach and Alt to whatver the current time is, return this Mach, Alt state (floats)"""
 
+        if self.interpolation != "linear":
+            return self.interpolate(float(curr_time))
 
+        if self._raw_lists is None:
+            self._raw_lists = (self.time_raw.tolist(), self.mach_raw.tolist(), self.alt_raw.tolist())
 
+        time_raw, mach_raw, alt_raw = self._raw_lists
 
+        if not time_raw[0] <= curr_time <= time_raw[-1]:
+            raise ValueError(f"Time {curr_time} s is outside of the trajectory ({time_raw[0]} to {time_raw[-1]} s)")
 
+        # Bracketing raw points, and linear interpolation between them
+        j = min(bisect_right(time_raw, curr_time), len(time_raw) - 1)
+        dt = time_raw[j] - time_raw[j-1]
+        w = (curr_time - time_raw[j-1]) / dt if dt > 0.0 else 1.0
 
+        return mach_raw[j-1] + w*(mach_raw[j] - mach_raw[j-1]), alt_raw[j-1] + w*(alt_raw[j] - alt_raw[j-1])
 
 
+    def interpolate(self, t):
+        """
+        Interpolates Mach and Alt [m] to a time, or array of times [s]. Times outside of the trajectory raise a 
+        ValueError (like the old interp1d objects did), rather than quietly holding the end values.
+        """
 
-    
+        if np.ndim(t) == 0:
+            if not self.time_raw[0] <= t <= self.time_raw[-1]:
+                raise ValueError(f"Time {t} s is outside of the trajectory ({self.time_raw[0]} to {self.time_raw[-1]} s)")
+        elif np.size(t) > 0 and (np.min(t) < self.time_raw[0] or np.max(t) > self.time_raw[-1]):
+            raise ValueError(f"Times ({np.min(t)} to {np.max(t)} s) are outside of the trajectory ({self.time_raw[0]} to {self.time_raw[-1]} s)")
 
+        if self.interpolation == "linear":
+            return np.interp(t, self.time_raw, self.mach_raw), np.interp(t, self.time_raw, self.alt_raw)
 
+        if self._pchip is None:
+            self._pchip = scipy.interpolate.PchipInterpolator(self.time_raw, np.vstack([self.mach_raw, self.alt_raw]), axis=1, extrapolate=False)
 
+        mach, alt = self._pchip(t)
+        return (float(mach), float(alt)) if np.ndim(t) == 0 else (mach, alt)
 
 
+    def sample(self, t):
+        """
+        Dense output of the trajectory, at a time or array of times. Velocity and dynamic pressure come from the 
+        Mach number and the standard atmosphere, evaluated once at the raw trajectory points and then interpolated,
+        so this stays cheap enough to call at every step/stage of the adaptive or event-driven solvers.
+
+        Inputs:
+            t:      float or numpy float array, time(s) [s]
+        Outputs:
+            state:  dict, of floats or numpy arrays (same shape as t):
+                        "mach"      Mach number []
+                        "alt"       altitude [m]
+                        "velocity"  velocity [m/s]
+                        "q_dyn"     dynamic pressure [Pa]
+        """
 
+        mach, alt = self.interpolate(t)
 
+        if self._derived_raw is None:
+            atmos = Atmosphere(np.clip(self.alt_raw, -5004, 81020))
+            velocity = self.mach_raw * atmos.speed_of_sound
+            self._derived_raw = (np.ravel(velocity), np.ravel(0.5 * atmos.density * velocity**2))
 
+        velocity_raw, q_dyn_raw = self._derived_raw
 
+        return {"mach":     mach, 
+                "alt":      alt, 
+                "velocity": np.interp(t, self.time_raw, velocity_raw), 
+                "q_dyn":    np.interp(t, self.time_raw, q_dyn_raw)}
 
 
 
@@ -134,10 +316,21 @@ class FlightProfile:
 
 
 
+    
 
 
 
+    def scaled(self, mach_scale):
+        """
+        Returns a copy of this FlightProfile with all the Mach numbers multiplied by mach_scale (same times and 
+        altitudes). Crude, but handy as a single knob for how hot a trajectory is, i.e. for sweeps and surrogates.
+        """
 
+        Scaled = copy.copy(self)
 
+        Scaled.mach_scale = self.mach_scale * mach_scale
+        Scaled.mach_raw = self.mach_raw * mach_scale
+        Scaled.reset_interpolation()
 
+        return Scaled
 
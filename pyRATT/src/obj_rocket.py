@@ -18,14 +18,19 @@
 |___||_|  |_|_| |____|___|_|  |_|___|_|\_|  |_| |___|___/    |_| |___| |_|    
                                                                               
 
-(this is not implemented yet)
+(this is mostly not implemented yet)
 
 
 This will be used for the automated parsing of RASAero files. Still not sure if super necessary 
 feature. But idk, if I start needing more geometric properties ill throw them here
 
+Currently the nosecone tip radius is used for stagnation point heating, see tools_stations.run_stations()
 """
 
+from typing import Optional
+
+from . import constants
+
 
 
 class Rocket:
@@ -42,12 +47,14 @@ class Rocket:
     nosecone_angle_rad : float
         angle of nosecone half angle, in rad
     nosecone_tip_radius : float
-        nosecone tip radius (i assume in m but i haven't implemented yet)
+        nosecone tip radius [m], used for stagnation point heating of the tip
     nosecone_surface_roughness : float
         nosecone surface roughness (not yet implemented)
     
     Methods
     -------
+    tip_station(self, aerothermal_model = "fay_riddell")
+        Returns the simulation settings for the nosecone tip, for tools_stations.run_stations()
 
     Notes
     -------
@@ -57,8 +64,6 @@ class Rocket:
     #High-level geometrical specification of Rocket shape n whatnot
     def __init__(self, nosecone_half_angle_deg, RAS_Filename: Optional[str] = None, nosecone_tip_radius: Optional[float] = None, nosecone_surface_roughness: Optional[float] = None):
 
-        print("NOT YET IMPLEMENTED")
-
         self.nosecone_angle_deg     = nosecone_half_angle_deg                           #Degrees
         self.nosecone_angle_rad     = nosecone_half_angle_deg * constants.DEG2RAD     #Radians
         self.nosecone_tip_radius    = nosecone_tip_radius
@@ -69,6 +74,15 @@ class Rocket:
             raise NotImplementedError("RAS CDX1 Parsing not yet implemented")
             #self.nosecone_angle, etc. = self.parse_RAS(RAS_Filename)
 
+    def tip_station(self, aerothermal_model = "fay_riddell"):
+        """ Simulation settings for the stagnation point of the nosecone tip, for tools_stations.run_stations() """
+
+        if self.nosecone_tip_radius is None:
+            raise ValueError("Rocket.nosecone_tip_radius needs to be specified for stagnation point heating")
+
+        return {"aerothermal_model": aerothermal_model, "nose_radius": self.nosecone_tip_radius}
+
+
     # def parse_RAS(RAS_Filename):
     #     raise NotImplementedError()
 
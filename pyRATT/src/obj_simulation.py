@@ -11,8 +11,22 @@ from os import path
 
 
 from . import constants
-from .tools_aerotherm import aerothermal_heatflux, get_net_heat_flux
-from .tools_conduction import get_new_wall_temps, stability_criterion_check
+from .tools_aerotherm import aerothermal_heatflux, get_net_heat_flux, get_heating_model, STAGNATION_HEATING_MODELS
+from .tools_aero import get_stagnation_history
+from .tools_conduction import get_new_wall_temps, stability_criterion_check, implicit_lhs_banded, modal_truncation_error
+from .tools_autoconfig import auto_configure
+from .tools_ablation import initialize_ablation, ablation_step
+from .tools_lumped import run_lumped
+from .obj_boundaryconditions import PrescribedBC
+from .tools_duhamel import run_duhamel
+from .tools_waveform import run_waveform
+from .tools_online import start_online, advance_to, online_history
+from .tools_phases import initialize_phases, quiet_phase_step
+from .tools_events import initialize_events, check_events, truncate_results
+from .tools_stats import initialize_stats, update_stats, history_stats, discard_history
+from .tools_energy import initialize_energy, update_energy, check_energy, history_energy
+from .tools_run_cache import load_cached_run, save_cached_run
+from .tools_catalog import catalog_run
 
 # Standard Atmosphere Model/Package (CANT HANDLE HIGH-ALT)
 # https://ambiance.readthedocs.io/en/latest/index.html
@@ -67,7 +81,8 @@ class Thermal_Sim_1D:
             values if not specified. 
         aerothermal_model : string
             used to specify which aerothermal heating equations/models are utilized
-            see tools_aerotherm.aerothermal_heatflux() for supported values 
+            see tools_aerotherm.aerothermal_heatflux() for supported values. New models can be
+            added with the tools_aerotherm.register_heating_model() decorator
         bound_layer_model : string
             used to specify the boundary layer behavior (laminar, turbulent, transition)
             see tools_aerotherm.aerothermal_heatflux() for supported values
@@ -78,6 +93,58 @@ class Thermal_Sim_1D:
             is what allows for modelling of both nosecones and fins. Default behavior is the 
             nosecone implementation, with ["q_in_aerothermal","adiabatic"]. The current specification
             for a fun simulation would be ["q_in_aerothermal",q_in_aerothermal"]
+            Either face can also be an obj_boundaryconditions.PrescribedBC, a tabulated heat flux or temperature
+            history (i.e. from CFD or flight data). If neither face is "q_in_aerothermal", the aero is skipped
+            entirely (conduction only), and Flight/AirModel can be None.
+        conduction_solver: string
+            which conduction solver to use to march the wall temperatures forward in time. 
+            "explicit" (forward Euler, default), the higher order explicit Runge-Kutta solvers "rk2", "rk4", 
+            "rk23" (adaptive) and "rkc" (Runge-Kutta-Chebyshev, for big steps on fine meshes), or "implicit" 
+            (backward Euler, unconditionally stable), or "modal" (reduced-order, exact integration of the slowest 
+            wall modes). See tools_conduction.get_new_wall_temps()
+        integrator_tol: float
+            local error tolerance [K] for the adaptive "rk23" solver
+        modal_count: int
+            number of wall modes kept by the "modal" solver
+        surface_coupling: string
+            how the convection and radiation at the exposed face(s) are coupled to the conduction solve. 
+            "explicit" (default) evaluates them at the old wall temperature. "semi_implicit" linearizes them about 
+            the wall temperature and solves them implicitly along with the conduction, which allows much bigger 
+            timesteps at peak heating. Only for the "explicit" and "implicit" solvers. 
+            See tools_conduction.semi_implicit_wall_temps()
+        newton_iterations: int
+            number of extra re-linearizations of the surface heat flux per step for "semi_implicit" coupling
+        nose_radius: float
+            nose tip (or leading edge) radius [m], needed by the stagnation point heating models 
+            ("fay_riddell", "sutton_graves", "swept_cylinder")
+        sweep_angle_deg: float
+            leading edge sweep angle, in degrees, for the "swept_cylinder" heating model
+        ablation_model: string
+            surface recession model for an ablative first wall component, "heat_of_ablation" or "steady_state".
+            None (default) for no ablation. See tools_ablation.py
+        ablation_temp: float
+            ablation temperature [K], overrides the material's 'T_abl'
+        heat_of_ablation: float
+            heat of ablation [J/kg], overrides the material's 'h_abl'
+        quiet_step: float
+            big timestep [s] for the "quiet" (negligible heating) phases of the trajectory, i.e. on the pad, subsonic
+            coast, or under parachute. None (default) to always use t_step. See tools_phases.py
+        quiet_thresholds: dict
+            overrides for the quiet phase thresholds, {"mach", "qbar" [Pa], "q_conv" [W/m^2] (heating), "dT" [K]}, see tools_phases.QUIET_THRESHOLDS
+        T_limit: float
+            temperature limit [K] for the time-above-limit summary statistic (Sim.stats["time_above_limit"])
+        store_history: bool
+            if False, the per-step result arrays get dropped at the end of a run, and only the summary 
+            statistics (Sim.stats) are kept, i.e. for big sweeps. See tools_stats.py
+        energy_tol: float
+            if specified, the run fails fast (raises) when the energy conservation drift (Sim.energy["drift"]) goes 
+            over this (as a fraction), or the wall temperatures go unphysical from the solver going unstable. 
+            See tools_energy.py
+        use_run_cache: bool
+            if True, re-running an identical simulation (same configuration, trajectory, run options and code) loads 
+            the results from the run cache instead of re-simulating. Off by default. See tools_run_cache.py
+        run_cache_dir: str
+            run cache directory, see tools_run_cache.get_run_cache_dir()
     
     Results, Data
         mach : numpy float array
@@ -100,6 +167,16 @@ class Thermal_Sim_1D:
             flow recovery temperature at each time step 
         wall_temps : numpy float 2D array
             2D array, wall_temps[k,i], where k is the element number (0 is exposed/hot wall, -1 is interior wall for nosecone), and i is the simulation timestep
+        recession : numpy float 1D array
+            surface recession (ablation) at each time step [m]
+        stats : dict
+            summary statistics (peak temperatures, heat load, etc.), accumulated as the simulation runs, see tools_stats.py
+        energy : dict
+            energy conservation ledger (heat in through the faces vs. change in stored wall energy), see tools_energy.py
+        runtime : float
+            wall-clock time the last run took [s] (of the original run, if it was loaded from the run cache)
+        run_method : string
+            which run method was last used ("run", "run_waveform", "run_duhamel", "run_lumped")
         ...
          
 
@@ -107,10 +184,22 @@ class Thermal_Sim_1D:
     -------
     sim_initialize(self)
         Initializes simulation variables, both those required for sim, as well as empty result arrays
-    run(self)
-        Runs the simulation
+    get_config(self)
+        Returns the constructor arguments of the simulation, so modified copies can be made
+    auto_configure(self, **kwargs)
+        Picks the wall node counts and timestep automatically (see tools_autoconfig.auto_configure())
+    run(self, events = None)
+        Runs the simulation, optionally watching for events (and stopping early on them), see obj_events.py
+    run_duhamel(self, **kwargs)
+        Runs the simulation with the response-function (Duhamel convolution) engine, see tools_duhamel.py
+    run_waveform(self, **kwargs)
+        Runs the simulation by waveform relaxation over the whole trajectory at once, see tools_waveform.py
+    start_online(self, t0, mach0, alt0, **kwargs), advance_to(self, t, mach, alt), online_history(self)
+        Incremental simulation, with (t, mach, alt) samples pushed in as they arrive, see tools_online.py
     export_data_to_csv(self, out_filename = None)
         Exports specific data from the simulation to a .csv file
+    add_to_catalog(self, result_file = None, name = None, catalog = None)
+        Records the run (configuration, summary metrics, result file) in the run catalog, see tools_catalog.py
 
 
     Notes
@@ -132,7 +221,24 @@ class Thermal_Sim_1D:
         aerothermal_model = 'default',
         boundary_layer_model = 'turbulent',
         shock_type = 'oblique',
-        wall_thermal_bcs = ["q_in_aerothermal","adiabatic"]
+        wall_thermal_bcs = ["q_in_aerothermal","adiabatic"],
+        conduction_solver = 'explicit',
+        integrator_tol = 0.01,
+        modal_count = 8,
+        surface_coupling = 'explicit',
+        newton_iterations = 0,
+        nose_radius = None,
+        sweep_angle_deg = 0.0,
+        ablation_model = None,
+        ablation_temp = None,
+        heat_of_ablation = None,
+        quiet_step = None,
+        quiet_thresholds = None,
+        T_limit = None,
+        store_history = True,
+        energy_tol = None,
+        use_run_cache = False,
+        run_cache_dir = None
         #gas_model = 'air_standard'
     ):
         
@@ -151,6 +257,23 @@ class Thermal_Sim_1D:
         self.bound_layer_model      = boundary_layer_model
         self.shock_type             = shock_type
         self.wall_thermal_bcs       = wall_thermal_bcs
+        self.conduction_solver      = conduction_solver
+        self.integrator_tol         = integrator_tol
+        self.modal_count            = modal_count
+        self.surface_coupling       = surface_coupling
+        self.newton_iterations      = newton_iterations
+        self.nose_radius            = nose_radius
+        self.sweep_angle_deg        = sweep_angle_deg
+        self.ablation_model         = ablation_model
+        self.ablation_temp          = ablation_temp
+        self.heat_of_ablation       = heat_of_ablation
+        self.quiet_step             = quiet_step
+        self.quiet_thresholds       = quiet_thresholds
+        self.T_limit                = T_limit
+        self.store_history          = store_history
+        self.energy_tol             = energy_tol
+        self.use_run_cache          = use_run_cache
+        self.run_cache_dir          = run_cache_dir
         #self.gas_model          = gas_model
 
         #Get Vector of Wall Nodal Coordinates
@@ -167,7 +290,12 @@ class Thermal_Sim_1D:
 
         # Generate Time Vector
         # if t_end not specified, use last value in flightsim .csv. otherwise, end at t_end
-        if self.t_end is None:
+        # (with no trajectory or prescribed B.C.s to end at either, it's just a single step, i.e. for online runs, see start_online())
+        if self.t_end is None and self.Flight is None and not any(isinstance(bc, PrescribedBC) for bc in self.wall_thermal_bcs):
+            self.t_vec = self.t_start + np.array([0.0, self.t_step])
+        elif self.t_end is None and self.Flight is None:
+            self.t_vec = np.arange(self.t_start, min(bc.time[-1] for bc in self.wall_thermal_bcs if isinstance(bc, PrescribedBC)), self.t_step)
+        elif self.t_end is None:
             self.t_vec = np.arange(self.t_start, self.Flight.time_raw[-1], self.t_step)
         else:
             self.t_vec = np.arange(self.t_start, self.t_end, self.t_step)
@@ -212,14 +340,134 @@ class Thermal_Sim_1D:
         #Set Initial Values for Wall Temperature at First Step
         self.wall_temps[:,0] = self.initial_temp
 
+        # Stability warning only gets printed once per run
+        self.stability_warned = False
+
+        # Adaptive "rk23" solver starts out trying full timesteps
+        self.rk23_substep = self.t_step
+
+        # Wall-temperature-independent aero results, cached by the whole-trajectory (vectorized) heating models
+        self.aero_history_cache = None
+
+        # Step-by-step runs rootsolve the oblique shock angle (online runs use the closed-form solution, see tools_online.py)
+        self.closed_form_shock = False
+
+
+        # Prescribed boundary conditions, interpolated onto the Sim-time points once here (None if there aren't any)
+        self.bc_histories = None
+        self.aerothermal  = self.wall_thermal_bcs[0] == "q_in_aerothermal"
+
+        if self.wall_thermal_bcs[1] == "q_in_aerothermal" and not self.aerothermal:
+            raise ValueError('The second B.C. can only be "q_in_aerothermal" if the first one is too')
+
+        if any(isinstance(bc, PrescribedBC) for bc in self.wall_thermal_bcs):
+            self.bc_histories = [bc.on_grid(self.t_vec) if isinstance(bc, PrescribedBC) else None for bc in self.wall_thermal_bcs]
+
+            for face, node in [(0, 0), (1, -1)]:
+                if self.bc_histories[face] is not None and self.wall_thermal_bcs[face].kind == "T":
+                    self.wall_temps[node,0] = self.bc_histories[face][0]
+            if self.bc_histories[0] is not None and self.wall_thermal_bcs[0].kind == "q":
+                self.q_net[:] = self.bc_histories[0]
+
+            # Forcing a face node after a modal step leaves its neighbors stepped as if the face were still free
+            if self.conduction_solver == "modal" and any(isinstance(bc, PrescribedBC) and bc.kind == "T" for bc in self.wall_thermal_bcs):
+                raise ValueError('Prescribed temperature B.C.s are not supported by the "modal" conduction solver, use "implicit"')
 
         # Pre-interpolate Mach, Altitude, and Atmospheric Properties to the discrete Sim-time points 
-        self.mach, self.alt = self.Flight.get_sim_time_properties(self.t_vec)
+        if self.Flight is not None:
+            self.mach, self.alt = self.Flight.get_sim_time_properties(self.t_vec)
+        else:
+            self.mach, self.alt = np.zeros(self.t_vec_size), np.zeros(self.t_vec_size)
+
+        # Resolve the aerothermal heating model once here, rather than at every step
+        self.heating_model = get_heating_model(self)
+
+        # Stagnation point states over the whole trajectory, looked up once here too (per-step models just index into it)
+        self.stagnation_history = None
+        if self.aerothermal and self.aerothermal_model in STAGNATION_HEATING_MODELS:
+            get_stagnation_history(self)
+
+        # Check the surface coupling option up front, rather than at every step
+        if self.surface_coupling not in ["explicit", "semi_implicit"]:
+            raise ValueError(f"Unsupported surface coupling specified: {self.surface_coupling}")
+        if self.surface_coupling == "semi_implicit" and self.conduction_solver not in ["explicit", "implicit"]:
+            raise ValueError('"semi_implicit" surface coupling is only supported by the "explicit" and "implicit" conduction solvers')
+
+        # Reset the wall to un-ablated, and check the ablation settings (before any wall-dependent setup below)
+        initialize_ablation(self)
+
+        # Pick out the quiet phases of the trajectory, if they're being skipped through
+        initialize_phases(self)
+
+        # Implicit solver matrix only depends on the wall and timestep, so build it once here (ablation rebuilds it as the wall recedes)
+        if self.conduction_solver == "implicit":
+            self.implicit_lhs = implicit_lhs_banded(self.Aerosurface, self.t_step)
+
+        # Let the user know how much the modal solver is leaving on the table
+        if self.conduction_solver == "modal":
+            self.modal_truncation_error = modal_truncation_error(self.Aerosurface, self.modal_count, self.wall_thermal_bcs)
+            print(f"Modal solver: keeping {min(self.modal_count, self.Aerosurface.n_tot)} of {self.Aerosurface.n_tot} wall modes, "
+                    f"truncation error ~{self.modal_truncation_error*1e5:.3g} K per 100 kW/m^2 of heat flux")
 
     
 
 
-    def run(self):
+    def get_config(self):
+        """
+        Returns the arguments this simulation was constructed with, as a dict, such that
+        Thermal_Sim_1D(**Sim.get_config()) re-creates it (un-run). 
+
+        Handy for making modified copies of a simulation for refinement studies, sweeps, etc. i.e.
+            config = Sim.get_config()
+            config["t_step"] = 0.001
+            FinerSim = Thermal_Sim_1D(**config)
+        """
+
+        return {    "Aerosurface":          self.Aerosurface,
+                    "Flight":               self.Flight,
+                    "AirModel":             self.AirModel,
+                    "x_location":           self.x_location,
+                    "deflection_angle_deg": self.deflection_angle_deg,
+                    "t_step":               self.t_step,
+                    "t_start":              self.t_start,
+                    "t_end":                self.t_end,
+                    "initial_temp":         self.initial_temp,
+                    "aerothermal_model":    self.aerothermal_model,
+                    "boundary_layer_model": self.bound_layer_model,
+                    "shock_type":           self.shock_type,
+                    "wall_thermal_bcs":     self.wall_thermal_bcs,
+                    "conduction_solver":    self.conduction_solver,
+                    "integrator_tol":       self.integrator_tol,
+                    "modal_count":          self.modal_count,
+                    "surface_coupling":     self.surface_coupling,
+                    "newton_iterations":    self.newton_iterations,
+                    "nose_radius":          self.nose_radius,
+                    "sweep_angle_deg":      self.sweep_angle_deg,
+                    "ablation_model":       self.ablation_model,
+                    "ablation_temp":        self.ablation_temp,
+                    "heat_of_ablation":     self.heat_of_ablation,
+                    "quiet_step":           self.quiet_step,
+                    "quiet_thresholds":     self.quiet_thresholds,
+                    "T_limit":              self.T_limit,
+                    "store_history":        self.store_history,
+                    "energy_tol":           self.energy_tol,
+                    "use_run_cache":        self.use_run_cache,
+                    "run_cache_dir":        self.run_cache_dir }
+
+
+
+    def auto_configure(self, **kwargs):
+        """
+        Picks the wall node counts and timestep from a quick cold-wall heating pre-pass, 
+        instead of having to guess-and-check them. Re-initializes the simulation. 
+
+        See tools_autoconfig.auto_configure() for the available options (T_tolerance, etc.)
+        """
+        return auto_configure(self, **kwargs)
+
+
+
+    def run(self, events = None):
         """ 
         High-level Simulation Run Loop
 
@@ -227,18 +475,55 @@ class Thermal_Sim_1D:
         All (most of, actually) the data initialized in sim_initialize gets 
         written to from within the functions called within the main simulation loop.
 
+        Inputs:
+            events: obj_events.SimEvent list, optional. Checked after every step, and logged to Sim.event_log
+                    when they happen. Terminal ones stop the run there (and the results get cut down to 
+                    the simulated steps), i.e. 
+                        Sim.run(events = [temperature_limit(450.0, nodes = -1), peak_passed()])
+                    See obj_events.py and tools_events.py
+
         Notes:
+            - With use_run_cache, identical runs get loaded from the run cache instead (not with events though)
         """
 
+        # Identical run already in the run cache
+        cached = self.use_run_cache and not events
+        if cached and load_cached_run(self, "run"):
+            return
+
         print("Simulation Progress (in sim-time): ")
         time_progress_marker = self.t_vec[0] 
+        start = time.time()
+
+        initialize_events(self, events)
+        initialize_stats(self)
+        initialize_energy(self)
+        stop = None
 
         ####### MAIN SIMULATION LOOP #######
         # For each timestep
-        for i, t in enumerate(self.t_vec[:-1]):
-
-            # Calculate Net Heat Flux
-            get_net_heat_flux(self, i)
+        i = 0
+        while i < self.t_vec_size - 1:
+
+            # Big steps through the quiet phases (see tools_phases.py), if skipping them
+            aero_done = False
+            if self.quiet is not None and self.quiet[i]:
+                j = quiet_phase_step(self, i)
+                if j is not None:
+                    update_stats(self, i, j)
+                    update_energy(self, i, j)
+                    if self.events and check_events(self, i, j):
+                        stop = j
+                        break
+                    i = j
+                    continue
+
+                # Falling back to a normal step, quiet_phase_step() already did the aero at i
+                aero_done = True
+
+            # Calculate Net Heat Flux (conduction-only runs skip the aero)
+            if self.aerothermal and not aero_done:
+                get_net_heat_flux(self, i)
 
             # Stability Criterion Check
             stability_criterion_check(self, i)
@@ -246,14 +531,132 @@ class Thermal_Sim_1D:
             # Get New Wall Temperatures
             get_new_wall_temps(self, i)
 
+            # Surface Recession
+            if self.ablation_model is not None:
+                ablation_step(self, i)
+
             # Update screen every 5 seconds in sim-time
             if self.t_vec[i] > time_progress_marker:  
                 print(time_progress_marker, " seconds...")
                 time_progress_marker += 5.0 
+
+            # Summary statistics, energy conservation ledger
+            update_stats(self, i, i+1)
+            update_energy(self, i, i+1)
+
+            # Events
+            if self.events and check_events(self, i, i+1):
+                stop = i+1
+                break
+
+            i += 1
+
+        check_energy(self, self.t_vec_size-1 if stop is None else stop)
+
+        # Stopped early by a terminal event
+        if stop is not None:
+            truncate_results(self, stop+1)
+
+        if not self.store_history:
+            discard_history(self)
+
+        self.runtime, self.run_method = time.time() - start, "run"
+
+        if cached:
+            save_cached_run(self)
+
+
+
+    def run_duhamel(self, **kwargs):
+        """
+        Runs the simulation using cached wall response functions and FFT convolution, instead
+        of marching the conduction solver step-by-step. Much faster for long trajectories and
+        repeated runs of the same wall.
+
+        See tools_duhamel.run_duhamel() for the available options (T_tol, etc.)
+        """
+        if self.use_run_cache and load_cached_run(self, "run_duhamel", kwargs):
+            return
+
+        start = time.time()
+        run_duhamel(self, **kwargs)
+
+        history_stats(self)
+        history_energy(self)
+        if not self.store_history:
+            discard_history(self)
+
+        self.runtime, self.run_method = time.time() - start, "run_duhamel"
+
+        if self.use_run_cache:
+            save_cached_run(self)
+
+
+
+    def run_waveform(self, **kwargs):
+        """
+        Runs the simulation by waveform relaxation: the aero is evaluated over the whole trajectory
+        at once (vectorized), then the conduction, and this is repeated until the wall temperatures 
+        converge. Much faster than run() for long trajectories, since the slow per-step aero calls
+        are replaced by a few whole-array passes. The conduction is batched too for the "explicit" and 
+        "implicit" solvers, the rest step through it per-step (see tools_waveform.py).
+
+        See tools_waveform.run_waveform() for the available options (T_tol, etc.)
+        """
+        if self.use_run_cache and load_cached_run(self, "run_waveform", kwargs):
+            return
+
+        start = time.time()
+        run_waveform(self, **kwargs)
+
+        history_stats(self)
+        history_energy(self)
+        if not self.store_history:
+            discard_history(self)
+
+        self.runtime, self.run_method = time.time() - start, "run_waveform"
+
+        if self.use_run_cache:
+            save_cached_run(self)
+
+
+
+    def start_online(self, t0, mach0, alt0, **kwargs):
+        """
+        Sets the simulation up to be stepped incrementally with advance_to(), i.e. from live telemetry, 
+        instead of from a trajectory file. Re-initializes the simulation.
+
+        See tools_online.start_online() for the available options (history_size)
+        """
+        return start_online(self, t0, mach0, alt0, **kwargs)
+
+
+
+    def advance_to(self, t, mach, alt):
+        """
+        Marches the wall up to time t, given the Mach number and altitude there (see tools_online.advance_to()).
+        Returns the current wall temperatures.
+        """
+        return advance_to(self, t, mach, alt)
+
+
+
+    def online_history(self):
+        """ Returns the (bounded) history of an online simulation, oldest to newest, see tools_online.online_history() """
+        return online_history(self)
   
                 
 
     
+    def add_to_catalog(self, result_file = None, name = None, catalog = None):
+        """
+        Records this (finished) run in the run catalog: its configuration, summary metrics and where its results 
+        were saved, so it can be found later with tools_catalog.query_runs(). Returns its catalog id.
+        """
+        return catalog_run(self, result_file, name, catalog)
+
+
+
     def export_data_to_csv(self, out_filename):
         """
         Creates .csv of that has, at each timestep:
@@ -297,3 +700,37 @@ class Thermal_Sim_1D:
         out_data.to_csv(out_filename, index=False)
 
 
+
+
+
+class Lumped_Thermal_Sim(Thermal_Sim_1D):
+    """
+    Lumped-capacitance version of Thermal_Sim_1D, for fast screening. Treats the whole wall as a single 
+    lump at one bulk temperature, which is fine for thin, conductive skins (small Biot number), and takes
+    milliseconds instead of seconds. See tools_lumped.py.
+
+    Takes exactly the same arguments as Thermal_Sim_1D, and fills the same result arrays (every wall node
+    gets the bulk temperature). If the Biot number is too big for lumping anywhere along the trajectory, 
+    run() falls back to the full 1D simulation automatically, so you always get a usable answer.
+
+    Results, Data (in addition to Thermal_Sim_1D's)
+        T_bulk : numpy float 1D array
+            bulk (capacitance-weighted average) wall temperature at each time step
+        Bi : numpy float 1D array
+            Biot number of the wall at each time step (cold-wall h)
+        lumped_valid : bool
+            True if the lumped solution was used, False if it fell back to the full 1D simulation
+        fallback_sim : Thermal_Sim_1D
+            the full 1D simulation that was run, if it fell back (None otherwise)
+
+    Methods
+    -------
+    run(self, **kwargs)
+        Runs the lumped simulation (or the full one, if lumping isn't valid). See tools_lumped.run_lumped() 
+        for the available options (Bi_limit, fallback, etc.)
+    """
+
+    def run(self, **kwargs):
+        """ Runs the lumped-capacitance simulation, see tools_lumped.run_lumped() """
+        return run_lumped(self, **kwargs)
+
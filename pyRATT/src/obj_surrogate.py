@@ -0,0 +1,152 @@
+"""
+Contains the surrogate model object, which answers "what if" questions about the peak wall temperatures
+in microseconds, without re-running the simulation. See tools_surrogate.py for how they're built.
+"""
+
+import numpy as np
+
+
+
+class ThermalSurrogate:
+    """
+    Gaussian-process surrogate of the peak surface and bondline temperatures, over the skin material and 
+    thickness, x_location, deflection angle and trajectory Mach scale.
+
+    Attributes
+    ----------
+        ranges: dict
+            {name: (min, max)} of the continuous inputs, which get normalized to [0, 1]
+        materials: str list
+            skin materials it was trained on (None if the material wasn't varied)
+        gps: dict
+            {output name: fitted GP dict}, see tools_surrogate.fit_gp()
+        X_train: numpy float 2D array
+            encoded training inputs
+        Y_train: numpy float 2D array
+            training outputs, Y_train[n,k] for output k
+
+    Methods
+    -------
+    encode(self, points)
+        encodes a list of {name: value} dicts into the normalized GP inputs
+    predict(self, output = None, **inputs)
+        returns the predicted mean and standard deviation of an output (or all of them)
+    save(self, filename)
+        saves to a .npz file
+    load(filename)
+        (static) loads from a .npz file
+
+    Notes
+    -------
+    - Inputs can be floats or arrays (of the same length), to predict a bunch of points at once
+    """
+
+    def __init__(self, ranges, materials = None):
+
+        self.ranges = dict(ranges)
+        self.materials = list(materials) if materials else None
+        self.gps = {}
+        self.X_train = None
+        self.Y_train = None
+
+        # Precomputed for fast encoding
+        self.names = list(self.ranges)
+        self.lower = np.array([self.ranges[n][0] for n in self.names], dtype=float)
+        self.span  = np.array([self.ranges[n][1] - self.ranges[n][0] for n in self.names], dtype=float)
+
+
+
+    def encode(self, points):
+        """ Normalizes the continuous inputs to [0, 1], and one-hot encodes the material. Returns X[n, d] """
+
+        X = (np.array([[p[n] for n in self.names] for p in points], dtype=float) - self.lower) / self.span
+
+        if self.materials:
+            onehot = np.array([[p["material"] == m for m in self.materials] for p in points], dtype=float)
+            X = np.hstack([X, onehot])
+
+        return X
+
+
+
+    def predict(self, output = None, **inputs):
+        """
+        Predicted mean and standard deviation [K] of an output, at the given inputs.
+
+        Inputs:
+            output:     string, which output (see tools_surrogate.SURROGATE_OUTPUTS). None returns all of them, as dicts
+            **inputs:   the design variables, i.e. thickness = 0.003, x_location = 0.2, ..., material = "ALU6061"
+        Outputs:
+            mean, std:  floats (or arrays, if the inputs were), or dicts of them {output: value} if output is None
+        """
+
+        # Encode (inline rather than encode(), since this needs to be quick)
+        x = np.column_stack([(np.atleast_1d(np.asarray(inputs[n], dtype=float)) - lo)/sp for n, lo, sp in zip(self.names, self.lower, self.span)])
+        if self.materials:
+            if inputs["material"] not in self.materials:
+                raise ValueError(f"Surrogate was not trained on {inputs['material']}. Trained on: {self.materials}")
+            onehot = np.zeros((x.shape[0], len(self.materials)))
+            onehot[:, self.materials.index(inputs["material"])] = 1.0
+            x = np.hstack([x, onehot])
+
+        if output is None:
+            results = {name: self._predict_gp(self.gps[name], x) for name in self.gps}
+            return {k: v[0] for k, v in results.items()}, {k: v[1] for k, v in results.items()}
+
+        return self._predict_gp(self.gps[output], x)
+
+
+
+    def _predict_gp(self, gp, x):
+        """ GP predictive mean and standard deviation at encoded inputs x[m, d] """
+
+        d = (x[:,np.newaxis,:] - self.X_train[np.newaxis,:,:]) / gp["lengthscales"]
+        k = gp["signal_var"] * np.exp(-0.5*np.sum(d**2, axis=-1))
+
+        mean = gp["y_mean"] + gp["y_std"] * (k @ gp["alpha"])
+        var  = gp["signal_var"] + gp["noise_var"] - np.sum((k @ gp["K_inv"]) * k, axis=1)
+        std  = gp["y_std"] * np.sqrt(np.maximum(var, 0.0))
+
+        if mean.size == 1:
+            return float(mean[0]), float(std[0])
+        return mean, std
+
+
+
+    def save(self, filename):
+        """ Saves the surrogate to a .npz file """
+
+        arrays = {  "names":        np.array(self.names),
+                    "lower":        self.lower,
+                    "upper":        self.lower + self.span,
+                    "materials":    np.array(self.materials if self.materials else [], dtype=str),
+                    "outputs":      np.array(list(self.gps)),
+                    "X_train":      self.X_train,
+                    "Y_train":      self.Y_train }
+
+        for name, gp in self.gps.items():
+            for key, value in gp.items():
+                arrays[f"{name}/{key}"] = value
+
+        np.savez(filename, **arrays)
+
+
+
+    @staticmethod
+    def load(filename):
+        """ Loads a surrogate saved with save() """
+
+        data = np.load(filename)
+
+        ranges = {str(n): (lo, hi) for n, lo, hi in zip(data["names"], data["lower"], data["upper"])}
+        Surrogate = ThermalSurrogate(ranges, [str(m) for m in data["materials"]])
+
+        Surrogate.X_train = data["X_train"]
+        Surrogate.Y_train = data["Y_train"]
+
+        for name in data["outputs"]:
+            name = str(name)
+            Surrogate.gps[name] = {key.split("/", 1)[1]: (data[key] if data[key].ndim else float(data[key]))
+                                    for key in data.files if key.startswith(name + "/")}
+
+        return Surrogate
@@ -1,4 +1,7 @@
-from typing import Optional
+import hashlib
+from typing import Optional, Union
+
+import numpy as np
 
 from .materials_solid import MATERIALS_DICT
 #from . import conversions
@@ -32,6 +35,23 @@ class WallStack:
     
         node_counts: int list or int, list that defines how many nodes each component is divided into
 
+        interface_resistances: float list or float, optional. Thermal contact resistance [m^2K/W] at each of 
+                    the interfaces between components (so one less entry than there are components). A single
+                    float gets applied to every interface. Defaults to perfect contact (0.0).
+
+        mesh_types: str list or str, optional. How each component is divided into elements:
+                    - "uniform": equal element thicknesses (default)
+                    - "geometric": element thicknesses grow by stretch_factor from one element to the next, 
+                        going away from the hot side of the component. Clusters nodes at the heated face 
+                        (first component) or at the interface with the previous component.
+                    - "tanh": hyperbolic-tangent clustering at both ends of the component, with stretch_factor 
+                        setting how strong the clustering is. Good for components with interfaces on both sides.
+                    Stretching pays off when the temperature gradient is steep (thick/low conductivity walls,
+                    early in a heat pulse). See validation_cases/stretched_mesh.py for a comparison.
+
+        stretch_factors: float list or float, optional. Stretching parameter for each component, see mesh_types.
+                    Ignored for "uniform" components. 
+
     *The above inputs all must be in corresponding order, and be of equal length*
             
 
@@ -47,24 +67,53 @@ class WallStack:
             total number of elements
         y_loc: float list   
             list of through-wall node/element coordinate values 
-        interface_resistances:
-            not yet implemented
+        interface_resistances: float list
+            thermal contact resistance at each component interface [m^2K/W]
+        component_idx: numpy int array
+            index of the component that each node belongs to
+        dy, rho, cp, k: numpy float arrays
+            per-node element thickness and material properties (vectorized copies of the elements list)
+        capacitance: numpy float array
+            per-node thermal capacitance, rho*cp*dy [J/m^2K] (half that for face and interface nodes, see Notes)
+        conductance: numpy float array (length n_tot-1)
+            conductance between node j and node j+1 [W/m^2K]. This is the harmonic mean of the two half-elements,
+            plus any interface resistance sitting between them. 
+        conductance_sum: numpy float array
+            total conductance connecting each node to its neighbors [W/m^2K]. Used for timestep limits.
+        recession: float
+            how much of the first component has ablated away [m], see set_recession()
     
     Methods
     -------
-    -
+    get_wall_coords(self)
+        returns list of the through-wall node coordinates
+    element_thicknesses(thickness, node_count, mesh_type, stretch_factor)
+        (static) returns the element thicknesses of a single, possibly stretched, component 
+    build_conduction_arrays(self)
+        (re)computes the capacitance/conductance arrays shared by all the conduction solvers
+    set_recession(self, recession)
+        remaps the first component onto its remaining (un-ablated) thickness
+    conduction_matrix_banded(self)
+        returns the tridiagonal conduction operator in scipy.linalg.solve_banded format
+    with_node_counts(self, node_counts)
+        returns a copy of this WallStack, re-meshed with different node counts
 
     Notes
     -------
-    -
+    - Each node is treated as the center of its own element/control volume of thickness dy. Between two nodes
+    the heat has to make it through half of each element (and any interface in between), so the conductance is 
+    1 / (dy_j/(2*k_j) + R_interface + dy_j+1/(2*k_j+1)). For a single material this is just k/dy.
+    - The nodes at the wall faces, and on either side of an interface, sit right on the edge of their component,
+    so only half of their element is actually material. They get half an element of capacitance, which makes the
+    capacitances add up to the real wall (rho*cp*thickness per component) instead of carrying an extra half 
+    element at each end.
+    - Since every node carries its own dy, this works the same for stretched (non-uniform) meshes. The 
+    catch is the explicit solver's stable timestep is set by the smallest element, so stretched meshes
+    pair well with conduction_solver="implicit".
     """
 
-    def __init__(self, materials, thicknesses, node_counts, interface_resistances: Optional[float] = None):
-
-
-
-        if interface_resistances is not None:
-            raise NotImplementedError("I have not implemented this yet")
+    def __init__(self, materials, thicknesses, node_counts, interface_resistances: Optional[Union[float, list]] = None,
+                    mesh_types: Optional[Union[str, list]] = None, stretch_factors: Optional[Union[float, list]] = None):
 
 
         # handling both list and single values for the above entries (convert everything to a list if isnt already)
@@ -75,39 +124,243 @@ class WallStack:
         if not isinstance(node_counts, list): 
             node_counts = [node_counts]
 
+        # Interface resistances, one per interface between components. None means perfect contact.
+        if interface_resistances is None:
+            interface_resistances = 0.0
+        if not isinstance(interface_resistances, list):
+            interface_resistances = [interface_resistances] * (len(materials) - 1)
+        
+        if len(interface_resistances) != len(materials) - 1:
+            raise ValueError("interface_resistances must have one entry per interface (len(materials)-1)")
+
+        # Mesh stretching, one entry per component. None means uniform.
+        if mesh_types is None:
+            mesh_types = "uniform"
+        if not isinstance(mesh_types, list):
+            mesh_types = [mesh_types] * len(materials)
+        if stretch_factors is None:
+            stretch_factors = 1.0
+        if not isinstance(stretch_factors, list):
+            stretch_factors = [stretch_factors] * len(materials)
+
+        if len(mesh_types) != len(materials):
+            raise ValueError("mesh_types must have one entry per wall component (len(materials))")
+        if len(stretch_factors) != len(materials):
+            raise ValueError("stretch_factors must have one entry per wall component (len(materials))")
+
 
         # Maintain the User Specified inputs
         self.materials = materials
         self.thicknesses = thicknesses
         self.node_counts = node_counts
         self.interface_resistances = interface_resistances
+        self.mesh_types = mesh_types
+        self.stretch_factors = stretch_factors
 
         # Get total number of elements
         self.n_tot = sum(list(node_counts))
 
         # List of Elements, which represents the entire Wall/Stack/Aerosurface
         self.elements = [] 
+
+        # Which component each node belongs to
+        component_idx = []
         
         #For each of the wall components
         for i in range(len(materials)):
 
-            #Calculate Element Thickness            
-            dy_e = thicknesses[i]/(node_counts[i]-1)
+            #Calculate Element Thicknesses (all the same unless the component is stretched)
+            dy_component = self.element_thicknesses(thicknesses[i], node_counts[i], mesh_types[i], stretch_factors[i])
 
 
             #For the number of nodes for a given component
             for j in range(node_counts[i]):
 
+                dy_e = dy_component[j]
+
                 #Update y location to feed into element
                 if not self.elements: #If List is currently empty
                     y_e = 0.0
-                else: #Increment based on previous y value
-                    y_e = self.elements[-1].y + dy_e
+                else: #Increment based on previous y value (nodes sit at the center of their elements)
+                    y_e = self.elements[-1].y + 0.5*(self.elements[-1].dy + dy_e)
                 
 
                 #Append computational node/element corresponding to that material
                 self.elements.append( SolidElement(materials[i], y_e, dy_e) )
+                component_idx.append(i)
+
+        self.component_idx = np.array(component_idx, dtype=int)
+
+        # Precompute the arrays the conduction solvers run off of
+        self.build_conduction_arrays()
+
+
+
+
+    @staticmethod
+    def element_thicknesses(thickness, node_count, mesh_type="uniform", stretch_factor=1.0):
+        """
+        Returns the element thicknesses for a single wall component, ordered from the hot side of the
+        component to the cold side.
+
+        The thicknesses are scaled such that the component's nodes span the component thickness, i.e. 
+        sum( (dy_j + dy_j+1)/2 ) = thickness. For a uniform mesh, this gives the usual thickness/(node_count-1). 
+        """
+
+        # Relative element sizes
+        if mesh_type == "uniform":
+            shape = np.ones(node_count)
+
+        elif mesh_type == "geometric":
+            # each element is stretch_factor times thicker than the last
+            shape = stretch_factor ** np.arange(node_count)
+
+        elif mesh_type == "tanh":
+            # element size follows the metric of a two-sided tanh mapping, which is smallest at both ends
+            eta = np.linspace(-1.0, 1.0, node_count)
+            shape = 1.0 / np.cosh(stretch_factor*eta)**2
+
+        else:
+            raise ValueError(f"Unsupported mesh type: {mesh_type}")
+
+        # Scale so that the nodes span the component thickness
+        return shape * thickness / np.sum(0.5*(shape[:-1] + shape[1:]))
+
+
+
+    def build_conduction_arrays(self):
+        """
+        Pulls the element properties into numpy arrays, and precomputes the nodal capacitances and the 
+        node-to-node conductances (including interface resistances). 
+
+        These are shared by all of the conduction solvers (see tools_conduction.py), so that they don't
+        have to loop over the elements every timestep. If you modify the elements, call this again.
+        """
+
+        self.dy     = np.array([e.dy for e in self.elements], dtype=float)
+        self.rho    = np.array([e.rho for e in self.elements], dtype=float)
+        self.cp     = np.array([e.cp for e in self.elements], dtype=float)
+        self.k      = np.array([e.k for e in self.elements], dtype=float)
+
+        # Un-ablated element thicknesses and node coords, which set_recession() remaps from
+        self.dy_base    = self.dy.copy()
+        self.y_base     = np.array(self.get_wall_coords(), dtype=float)
+        self.recession  = 0.0
+
+        self.build_conductances()
+
+
+
+    def build_conductances(self):
+        """ Capacitances and conductances from the current per-node arrays (dy, rho, cp, k), see build_conduction_arrays() """
+
+        # Nodes where the component changes between neighbors (node j is on one side, j+1 on the other)
+        interfaces = np.nonzero(np.diff(self.component_idx))[0]
+
+        # Thermal capacitance of each node's element [J/m^2K]. Face and interface nodes sit on the edge of their 
+        # component, so only half of their element is inside it.
+        half_cell = np.zeros(self.n_tot, dtype=bool)
+        half_cell[[0, -1]] = True
+        half_cell[interfaces] = True
+        half_cell[interfaces+1] = True
+        self.capacitance = self.rho * self.cp * self.dy * np.where(half_cell, 0.5, 1.0)
+
+        # Thermal resistance between node j and j+1: half of each element, in series [m^2K/W]
+        resistance = 0.5*self.dy[:-1]/self.k[:-1] + 0.5*self.dy[1:]/self.k[1:]
+
+        # Add contact resistances wherever the component changes between neighboring nodes
+        resistance[interfaces] += np.array(self.interface_resistances, dtype=float)[self.component_idx[interfaces]]
 
+        # Conductance between node j and j+1 [W/m^2K]
+        self.conductance = 1.0 / resistance
+
+        # Total conductance to each node's neighbors
+        self.conductance_sum = np.zeros(self.n_tot, dtype=float)
+        self.conductance_sum[:-1] += self.conductance
+        self.conductance_sum[1:]  += self.conductance
+
+
+
+    def conduction_matrix_banded(self):
+        """
+        Returns the (positive semi-definite) tridiagonal conduction operator K, where the conductive heat
+        into each node is -K @ T, in the (3, n_tot) banded format used by scipy.linalg.solve_banded. 
+
+        Boundary fluxes are not included, those get added by the solvers themselves.
+        """
+
+        K = np.zeros((3, self.n_tot), dtype=float)
+
+        K[0, 1:]  = -self.conductance     # upper diagonal
+        K[1, :-1] += self.conductance     # main diagonal
+        K[1, 1:]  += self.conductance
+        K[2, :-1] = -self.conductance     # lower diagonal
+
+        return K
+
+
+
+    def set_recession(self, recession):
+        """
+        Remaps the first (exposed) wall component onto what's left of it after `recession` [m] of it has
+        ablated away. Every element of the first component gets scaled by the same factor, so it keeps the
+        same number of nodes (and the same relative spacing) as it thins out, and only the numpy arrays 
+        get updated, the SolidElement objects are left alone (they keep the un-ablated dy and y). 
+        
+        Recession is measured from the original surface, so set_recession(0.0) restores the original mesh.
+        """
+
+        if not 0.0 <= recession < self.thicknesses[0]:
+            raise ValueError(f"Recession must be between 0 and the first component thickness ({self.thicknesses[0]} m)")
+
+        self.recession = recession
+
+        self.dy = self.dy_base.copy()
+        self.dy[self.component_idx == 0] *= self.remaining_fraction()
+
+        self.build_conductances()
+
+
+
+    def remaining_fraction(self):
+        """ Fraction of the first component's thickness that hasn't ablated away """
+
+        return 1.0 - self.recession/self.thicknesses[0]
+
+
+
+    def recessed_coords(self, recession = None):
+        """ 
+        Node coordinates [m] of the first component, measured from the original (un-ablated) surface, 
+        for a given (or the current) recession. Its nodes span from the receded surface to the back of the component.
+        """
+
+        if recession is None:
+            recession = self.recession
+
+        y0 = self.y_base[self.component_idx == 0]
+
+        return recession + y0*(1.0 - recession/self.thicknesses[0])
+
+
+
+    def signature(self):
+        """
+        Hash identifying the wall's mesh and material properties, i.e. everything the conduction 
+        solvers actually see (capacitances and conductances). Used as the key for cached solver data.
+        """
+
+        return hashlib.sha1(self.capacitance.tobytes() + self.conductance.tobytes()).hexdigest()
+
+
+
+    def with_node_counts(self, node_counts):
+        """ Returns a new WallStack with the same materials, thicknesses, interfaces and mesh stretching, but different node counts """
+
+        return WallStack(self.materials, self.thicknesses, node_counts,
+                            interface_resistances   = self.interface_resistances,
+                            mesh_types              = self.mesh_types,
+                            stretch_factors         = self.stretch_factors)
 
 
 
@@ -142,6 +395,10 @@ class SolidElement:
         material thermal conductivity [W/mK]
     emis: float   
         material Black Body Emissivity Coefficient 
+    T_abl: float
+        ablation temperature [K], None if the material doesn't ablate
+    h_abl: float
+        heat of ablation [J/kg], None if the material doesn't ablate
 
     dy : float   
         element thickness (in the through-wall direction) [m]
@@ -163,6 +420,10 @@ class SolidElement:
         self.k      = MATERIALS_DICT[material]["k"]
         self.emis   = MATERIALS_DICT[material]["emis"]
 
+        # Ablative properties, if it has any
+        self.T_abl  = MATERIALS_DICT[material].get("T_abl")
+        self.h_abl  = MATERIALS_DICT[material].get("h_abl")
+
         # Element Coord
         self.y = y
         # Element Thickness
@@ -1,19 +1,162 @@
 """
-           ) (   (      (   (         )    )                                  
-  *   ) ( /( )\ ))\ )   )\ ))\ )   ( /( ( /(   *   )                          
-` )  /( )\()|()/(()/(  (()/(()/(   )\()))\())` )  /(                          
- ( )(_)|(_)\ /(_))(_))  /(_))(_)) ((_)\((_)\  ( )(_))                         
-(_(_()) _((_|_))(_))   (_))(_))    _((_) ((_)(_(_())                          
-|_   _|| || |_ _/ __|  |_ _/ __|  | \| |/ _ \|_   _|                          
-  | |  | __ || |\__ \   | |\__ \  | .` | (_) | | |                            
-  |_|  |_||_|___|___/  |___|___/  |_|\_|\___/  |_|                            
- (      *    (   (          *           )           (           )             
- )\ ) (  `   )\ ))\ )     (  `       ( /(   *   )   )\ )     ( /(      *   )  
-(()/( )\))( (()/(()/( (   )\))(  (   )\())` )  /(( (()/(     )\())(  ` )  /(  
- /(_)|(_)()\ /(_))(_)))\ ((_)()\ )\ ((_)\  ( )(_))\ /(_))   ((_)\ )\  ( )(_)) 
-(_)) (_()((_|_))(_)) ((_)(_()((_|(_) _((_)(_(_()|(_|_))_   __ ((_|(_)(_(_())  
-|_ _||  \/  | _ \ |  | __|  \/  | __| \| ||_   _| __|   \  \ \ / / __|_   _|  
- | | | |\/| |  _/ |__| _|| |\/| | _|| .` |  | | | _|| |) |  \ V /| _|  | |    
-|___||_|  |_|_| |____|___|_|  |_|___|_|\_|  |_| |___|___/    |_| |___| |_|    
-                                                                              
-"""
\ No newline at end of file
+Contains the surface recession (ablation) model, which runs on top of the conduction solvers.
+
+The exposed (first) wall component is allowed to ablate once its surface reaches the material's ablation
+temperature, T_abl. Two flavors of the surface energy balance:
+    - "heat_of_ablation": the conduction step is taken as normal, and any energy that would have taken the
+      surface node above T_abl instead goes into ablating material, at h_abl [J/kg]. The surface is held at T_abl.
+        ds = C_0*(T_0 - T_abl) / (rho*h_abl)
+    - "steady_state": the same energy (whatever would have taken the surface node above T_abl), but charged the 
+      effective heat of ablation of the classic steady-state recession rate, s_dot = q_net / (rho*(h_abl + cp*(T_abl - T_initial))),
+      where each bit of ablated material also had to be heated up from the initial temp to T_abl first,
+        ds = C_0*(T_0 - T_abl) / (rho*(h_abl + cp*(T_abl - T_initial)))
+      The surface is held at T_abl. Recedes less than "heat_of_ablation" for the same heating.
+
+Rather than rebuilding the wall each step, the first component's mesh gets remapped (see 
+WallStack.set_recession()): every one of its elements shrinks by the same factor so the nodes always span 
+from the receding surface to the back of the component, and the temperatures get interpolated from the old 
+node locations to the new ones. Only the numpy arrays the solvers use get touched, so it's cheap.
+
+Notes:
+    - As the surface elements shrink, so does the largest stable explicit timestep (it goes like dy^2). This 
+    is picked up by stability_criterion_check(), which always checks the current (receded) mesh, and the
+    stable timestep at burn-through gets printed up front for the explicit solvers
+    - Once the first component is down to ABLATION_MIN_FRACTION of its thickness, it's called burnt through,
+    and recession stops (the surface is then free to heat up past T_abl)
+    - Works with run() and run_waveform(). Not with run_duhamel() or the "modal" solver, which both rely 
+    on the wall not changing
+    - No blowing/blockage correction to the heat transfer coefficient (yet)
+"""
+
+import copy
+
+import numpy as np
+
+from .tools_conduction import explicit_timestep_limit, implicit_lhs_banded, EXPLICIT_STABILITY_FACTORS
+
+
+# Supported ablation models
+ABLATION_MODELS = ["heat_of_ablation", "steady_state"]
+
+# Fraction of the first component left when it's considered burnt through
+ABLATION_MIN_FRACTION = 0.05
+
+
+
+def initialize_ablation(Sim):
+    """
+    Resets the wall to its un-ablated mesh, checks the ablation settings, and allocates the recession results.
+
+    An ablating Sim gets its own copy of the wall, since ablation remaps its mesh, and the WallStack object is
+    usually shared with other Sims (i.e. Thermal_Sim_1D(**A.get_config()), and all of the sweeps), which would
+    otherwise get their walls receded (or reset) out from under them.
+
+    Updates:
+        Sim.Aerosurface, reset to zero recession (a copy, for ablating Sims)
+        Sim.T_abl, Sim.h_abl: the ablation temperature [K] and heat of ablation [J/kg] actually used
+        Sim.recession: numpy float array, recession of the surface at each timestep [m]
+        Sim.recession_rate: numpy float array, recession rate at each timestep [m/s]
+    """
+
+    if Sim.ablation_model is not None:
+        Sim.Aerosurface = copy.deepcopy(Sim.Aerosurface)
+
+    Wall = Sim.Aerosurface
+
+    # The wall may have been left receded by a previous run
+    if Wall.recession != 0.0:
+        Wall.set_recession(0.0)
+
+    Sim.recession       = np.zeros((Sim.t_vec_size,), dtype=float)
+    Sim.recession_rate  = np.zeros((Sim.t_vec_size,), dtype=float)
+    Sim.burned_through  = False
+
+    if Sim.ablation_model is None:
+        return
+
+    if Sim.ablation_model not in ABLATION_MODELS:
+        raise ValueError(f"Unsupported ablation model specified: {Sim.ablation_model}")
+    if Sim.conduction_solver == "modal":
+        raise ValueError('Ablation is not supported by the "modal" conduction solver')
+
+    # Sim settings override the material database
+    SurfE = Wall.elements[0]
+    Sim.T_abl = Sim.ablation_temp if Sim.ablation_temp is not None else SurfE.T_abl
+    Sim.h_abl = Sim.heat_of_ablation if Sim.heat_of_ablation is not None else SurfE.h_abl
+
+    if Sim.T_abl is None or Sim.h_abl is None:
+        raise ValueError(f"Ablation needs an ablation temperature and heat of ablation, which {Wall.materials[0]} doesn't have. "
+                            "Specify them with ablation_temp and heat_of_ablation, or in materials_solid.py")
+
+    # Heads up for the explicit solvers, whose stable timestep shrinks along with the surface elements
+    if Sim.conduction_solver in EXPLICIT_STABILITY_FACTORS:
+        dt_min = EXPLICIT_STABILITY_FACTORS[Sim.conduction_solver] * ablation_timestep_limit(Wall)
+        if Sim.t_step > dt_min:
+            print(f"Note: Ablation - stable explicit timestep drops to {dt_min:.3g} s (conduction only) if the first component burns through. "
+                    f'Consider a smaller timestep, or conduction_solver = "implicit"')
+
+
+
+def ablation_timestep_limit(Wall, h_hot = 0.0, h_cold = 0.0):
+    """ Largest stable explicit timestep [s] of the wall once the first component is receded to ABLATION_MIN_FRACTION """
+
+    recession = Wall.recession
+    Wall.set_recession((1.0 - ABLATION_MIN_FRACTION)*Wall.thicknesses[0])
+
+    dt_max = explicit_timestep_limit(Wall, h_hot, h_cold)
+
+    Wall.set_recession(recession)
+
+    return dt_max
+
+
+
+def ablation_step(Sim, i):
+    """
+    Surface recession over the step from i to i+1, after the conduction solver has stepped the wall
+    temperatures. Recedes and remaps the first wall component, and corrects the wall temperatures at i+1.
+
+    Updates:
+        Sim.wall_temps[:,i+1], Sim.recession[i+1], Sim.recession_rate[i]
+        Sim.Aerosurface, remapped to the new recession
+        Sim.implicit_lhs, if using the implicit solver
+    """
+
+    #Aliases
+    Wall = Sim.Aerosurface
+    T    = Sim.wall_temps[:,i+1]
+    s    = Sim.recession[i]
+
+    Sim.recession[i+1] = s
+
+    if Sim.burned_through or T[0] <= Sim.T_abl:
+        return
+
+    # Recession over the step, from the surface energy balance: the energy that would have taken the surface 
+    # node above T_abl (the conduction step already put q_net into it) goes into ablating material
+    rho = Wall.rho[0]
+    E_abl = Wall.capacitance[0]*(T[0] - Sim.T_abl)
+    if Sim.ablation_model == "heat_of_ablation":
+        ds = E_abl / (rho*Sim.h_abl)
+    elif Sim.ablation_model == "steady_state":
+        ds = E_abl / (rho*(Sim.h_abl + Wall.cp[0]*(Sim.T_abl - Sim.initial_temp)))
+
+    # Burnt through, stop receding
+    s_max = (1.0 - ABLATION_MIN_FRACTION)*Wall.thicknesses[0]
+    if s + ds >= s_max:
+        ds = s_max - s
+        Sim.burned_through = True
+        print(f"~~WARNING~~: Ablator ({Wall.materials[0]}) burnt through at t = {Sim.t_vec[i+1]:.3f} s, recession stopped")
+
+    # Remap the first component's temperatures onto the receded mesh
+    comp = Wall.component_idx == 0
+    T[comp] = np.interp(Wall.recessed_coords(s + ds), Wall.recessed_coords(s), T[comp])
+    T[0] = Sim.T_abl
+
+    Wall.set_recession(s + ds)
+
+    if Sim.conduction_solver == "implicit":
+        Sim.implicit_lhs = implicit_lhs_banded(Wall, Sim.t_step)
+
+    Sim.recession[i+1]  = s + ds
+    Sim.recession_rate[i] = ds / Sim.t_step
@@ -3,20 +3,47 @@ Contains all the aerodynamic tool functions. Mainly the Shock calculation script
 and determination of freestream states/properties
 
 Notes:
-
+    - The freestream, edge state and shock functions also work on numpy arrays (i.e. a whole
+    trajectory at once, see tools_aerotherm.aerothermal_heatflux_history()). For arrays, the 
+    oblique shock angle comes from the closed-form solution of the beta-theta-mach relation 
+    (see oblique_shock_angle_weak()) rather than the rootsolve.
 
 """
 
 import math
+import hashlib
 import scipy
+from collections import OrderedDict
 import numpy as np
 from math import pow, sqrt, log10
+from bisect import bisect_right
 
 from ambiance import Atmosphere
 
 from . import constants
 
 
+# Cached whole-trajectory stagnation point states, keyed by trajectory, see get_stagnation_history(). Least recently 
+# used ones get dropped past STAGNATION_CACHE_SIZE, so sweeps over scaled/perturbed trajectories don't pile them up
+STAGNATION_CACHE_SIZE = 8
+_STAGNATION_CACHE = OrderedDict()
+
+# ICAO standard atmosphere layers, (base geopotential height [m], base temperature [K], lapse rate [K/m], base pressure [Pa]),
+# and constants, for standard_atmosphere(). Same as ambiance.
+ATMOS_LAYERS = [(-5.0e3, 320.65, -6.5e-3, 1.77687e+5),
+                (0.00e3, 288.15, -6.5e-3, 1.01325e+5),
+                (11.0e3, 216.65,  0.0e-3, 2.26320e+4),
+                (20.0e3, 216.65,  1.0e-3, 5.47487e+3),
+                (32.0e3, 228.65,  2.8e-3, 8.68014e+2),
+                (47.0e3, 270.65,  0.0e-3, 1.10906e+2),
+                (51.0e3, 270.65, -2.8e-3, 6.69384e+1),
+                (71.0e3, 214.65, -2.0e-3, 3.95639e+0)]
+ATMOS_LAYER_BASES = [layer[0] for layer in ATMOS_LAYERS]
+ATMOS_EARTH_RADIUS = 6356766.0
+ATMOS_G_0 = 9.80665
+ATMOS_R = 287.05287
+
+
 
 def get_freestream(alt, AirModel, mach=None):
     """
@@ -39,18 +66,50 @@ def get_freestream(alt, AirModel, mach=None):
             *only if mach specified
     """
 
-    #Get atmospheric properties
+    #Get atmospheric properties (single altitudes skip the ambiance overhead, see standard_atmosphere())
+    if np.ndim(alt) == 0:
+        p_inf, T_inf, rho_inf = standard_atmosphere(alt)
+        if mach is not None:
+            return p_inf, T_inf, rho_inf, sqrt(AirModel.gam * AirModel.R * T_inf) * mach
+        return p_inf, T_inf, rho_inf
+
     atm_inf = Atmosphere(alt)
     
     #If Mach Specified
     if mach is not None:
-        u_inf = sqrt(AirModel.gam * AirModel.R * atm_inf.temperature) * mach
+        u_inf = np.sqrt(AirModel.gam * AirModel.R * atm_inf.temperature) * mach
         return atm_inf.pressure, atm_inf.temperature, atm_inf.density, u_inf
     else:
         return atm_inf.pressure, atm_inf.temperature, atm_inf.density
 
 
 
+def standard_atmosphere(alt):
+    """
+    Pressure [Pa], temperature [K] and density [kg/m^3] of the standard atmosphere at a single altitude [m].
+
+    Same ICAO standard atmosphere (and the same arithmetic) as ambiance's Atmosphere, just without the numpy 
+    array overhead, which is most of the cost of a step-by-step run() otherwise. Arrays still go through ambiance.
+    """
+
+    if not (-5004 - 1e-9 <= alt <= 81020 + 1e-9):
+        raise ValueError("Value out of bounds. Lower limit: -5004 m. Upper limit: 81020 m.")
+
+    # Geopotential height, and the layer it's in
+    H = ATMOS_EARTH_RADIUS*alt/(ATMOS_EARTH_RADIUS + alt)
+    H_b, T_b, beta, p_b = ATMOS_LAYERS[max(0, min(bisect_right(ATMOS_LAYER_BASES, H) - 1, len(ATMOS_LAYERS) - 1))]
+
+    T = T_b + beta*(H - H_b)
+
+    if beta == 0.0:
+        p = p_b*math.exp((-ATMOS_G_0/(ATMOS_R*T))*(H - H_b))
+    else:
+        p = p_b*(1 + (beta/T_b)*(H - H_b))**((1/beta)*(-ATMOS_G_0/ATMOS_R))
+
+    return p, T, p/(ATMOS_R*T)
+
+
+
 def complete_aero_state(p, T, u, x_loc, AirModel):
     """
     "Completes" the Aero state, by providing density (derived),
@@ -147,7 +206,7 @@ def get_edge_state(p_inf, T_inf, m_inf, Sim):
     m_e, p_e, T_e = get_post_shock_state(m_inf, p_inf, T_inf, Sim) 
 
     # Edge Velocity
-    u_e = sqrt(Sim.AirModel.gam * Sim.AirModel.R * T_e) * m_e
+    u_e = np.sqrt(Sim.AirModel.gam * Sim.AirModel.R * T_e) * m_e
 
     # Total Temperature at Edge
     T_te = total_temperature(T_e, m_e, Sim.AirModel.gam)
@@ -172,8 +231,13 @@ def get_bl_state(Sim, Re, mach):
         Sim: Simulation Object
         Re: Local Reynolds Number (freestream conditions)
         mach: Freestream Mach
+    
+    If mach is an array, returns an int array of the same shape.
     """
 
+    if np.ndim(mach) > 0:
+        return get_bl_state_array(Sim, Re, mach)
+
     if Sim.bound_layer_model == 'turbulent':
         return 1
     
@@ -194,6 +258,100 @@ def get_bl_state(Sim, Re, mach):
 
 
 
+def get_bl_state_array(Sim, Re, mach):
+    """ Array version of get_bl_state(), for whole trajectories at once """
+
+    if Sim.bound_layer_model == 'turbulent':
+        return np.ones(np.shape(mach), dtype=int)
+    
+    elif Sim.bound_layer_model == 'laminar':
+        return np.zeros(np.shape(mach), dtype=int)
+
+    elif Sim.bound_layer_model == 'transition':
+        return np.where(np.log10(Re) <= 5.5 + constants.C_M*mach, 0, 1)
+    else:
+        raise Exception("Invalid Boundary Layer Model Specification")
+
+
+
+def get_stagnation_state(m_inf, p_inf, T_inf, AirModel):
+    """
+    Returns the stagnation point pressure and temperature, i.e. the total conditions behind a normal 
+    shock (or just the freestream total conditions if subsonic). Works on arrays.
+
+    Inputs:
+        m_inf:      Freestream Mach
+        p_inf:      Freestream Pressure [Pa]
+        T_inf:      Freestream Temp [K]
+        AirModel:   AirModel object for the fluid
+    Outputs:
+        p_0:        Stagnation pressure [Pa]
+        T_0:        Stagnation temperature [K] (total temperature is unchanged across the shock)
+    """
+
+    g = AirModel.gam
+
+    # Freestream total pressure, and total pressure ratio across the shock (1 for M <= 1)
+    p_01 = p_inf * (1 + (g - 1) / 2 * m_inf ** 2) ** (g / (g - 1))
+    P02_P01 = normal_shock(np.maximum(m_inf, 1.0), g)[5]
+
+    return p_01 * P02_P01, total_temperature(T_inf, m_inf, g)
+
+
+
+def get_stagnation_history(Sim):
+    """
+    Freestream and stagnation point (post normal shock) states over the whole trajectory, as numpy arrays.
+
+    None of this depends on the wall or the geometry, so it's computed once and cached by trajectory 
+    (mach, altitude) and gas properties. Every simulation flying the same trajectory (i.e. a nose tip and 
+    a bunch of downstream stations, see tools_stations.run_stations()) shares it.
+
+    The lookup (hashing the whole trajectory) only happens once per Sim, by sim_initialize(), after that it's 
+    just Sim.stagnation_history, so the per-step heating models can call this every step.
+
+    Outputs:
+        dict, with p_inf, T_inf, u_inf, rho_inf, mu_inf (freestream), p_0, T_0, rho_0, mu_0 (stagnation point),
+        and du_dx_R, the Newtonian stagnation point velocity gradient times the nose radius [m/s]
+    """
+
+    if getattr(Sim, "stagnation_history", None) is not None:
+        return Sim.stagnation_history
+
+    key = hashlib.sha1(np.asarray(Sim.mach, dtype=float).tobytes() + np.asarray(Sim.alt, dtype=float).tobytes() + 
+                        np.array([Sim.AirModel.gam, Sim.AirModel.R]).tobytes()).hexdigest()
+
+    if key in _STAGNATION_CACHE:
+        _STAGNATION_CACHE.move_to_end(key)
+
+    else:
+
+        p_inf, T_inf, _, u_inf = get_freestream(Sim.alt, Sim.AirModel, mach=Sim.mach)
+        p_0, T_0 = get_stagnation_state(Sim.mach, p_inf, T_inf, Sim.AirModel)
+
+        rho_0 = p_0 / (Sim.AirModel.R * T_0)
+
+        _STAGNATION_CACHE[key] = {  "p_inf":     p_inf,
+                                    "T_inf":     T_inf,
+                                    "u_inf":     u_inf,
+                                    "rho_inf":   p_inf / (Sim.AirModel.R * T_inf),
+                                    "mu_inf":    Sim.AirModel.dynamic_viscosity(T_inf),
+                                    "p_0":       p_0,
+                                    "T_0":       T_0,
+                                    "rho_0":     rho_0,
+                                    "mu_0":      Sim.AirModel.dynamic_viscosity(T_0),
+                                    "du_dx_R":   np.sqrt(2.0 * np.clip(p_0 - p_inf, 0.0, None) / rho_0),
+                                    "coefficients": {} }
+
+        while len(_STAGNATION_CACHE) > STAGNATION_CACHE_SIZE:
+            _STAGNATION_CACHE.popitem(last=False)
+
+    Sim.stagnation_history = _STAGNATION_CACHE[key]
+
+    return Sim.stagnation_history
+
+
+
 def total_temperature(T, M, gam):
     """Just returns the flow total temperature
     
@@ -239,6 +397,10 @@ def get_post_shock_state(m_inf, p_inf, T_inf, Sim):
     if Sim.shock_type not in  ["normal", "oblique", "conical"]:
         raise NotImplementedError()
 
+    # Arrays (and online runs, see tools_online.py) use the closed-form oblique shock angle instead of the rootsolve
+    if np.ndim(m_inf) > 0 or getattr(Sim, "closed_form_shock", False):
+        return get_post_shock_state_array(m_inf, p_inf, T_inf, Sim)
+
     # Determine if shock or not
     if m_inf >  1.0:
         # Yes Shock - Shock Relations for Post-Shock Properties
@@ -266,6 +428,41 @@ def get_post_shock_state(m_inf, p_inf, T_inf, Sim):
 
 
 
+def get_post_shock_state_array(m_inf, p_inf, T_inf, Sim):
+    """
+    Array version of get_post_shock_state(), for whole trajectories at once. 
+    Same inputs/outputs, just numpy arrays.
+    """
+
+    if Sim.shock_type == "conical":
+        raise Exception("Conical Shocks not implemented yet. Reccomed using Oblique")
+
+    g = Sim.AirModel.gam
+    shocked = m_inf > 1.0
+
+    # Evaluate the shock relations with subsonic points bumped up to M=1 (no-op shock), then 
+    # overwrite those points with the freestream values below
+    M_1 = np.where(shocked, m_inf, 1.0)
+
+    if Sim.shock_type == "normal":
+        m_e, p2op1, _, T2oT1, _, _ = normal_shock(M_1, g)
+
+    if Sim.shock_type == "oblique":
+        theta = Sim.deflection_angle_rad
+        beta = oblique_shock_angle_weak(M_1, g, theta)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            M2n, p2op1, _, T2oT1, _, _ = normal_shock(M_1*np.sin(beta), g)
+            m_e = M2n / np.sin(beta - theta)
+
+    m_e = np.where(shocked, m_e, m_inf)
+    p_e = np.where(shocked, p2op1*p_inf, p_inf)
+    T_e = np.where(shocked, T2oT1*T_inf, T_inf)
+
+    return m_e, p_e, T_e
+
+
+
 def normal_shock(M_1, g):
     """
     Normal Shock Relation functions
@@ -286,12 +483,12 @@ def normal_shock(M_1, g):
     Sources:
     -Adapted from material from the CU Boulder ASEN 3111 Fundamentals of Aerodynamics course
     """
-    M2n = math.sqrt((1 + (g - 1) / 2 * M_1 ** 2) / (g * M_1 ** 2 - (g - 1) / 2))
+    M2n = np.sqrt((1 + (g - 1) / 2 * M_1 ** 2) / (g * M_1 ** 2 - (g - 1) / 2))
     P2_P1 = 1 + 2 * g / (g + 1) * (M_1 ** 2 - 1)
     rho2_rho1 = (g + 1) * M_1 ** 2 / (2 + (g - 1) * M_1 ** 2)
     T2_T1 = P2_P1 / rho2_rho1
-    deltasoR = g / (g - 1) * math.log(T2_T1) - math.log(P2_P1)
-    P02_P01 = math.exp(-deltasoR)
+    deltasoR = g / (g - 1) * np.log(T2_T1) - np.log(P2_P1)
+    P02_P01 = np.exp(-deltasoR)
 
     return M2n, P2_P1, rho2_rho1, T2_T1, deltasoR, P02_P01
 
@@ -376,6 +573,56 @@ def btm(M_1, g, theta):
 
 
 
+def oblique_shock_angle_weak(M_1, g, theta):
+    """
+    Closed-form (weak shock) solution of the beta-theta-mach relation, which works on arrays of 
+    mach numbers. Used instead of btm() when solving a whole trajectory at once.
+
+    Inputs
+        M_1:        float (or array), upstream mach number
+        g:          float, gamma, ratio of specific heats
+        theta:      float, turning angle of the 2D wedge flow
+
+    Returns
+        beta:       float (or array), shock angle
+
+    Notes
+        - Past the max deflection angle (detached shock) there's no real solution. For those, the shock 
+        angle at max deflection is returned instead, which is also what the btm() residual-minimization 
+        lands on.
+        - For zero deflection, this is just the mach angle
+
+    Sources
+        - Thompson, Compressible Fluid Dynamics. Also see Anderson, Modern Compressible Flow
+    """
+
+    M_sq = np.asarray(M_1, dtype=float)**2
+
+    if theta == 0.0:
+        return np.arcsin(1.0 / np.sqrt(M_sq))
+
+    tan_th = np.tan(theta)
+    a = 1.0 + 0.5*(g - 1.0)*M_sq
+
+    lam_sq = (M_sq - 1.0)**2 - 3.0*a*(1.0 + 0.5*(g + 1.0)*M_sq)*tan_th**2
+    lam = np.sqrt(np.clip(lam_sq, 0.0, None))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi = ((M_sq - 1.0)**3 - 9.0*a*(a + 0.25*(g + 1.0)*M_sq**2)*tan_th**2) / lam**3
+    chi = np.clip(np.nan_to_num(chi, nan=1.0), -1.0, 1.0)
+
+    # delta = 1 is the weak shock solution
+    tan_beta = (M_sq - 1.0 + 2.0*lam*np.cos((4.0*np.pi + np.arccos(chi)) / 3.0)) / (3.0*a*tan_th)
+
+    # Shock angle at max deflection, and the max deflection itself, for the detached ones
+    sin_sq_beta_max = (0.25*(g + 1.0)*M_sq - 1.0 + np.sqrt((g + 1.0)*(a + (g + 1.0)*M_sq**2/16.0))) / (g*M_sq)
+    beta_max = np.arcsin(np.sqrt(np.clip(sin_sq_beta_max, 0.0, 1.0)))
+    tan_th_max = 2.0/np.tan(beta_max) * (M_sq*sin_sq_beta_max - 1.0) / (M_sq*(g + np.cos(2.0*beta_max)) + 2.0)
+
+    return np.where(tan_th < tan_th_max, np.arctan(tan_beta), beta_max)
+
+
+
 def conical_shock(M_1, g, delta_c, N=100, deltaTol=1e-2):
     """
     Conical Shock Solver
@@ -14,6 +14,86 @@ from . import tools_aero
 
 
 
+# Registry of the implemented aerothermal heating models, see register_heating_model()
+HEATING_MODELS = {}
+
+# Implemented Boundary Layer Models
+# ------------------------------
+# 1) turbulent: fully turbulent flow
+# 2) laminar: fully laminar flow
+# 3) transition: flow transitions using a modified Re correlation described in Ulsu [1], but
+#                 real source is: 
+#                 Quinn, R. D., and L. Gong. 2000. A method for calculating transient surface temperatures 
+#                 and surface heating rates for high-speed aircraft. NASA/TP-2000-209034. Washington, DC: NASA.
+BOUNDARY_LAYER_MODELS = ["turbulent","laminar","transition"]
+
+# Heating models that use the whole-trajectory stagnation point states (see tools_aero.get_stagnation_history())
+STAGNATION_HEATING_MODELS = ["fay_riddell", "swept_cylinder", "sutton_graves"]
+
+
+
+def register_heating_model(name, requires = ()):
+    """
+    Decorator that adds an aerothermal heating model to the registry, so it can be picked with
+    Thermal_Sim_1D(aerothermal_model = name). i.e.
+
+        @register_heating_model("my_model")
+        def my_heating(Sim, i, T_w):
+            ...
+
+    All heating models have the same interface, model(Sim, i, T_w), where i is either a single timestep
+    index (step-by-step run()), or slice(None) for the whole trajectory at once (run_waveform()/run_duhamel()),
+    and T_w is the matching hot-wall temperature(s). They write their results out to the Sim (at least 
+    Sim.h_coeff[i] and Sim.T_recovery[i]) and return the convective heat flux(es) [W/m^2].
+
+    Inputs:
+        name:       string, name of the model
+        requires:   string tuple, Sim attributes that have to be specified (not None) to use the model
+    """
+
+    def decorator(model):
+        model.requires = tuple(requires)
+        HEATING_MODELS[name] = model
+        return model
+
+    return decorator
+
+
+
+def get_heating_model(Sim):
+    """
+    Resolves Sim.aerothermal_model to its heating model function, and checks the Sim has everything
+    that model needs. Called once, by Thermal_Sim_1D.sim_initialize(), so none of this happens per-step.
+    """
+
+    if Sim.aerothermal_model not in HEATING_MODELS:
+        raise ValueError(f"Error in Aerothermal Model Specification. Implemented models: {list(HEATING_MODELS.keys())}")
+
+    if Sim.bound_layer_model not in BOUNDARY_LAYER_MODELS:
+        raise ValueError("Error in Boundary Layer/Transition Model Specification")
+
+    model = HEATING_MODELS[Sim.aerothermal_model]
+
+    for attr in model.requires:
+        if getattr(Sim, attr, None) is None:
+            raise ValueError(f'The "{Sim.aerothermal_model}" aerothermal model requires {attr} to be specified')
+
+    return model
+
+
+
+def write_out(Sim, i, **values):
+    """ Writes heating model results out to the Sim result arrays, at timestep(s) i """
+
+    for name, value in values.items():
+        if name == "bl_state":
+            # this one is a list
+            Sim.bl_state[i] = list(np.broadcast_to(value, np.shape(Sim.t_vec[i]))) if isinstance(i, slice) else value
+        else:
+            getattr(Sim, name)[i] = value
+
+
+
 def get_net_heat_flux(Sim, i):
     """
     High-level driver for determining the net heat flux to hand into the conduction solver,
@@ -48,6 +128,41 @@ def get_net_heat_flux(Sim, i):
 
 
 
+def net_heat_flux_at(Sim, i, T_w):
+    """
+    Net heat flux into the wall at timestep i, re-evaluated at a wall temperature other than
+    Sim.wall_temps[0,i] (i.e. at the intermediate stages of the Runge-Kutta solvers).
+
+    The aero state (h_coeff, T_recovery, T_inf) is held at its timestep i value, only the 
+    T_w dependence of the convection, h*(T_r - T_w), and radiation terms is re-evaluated. 
+    Needs get_net_heat_flux(Sim, i) to have been called first. Works on arrays of T_w too.
+
+    Inputs:
+        Sim:    Simulation Object
+        i:      Simulation Timestep
+        T_w:    float or numpy array, hot-wall temperature [K]
+    Outputs:
+        q_net:  float or numpy array, net heatflux in W/m^2. Positive if heat is going into the wall
+    """
+
+    q_conv = Sim.h_coeff[i] * (Sim.T_recovery[i] - T_w)
+    q_rad  = constants.SB_CONST * Sim.Aerosurface.elements[0].emis * ((Sim.T_inf[i])**4 - T_w**4)
+
+    return q_conv + q_rad
+
+
+
+def net_heat_flux_derivative_at(Sim, i, T_w):
+    """
+    Derivative of net_heat_flux_at() with respect to the wall temperature, dq_net/dT_w [W/m^2K].
+    Always negative, since a hotter wall takes in less heat. Used to linearize the surface heat flux 
+    for the semi-implicit surface coupling (see tools_conduction.semi_implicit_wall_temps()).
+    """
+
+    return -Sim.h_coeff[i] - 4.0 * constants.SB_CONST * Sim.Aerosurface.elements[0].emis * T_w**3
+
+
+
 def radiative_heatflux(Sim, i):
     """
     High level wrapper for the radiative thermal models that are implmemented/can be used.
@@ -69,6 +184,9 @@ def aerothermal_heatflux(Sim, i):
     High level wrapper/driver for the aerothermal convective models that are 
     implmemented and can be used. 
 
+    Calls the heating model that Sim.aerothermal_model was resolved to in sim_initialize() 
+    (see get_heating_model()), at the current hot-wall temperature.
+
     Inputs:
         Sim:    Simulation Object
         i:      Simulation Timestep
@@ -81,45 +199,36 @@ def aerothermal_heatflux(Sim, i):
         q_conv:  float, convective heatflux in [W/m^2]. Positive if heat is going into the wall
     '''
 
-    # Implemented Aerothermal Models
+    # Implemented Aerothermal Models (see HEATING_MODELS)
     # ------------------------------
     # 1) default: This is the correlation used in the Ulsu [1] paper. Arnas is who is referenced there,  
     # but it is not who actually developed these correlations. However, after long while of running into 
     # paywalls trying to find original source because I am not a student anymore, I give up. Fuck publishers.
+    # 2) tauber_flat_plate: Tauber flat plate correlations
+    # 3) tauber_cone: Tauber flat plate correlations, with the cone (Mangler) factors
+    # 4) fay_riddell: Fay-Riddell stagnation point heating, for a nose tip of radius Sim.nose_radius
+    # 5) swept_cylinder: Fay-Riddell stagnation line heating, for a leading edge of radius Sim.nose_radius
+    # 6) sutton_graves: Sutton-Graves stagnation point heating, for a nose tip of radius Sim.nose_radius
 
-    # Dictionary containing all models and their corresponding function calls
-    aerothermal_model_dict = {  "default": ulsu_simsek_heating(Sim, i) }
-
-    if Sim.aerothermal_model not in aerothermal_model_dict.keys():
-        raise ValueError("Error in Aerothermal Model Specification")
-
-    
-    # Implemented Boundary Layer Models
-    # ------------------------------
-    # 1) turbulent: fully turbulent flow
-    # 2) laminar: fully laminar flow
-    # 3) transition: flow transitions using a modified Re correlation described in Ulsu [1], but
-    #                 real source is: 
-    #                 Quinn, R. D., and L. Gong. 2000. A method for calculating transient surface temperatures 
-    #                 and surface heating rates for high-speed aircraft. NASA/TP-2000-209034. Washington, DC: NASA.
-    
-    valid_boundarylayer_models     = ["turbulent","laminar","transition"]
-
-    if Sim.bound_layer_model not in valid_boundarylayer_models:
-        raise ValueError("Error in Boundary Layer/Transition Model Specification")
+    return Sim.heating_model(Sim, i, Sim.wall_temps[0,i])
 
 
-    # Call Aerothermal Model
-    # ------------------------------
-    q_conv = aerothermal_model_dict[Sim.aerothermal_model]
 
-    return q_conv
+@register_heating_model("default")
+def ulsu_simsek_model(Sim, i, T_w):
+    """ 
+    Registry entry for the Ulsu-Simsek heating model. Single timesteps use ulsu_simsek_heating() (with the 
+    rootsolved oblique shock angle, as always), whole trajectories use ulsu_simsek_heating_history().
+    """
 
+    if isinstance(i, slice):
+        return ulsu_simsek_heating_history(Sim, T_w, i)
 
+    return ulsu_simsek_heating(Sim, i, T_w)
 
 
 
-def ulsu_simsek_heating(Sim, i):
+def ulsu_simsek_heating(Sim, i, T_w = None):
     """ 
     Driver script for the heating model outline in Ulsu [1] to determine the convective heatflux.
 
@@ -130,6 +239,7 @@ def ulsu_simsek_heating(Sim, i):
     Inputs:
         Sim:    Simulation Object
         i:      Simulation Timestep
+        T_w:    float, optional, hot-wall temperature. Defaults to Sim.wall_temps[0,i]
     Updates:
         T_inf
         Re_inf
@@ -145,7 +255,8 @@ def ulsu_simsek_heating(Sim, i):
     """
     
     # alias exposed hot-wall surface temperature
-    T_w = Sim.wall_temps[0,i]
+    if T_w is None:
+        T_w = Sim.wall_temps[0,i]
 
     # Get Freestream Properties
     p_inf, T_inf, u_inf, m_inf, rho_inf, cp_inf, k_inf, mu_inf, pr_inf, Re_inf = tools_aero.get_freestream_complete(Sim, i)
@@ -186,6 +297,81 @@ def ulsu_simsek_heating(Sim, i):
 
     return q_conv
 
+
+
+
+def aerothermal_heatflux_history(Sim, T_w):
+    '''
+    Whole-trajectory version of aerothermal_heatflux(). Evaluates the convective heating at every
+    timestep at once, with numpy arrays, given a hot-wall temperature history. This replaces a 
+    t_vec_size number of (slow, scalar) per-step calls with a handful of array operations.
+
+    Inputs:
+        Sim:    Simulation Object
+        T_w:    numpy float array, hot-wall temperature at each timestep [K]
+    Updates:
+        Same as aerothermal_heatflux(), but for all the timesteps
+    Outputs:
+        q_conv:  numpy float array, convective heatflux in [W/m^2]. Positive if heat is going into the wall
+    '''
+
+    return Sim.heating_model(Sim, slice(None), T_w)
+
+
+
+def ulsu_simsek_heating_history(Sim, T_w, i = slice(None)):
+    """ 
+    Whole-trajectory (array) version of ulsu_simsek_heating(). See that for the details.
+
+    Everything up to the boundary layer edge doesn't depend on the wall temperature, so it is 
+    computed for the whole trajectory on the first call and cached on the Sim (Sim.aero_history_cache, 
+    cleared by sim_initialize()). Repeat calls with new wall temperatures only redo the reference 
+    temperature and heat transfer coefficient.
+
+    Inputs:
+        Sim:    Simulation Object
+        T_w:    numpy float array, hot-wall temperatures at timesteps i [K]
+        i:      slice, timesteps to evaluate (default all)
+    """
+
+    if getattr(Sim, "aero_history_cache", None) is None:
+
+        # Get Freestream Properties
+        p_inf, T_inf, u_inf, m_inf, rho_inf, cp_inf, k_inf, mu_inf, pr_inf, Re_inf = tools_aero.get_freestream_complete(Sim, slice(None))
+
+        # calculate boundary layer edge properties (post-shock)
+        p_e, rho_e, T_e, T_te, m_e, u_e, cp_e, k_e, mu_e, pr_e, Re_e = tools_aero.get_edge_state(p_inf, T_inf, m_inf, Sim)
+
+        # check boundary layer state (laminar/turbulent)
+        bl_state = tools_aero.get_bl_state(Sim, Re_inf, m_inf)
+
+        # calculate recovery factor, temperature
+        r = np.where(bl_state, recovery_factor(1, pr_e), recovery_factor(0, pr_e))
+
+        Sim.aero_history_cache = dict(p_e=p_e, T_e=T_e, T_te=T_te, u_e=u_e, bl_state=bl_state, r=r,
+                                        T_r=recovery_temperature(T_e, T_te, None, r),
+                                        T_inf=T_inf, Re_inf=Re_inf, qbar_inf=0.5*rho_inf*u_inf**2,
+                                        T_t=tools_aero.total_temperature(T_inf, m_inf, Sim.AirModel.gam))
+
+    c = {name: value[i] for name, value in Sim.aero_history_cache.items()}
+
+    # calculate Eckert reference temperature
+    T_ref = eckert_ref_temperature(c["T_e"], c["T_te"], T_w, c["r"])
+
+    # Get complete fluid properties evaluated at reference temperature
+    rho_ref, cp_ref, k_ref, mu_ref, pr_ref, Re_ref = tools_aero.complete_aero_state(c["p_e"], T_ref, c["u_e"], Sim.x_location, Sim.AirModel)
+
+    # Flat Plate Heating Model, properties evaluated at reference temperature
+    h = np.where(c["bl_state"],
+                    flat_plate_heat_transfer(Sim.x_location, T_w, c["T_r"], k_ref, Re_ref, pr_ref, 1)[1],
+                    flat_plate_heat_transfer(Sim.x_location, T_w, c["T_r"], k_ref, Re_ref, pr_ref, 0)[1])
+
+    # Update/Pass values out of sim
+    write_out(Sim, i,   T_inf = c["T_inf"], Re_inf = c["Re_inf"], qbar_inf = c["qbar_inf"], T_t = c["T_t"], 
+                        bl_state = c["bl_state"], T_e = c["T_e"], T_te = c["T_te"], T_recovery = c["T_r"], h_coeff = h)
+
+    return h*(c["T_r"] - T_w)
+
     
 
 
@@ -197,9 +383,9 @@ def recovery_factor(isTurbulent, pr_e):
     limits/checks for the applicability of this
     """
     if isTurbulent:
-        return pow(pr_e, 1.0/3.0)
+        return pr_e**(1.0/3.0)
     else:
-        return pow(pr_e, 1.0/2.0)
+        return pr_e**(1.0/2.0)
 
 
 def recovery_temperature(T_e, T_te, T_w, r): 
@@ -241,11 +427,11 @@ def flat_plate_heat_transfer(x, T_w, T_r, k_ref, Re_ref, pr_ref, isTurbulent):
     #Get Heat Transfer Coefficient
     if isTurbulent:
         #Turbulent Heat Transfer Coeff
-        h =  (k_ref/x) * 0.02914 * pow(Re_ref, 4.0/5.0) * pow(pr_ref, 1.0/3.0)
+        h =  (k_ref/x) * 0.02914 * Re_ref**(4.0/5.0) * pr_ref**(1.0/3.0)
         #lambda = .4;
     else:
         #Laminar Heat Transfer Coeff
-        h = (k_ref/x) * 0.33206 * pow(Re_ref, 1.0/2.0) * pow(pr_ref, 1.0/3.0)
+        h = (k_ref/x) * 0.33206 * Re_ref**(1.0/2.0) * pr_ref**(1.0/3.0)
         #lambda = .5;
         
     # Heat Flux
@@ -254,16 +440,198 @@ def flat_plate_heat_transfer(x, T_w, T_r, k_ref, Re_ref, pr_ref, isTurbulent):
     return q_conv, h 
 
 
-#Fay-Riddell Stagnation Point Heating
-def fay_riddell_stagnation_point_heating():
-    pass
+@register_heating_model("fay_riddell", requires = ("nose_radius",))
+def fay_riddell_stagnation_point_heating(Sim, i, T_w):
+    """
+    Fay-Riddell stagnation point heating, for a nose tip (sphere) of radius Sim.nose_radius.
+    See stagnation_heating().
+    """
+
+    return stagnation_heating(Sim, i, T_w, "sphere")
+
+
+
+@register_heating_model("swept_cylinder", requires = ("nose_radius",))
+def swept_cylinder_heating(Sim, i, T_w):
+    """
+    Stagnation line heating of a (swept) cylindrical leading edge of radius Sim.nose_radius, swept 
+    back by Sim.sweep_angle_deg. See stagnation_heating().
+    """
+
+    return stagnation_heating(Sim, i, T_w, "cylinder")
+
+
+
+def stagnation_heating(Sim, i, T_w, geometry = "sphere"):
+    """
+    Fay-Riddell stagnation point/line heating. 
+
+    Uses the stagnation conditions behind a normal shock and the Newtonian velocity gradient at the 
+    stagnation point, due/dx = sqrt(2*(p_0 - p_inf)/rho_0) / R_n, precomputed over the whole trajectory 
+    (see tools_aero.get_stagnation_history()). Dissociation is neglected (Lewis number term), which is 
+    fine at the speeds we care about.
+
+        q = C * Pr^-0.6 * (rho_w*mu_w)^0.1 * (rho_0*mu_0)^0.4 * sqrt(due/dx) * cp * (T_0 - T_w)
+
+    with C = 0.763 for a sphere, and 0.57 for a cylinder (stagnation line). Sweep is accounted for 
+    with the usual cos(sweep)^1.2 reduction of the unswept cylinder heating. Everything but the wall 
+    temperature dependent terms is cached per geometry/radius/sweep (see stagnation_heating_coefficient()).
+
+    So h = q/(T_0 - T_w), and the recovery temperature is the stagnation temperature.
+    The stagnation point boundary layer is laminar, regardless of Sim.bound_layer_model.
+
+    Sources:
+        - Fay, J. A., and Riddell, F. R., "Theory of Stagnation Point Heat Transfer in Dissociated Air", 1958
+        - Anderson, Hypersonic and High-Temperature Gas Dynamics
+        - Tauber, M. E., "A Review of High-Speed, Convective, Heat-Transfer Computation Methods", NASA TP-2914, 1989
+    """
+
+    s = tools_aero.get_stagnation_history(Sim)
+    T_0 = s["T_0"][i]
+
+    # Wall state at the stagnation pressure
+    rho_w = s["p_0"][i] / (Sim.AirModel.R * T_w)
+    mu_w  = Sim.AirModel.dynamic_viscosity(T_w)
+
+    # Enthalpy difference as cp*(T_0 - T_w), cp at the mean temperature
+    cp = Sim.AirModel.specific_heat(0.5*(T_0 + T_w))
+
+    h = stagnation_heating_coefficient(Sim, geometry)[i] * (rho_w*mu_w)**0.1 * cp
+
+    # Update/Pass values out of sim
+    write_out(Sim, i,   T_inf = s["T_inf"][i], Re_inf = s["rho_inf"][i]*s["u_inf"][i]*Sim.x_location/s["mu_inf"][i], 
+                        qbar_inf = 0.5*s["rho_inf"][i]*s["u_inf"][i]**2, T_t = T_0, bl_state = 0,
+                        T_e = T_0, T_te = T_0, T_recovery = T_0, h_coeff = h)
+
+    return h*(T_0 - T_w)
+
+
+
+def stagnation_heating_coefficient(Sim, geometry = "sphere"):
+    """
+    The wall temperature independent part of the stagnation heating (see stagnation_heating()), 
+    C * Pr^-0.6 * (rho_0*mu_0)^0.4 * sqrt(due/dx), over the whole trajectory. Cached per geometry, 
+    nose radius and sweep angle, alongside the trajectory's stagnation states.
+    """
+
+    s = tools_aero.get_stagnation_history(Sim)
+    sweep = getattr(Sim, "sweep_angle_deg", 0.0) if geometry == "cylinder" else 0.0
+    key = (geometry, Sim.nose_radius, sweep)
 
-#Flat-Plate Heating Correlations
-def tauber_flat_plate_heating():
-    pass
+    if key not in s["coefficients"]:
+
+        if geometry == "sphere":
+            C = 0.763
+        elif geometry == "cylinder":
+            C = 0.57 * np.cos(sweep*constants.DEG2RAD)**1.2
+        else:
+            raise ValueError(f"Unsupported stagnation geometry: {geometry}")
+
+        s["coefficients"][key] = C * constants.FAY_RIDDELL_PR**(-0.6) * (s["rho_0"]*s["mu_0"])**0.4 * np.sqrt(s["du_dx_R"] / Sim.nose_radius)
+
+    return s["coefficients"][key]
+
+
+
+@register_heating_model("sutton_graves", requires = ("nose_radius",))
+def sutton_graves_heating(Sim, i, T_w):
+    """
+    Sutton-Graves stagnation point heating, for a nose tip of radius Sim.nose_radius. A quick 
+    alternative to Fay-Riddell that only needs the freestream:
+
+        q_cold_wall = k * sqrt(rho_inf/R_n) * V^3,   k = 1.7415e-4 (air, SI units)
+
+    which gets corrected for the hot wall with (1 - h_w/H_0) = (1 - T_w/T_0), so h = q_cold_wall/T_0
+    and the recovery temperature is the stagnation temperature.
+
+    Sources:
+        - Sutton, K., and Graves, R. A., "A General Stagnation-Point Convective-Heating Equation for Arbitrary Gas Mixtures", NASA TR R-376, 1971
+    """
+
+    s = tools_aero.get_stagnation_history(Sim)
+    T_0 = s["T_0"][i]
+
+    h = constants.SUTTON_GRAVES_K * np.sqrt(s["rho_inf"][i] / Sim.nose_radius) * s["u_inf"][i]**3 / T_0
+
+    # Update/Pass values out of sim
+    write_out(Sim, i,   T_inf = s["T_inf"][i], Re_inf = s["rho_inf"][i]*s["u_inf"][i]*Sim.x_location/s["mu_inf"][i], 
+                        qbar_inf = 0.5*s["rho_inf"][i]*s["u_inf"][i]**2, T_t = T_0, bl_state = 0,
+                        T_e = T_0, T_te = T_0, T_recovery = T_0, h_coeff = h)
+
+    return h*(T_0 - T_w)
+
+
+
+@register_heating_model("tauber_flat_plate")
+def tauber_flat_plate_heating(Sim, i, T_w, mangler_factors = (1.0, 1.0)):
+    """
+    Tauber flat plate heating correlations. Engineering correlations of the form q = C * rho^N * V^M,
+    with freestream density and velocity, for a surface inclined at the local body angle phi (here, the
+    deflection angle) a distance x (here, Sim.x_location) downstream. [SI units, q in W/m^2]
+
+    Laminar:
+        q = 2.53e-5 * cos(phi)^0.5 * sin(phi) * x^-0.5 * rho^0.5 * V^3.2 * (1 - h_w/H_0)
+    Turbulent, V <= 3962 m/s:
+        q = 3.89e-4 * cos(phi)^1.78 * sin(phi)^1.6 * x^-0.2 * (T_w/556)^-0.25 * rho^0.8 * V^3.37 * (1 - 1.11*h_w/H_0)
+    Turbulent, V > 3962 m/s:
+        q = 2.2e-5 * cos(phi)^2.08 * sin(phi)^1.6 * x^-0.2 * rho^0.8 * V^3.7 * (1 - 1.11*h_w/H_0)
+    (Tauber's C = 3.89e-8 and 2.2e-9 W/cm^2, in W/m^2.) The two turbulent forms don't quite meet at the split,
+    the high-speed one is ~13% lower at V = 3962 m/s for T_w = 556 K (and ~25% lower for a 300 K wall).
+
+    With h_w/H_0 = T_w/T_t, the laminar recovery temperature is the total temperature and the turbulent
+    one is T_t/1.11, and h is whatever is left over.
+
+    Notes:
+        - These are for inclined surfaces, there is no heating at zero deflection angle
+        - The boundary layer edge state isn't needed, so Sim.T_e and Sim.T_te are not written
+        - mangler_factors are (laminar, turbulent) multipliers on the heat transfer, see tauber_cone_heating()
+
+    Sources:
+        - Tauber, M. E., "A Review of High-Speed, Convective, Heat-Transfer Computation Methods", NASA TP-2914, 1989
+    """
+
+    # Get Freestream Properties
+    p_inf, T_inf, u_inf, m_inf, rho_inf, cp_inf, k_inf, mu_inf, pr_inf, Re_inf = tools_aero.get_freestream_complete(Sim, i)
+    T_t = tools_aero.total_temperature(T_inf, m_inf, Sim.AirModel.gam)
+
+    # check boundary layer state (laminar/turbulent)
+    bl_state = tools_aero.get_bl_state(Sim, Re_inf, m_inf)
+
+    phi = Sim.deflection_angle_rad
+    x   = Sim.x_location
+
+    # Laminar
+    h_lam = mangler_factors[0] * 2.53e-5 * np.cos(phi)**0.5 * np.sin(phi) * x**(-0.5) * rho_inf**0.5 * u_inf**3.2 / T_t
+    T_r_lam = T_t
+
+    # Turbulent
+    high_speed = u_inf > constants.TAUBER_V_SPLIT
+    C_t = np.where(high_speed, 2.2e-5 * np.cos(phi)**2.08, 3.89e-4 * np.cos(phi)**1.78 * (T_w/556.0)**(-0.25))
+    M_t = np.where(high_speed, 3.7, 3.37)
+
+    h_turb = mangler_factors[1] * 1.11 * C_t * np.sin(phi)**1.6 * x**(-0.2) * rho_inf**0.8 * u_inf**M_t / T_t
+    T_r_turb = T_t / 1.11
+
+    h   = np.where(bl_state, h_turb, h_lam)
+    T_r = np.where(bl_state, T_r_turb, T_r_lam)
+
+    # Update/Pass values out of sim
+    write_out(Sim, i,   T_inf = T_inf, Re_inf = Re_inf, qbar_inf = 0.5*rho_inf*u_inf**2, T_t = T_t, bl_state = bl_state,
+                        T_recovery = T_r, h_coeff = h)
+
+    return h*(T_r - T_w)
+
+
+
+@register_heating_model("tauber_cone")
+def tauber_cone_heating(Sim, i, T_w):
+    """
+    Tauber heating on a cone, with the deflection angle as the cone half-angle. Same as the flat plate
+    (see tauber_flat_plate_heating()), with the Mangler-type transformation factors for the thinner 
+    boundary layer on a cone: sqrt(3) laminar, and 1.176 turbulent (Van Driest).
+    """
 
-def tauber_cone_heating():
-    pass
+    return tauber_flat_plate_heating(Sim, i, T_w, mangler_factors = (np.sqrt(3.0), 1.176))
 
 
 #Incopera Flat-Plate Heating Correlations
@@ -0,0 +1,216 @@
+"""
+Contains the tools for automatically picking the numerical settings of a simulation
+(timestep and wall node counts), so you don't have to guess-and-check them.
+
+The general idea:
+    1) Do a quick, subsampled pass over the trajectory evaluating the aerothermal heating with the
+       wall held at its initial temperature. A cold wall sees the most heating, so this gives a
+       worst case for the heat transfer coefficient (Biot number) and heat flux.
+    2) Run that cold-wall heat flux history through a handful of conduction-only solves (cheap, no
+       aero) at different node counts, and pick the smallest one whose surface temperature is within
+       tolerance of a much finer reference mesh.
+    3) Pick the timestep. For the fixed-step explicit solvers this is just the largest stable step at the
+       worst case Biot number (times a safety factor). For the solvers that handle their own stability 
+       (implicit, rk23, rkc), the step is picked by step-doubling until the surface temperature stops 
+       changing (accuracy limited).
+
+Notes:
+    - Half of the temperature tolerance gets budgeted to the mesh, and half to the timestep
+    - Since the cold-wall heat flux is an over-estimate, this errs on the side of over-resolving
+    - For ablating runs, the stable explicit timestep is taken with the first component receded to its 
+      burn-through thickness, since that's where the surface elements are smallest (see tools_ablation.py)
+    - For conduction-only runs, the prescribed hot face heat flux history is used instead of the aero (there's 
+      no aero to evaluate). Prescribed temperature hot faces aren't supported, since there's no heat flux to go by
+    - Prescribed back face B.C.s are treated as adiabatic in the conduction checks
+"""
+
+import numpy as np
+
+from .tools_aerotherm import aerothermal_heatflux
+from .tools_conduction import explicit_timestep_limit, march_prescribed_flux, EXPLICIT_STABILITY_FACTORS
+from .tools_ablation import ablation_timestep_limit
+from .obj_boundaryconditions import PrescribedBC
+
+
+
+def cold_wall_heating_prepass(Sim, n_samples = 200):
+    """
+    Evaluates the aerothermal heating at n_samples points along the trajectory, with the hot wall
+    held at Sim.initial_temp. For conduction-only Sims, this just samples the prescribed hot face heat flux
+    (h_coeff is zero then).
+
+    Note this writes into the Sim's result arrays at the sampled timesteps (the heating models write
+    their values out as they go), so call Sim.sim_initialize() afterwards if you're going to run it.
+
+    Inputs:
+        Sim:        Simulation Object
+        n_samples:  int, number of points along the trajectory to sample
+    Outputs:
+        t_samples:  numpy float array, sampled times [s]
+        q_conv:     numpy float array, cold-wall convective heat flux [W/m^2]
+        h_coeff:    numpy float array, cold-wall heat transfer coefficient [W/m^2K]
+    """
+
+    idx = np.unique(np.linspace(0, Sim.t_vec_size-1, n_samples).astype(int))
+
+    q_conv  = np.zeros(idx.size, dtype=float)
+    h_coeff = np.zeros(idx.size, dtype=float)
+
+    # Conduction-only, the hot face heat flux is already known (or zero, if it's adiabatic)
+    if not Sim.aerothermal:
+        bc = Sim.wall_thermal_bcs[0]
+        if isinstance(bc, PrescribedBC) and bc.kind == "T":
+            raise ValueError("Auto-configure needs a heat flux history, it doesn't support prescribed temperature hot faces")
+        if isinstance(bc, PrescribedBC):
+            q_conv = Sim.bc_histories[0][idx]
+        return Sim.t_vec[idx], q_conv, h_coeff
+
+    for m, i in enumerate(idx):
+
+        # Hold the wall at its initial temperature
+        Sim.wall_temps[0,i] = Sim.initial_temp
+
+        q_conv[m]  = aerothermal_heatflux(Sim, i)
+        h_coeff[m] = Sim.h_coeff[i]
+
+    return Sim.t_vec[idx], q_conv, h_coeff
+
+
+
+def auto_configure(
+    Sim,
+    T_tolerance = 5.0,
+    safety_factor = 0.9,
+    n_samples = 200,
+    node_scales = (0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0),
+    reference_scale = 6.0,
+    apply = True
+):
+    """
+    Picks the wall node counts and timestep for a simulation. See the module docstring for the approach.
+
+    Inputs:
+        Sim:                Simulation Object (its current WallStack node counts are the starting point)
+        T_tolerance:        float, allowable error in the surface temperature [K]
+        safety_factor:      float, fraction of the largest stable explicit timestep to actually use
+        n_samples:          int, number of trajectory points sampled in the cold-wall pre-pass
+        node_scales:        float tuple, multiples of the current node counts to try, smallest first
+        reference_scale:    float, multiple of the current node counts used as the "exact" reference mesh
+        apply:              bool, if True, the Sim is re-meshed, gets the new timestep and is re-initialized
+
+    Outputs:
+        config:  dict, containing the picked node_counts and t_step, along with the worst case
+                 h, q, Biot and Fourier numbers and the estimated surface temperature errors
+    """
+
+    print("Auto-configuring Simulation...")
+
+    # 1) Cold-wall Heating Pre-pass
+    t_samples, q_samples, h_samples = cold_wall_heating_prepass(Sim, n_samples)
+    h_max = np.max(h_samples)
+    q_max = np.max(q_samples)
+
+    # Conduction checks are run on their own fine, uniform time grid
+    t_check = np.linspace(Sim.t_vec[0], Sim.t_vec[-1], 4001)
+    q_check = np.interp(t_check, t_samples, q_samples)
+    dt_check = t_check[1] - t_check[0]
+
+
+    # 2) Node Count Selection
+    base_counts = np.array(Sim.Aerosurface.node_counts)
+    scaled_counts = lambda s: [max(3, int(round(n*s))) for n in base_counts]
+
+    check_bcs = _conduction_check_bcs(Sim)
+
+    Wall_ref = Sim.Aerosurface.with_node_counts(scaled_counts(reference_scale))
+    T_surf_ref = march_prescribed_flux(Wall_ref, q_check, dt_check, Sim.initial_temp, check_bcs)[0,:]
+
+    for s in node_scales:
+        Wall = Sim.Aerosurface.with_node_counts(scaled_counts(s))
+        T_surf = march_prescribed_flux(Wall, q_check, dt_check, Sim.initial_temp, check_bcs)[0,:]
+        mesh_error = np.max(np.abs(T_surf - T_surf_ref))
+
+        if mesh_error <= 0.5*T_tolerance:
+            break
+    else:
+        print(f"~~WARNING~~: Auto-configure could not meet the mesh tolerance with the node scales tried. Using {Wall.node_counts}")
+
+
+    # 3) Timestep Selection
+    h_hot  = 0.0 if getattr(Sim, "surface_coupling", "explicit") == "semi_implicit" else h_max
+    h_cold = h_hot if Sim.wall_thermal_bcs[1] == "q_in_aerothermal" else 0.0
+    if getattr(Sim, "ablation_model", None) is not None:
+        dt_stable = ablation_timestep_limit(Wall, h_hot, h_cold)
+    else:
+        dt_stable = explicit_timestep_limit(Wall, h_hot, h_cold)
+    time_error = None
+
+    if Sim.conduction_solver in EXPLICIT_STABILITY_FACTORS:
+        t_step = safety_factor * EXPLICIT_STABILITY_FACTORS[Sim.conduction_solver] * dt_stable
+
+    else:
+        # Step doubling, starting from a large step, until halving the step doesnt change the answer
+        t_step = min(0.1, (Sim.t_vec[-1] - Sim.t_vec[0]) / 100.0)
+
+        while True:
+            T_full = _surface_temps_at(Wall, Sim, t_samples, q_samples, t_step)
+            T_half = _surface_temps_at(Wall, Sim, t_samples, q_samples, 0.5*t_step)
+            time_error = np.max(np.abs(T_full - T_half))
+
+            if time_error <= 0.5*T_tolerance or t_step < dt_stable:
+                break
+
+            t_step = 0.5*t_step
+
+
+    # Dimensionless numbers at the surface element, at worst-case heating
+    SurfE = Wall.elements[0]
+    Bi_max = h_max * SurfE.dy / SurfE.k
+    F_0 = SurfE.k * t_step / (SurfE.rho * SurfE.cp * SurfE.dy**2)
+
+    config = {  "node_counts":      Wall.node_counts,
+                "t_step":           t_step,
+                "h_max":            h_max,
+                "q_max":            q_max,
+                "Bi_max":           Bi_max,
+                "F_0":              F_0,
+                "dt_stable":        dt_stable,
+                "mesh_error":       mesh_error,
+                "time_error":       time_error }
+
+    print(f"    node_counts = {Wall.node_counts}, t_step = {t_step:.3g} s (largest stable explicit step: {dt_stable:.3g} s)")
+    print(f"    worst case: h = {h_max:.4g} W/m^2K, q = {q_max:.4g} W/m^2, Bi = {Bi_max:.3g}, F_0 = {F_0:.3g}")
+
+
+    # Clean up after the pre-pass, and apply the new configuration if requested
+    if apply:
+        Sim.Aerosurface = Wall
+        Sim.y_coords    = Wall.get_wall_coords()
+        Sim.t_step      = t_step
+
+    Sim.sim_initialize()
+
+    return config
+
+
+
+def _surface_temps_at(Wall, Sim, t_samples, q_samples, t_step):
+    """ Conduction-only solve of the cold-wall heat flux at a given timestep, returns surface temps sampled at t_samples """
+
+    t = np.arange(Sim.t_vec[0], Sim.t_vec[-1], t_step)
+    q = np.interp(t, t_samples, q_samples)
+
+    wall_temps = march_prescribed_flux(Wall, q, t_step, Sim.initial_temp, _conduction_check_bcs(Sim), Sim.conduction_solver)
+
+    return np.interp(t_samples, t, wall_temps[0,:])
+
+
+
+def _conduction_check_bcs(Sim):
+    """ B.C.s for the conduction checks: a prescribed hot face gets the sampled heat flux like the aero would, and prescribed back faces are taken as adiabatic """
+
+    hot, cold = Sim.wall_thermal_bcs
+    hot  = "q_in_aerothermal" if isinstance(hot, PrescribedBC) else hot
+    cold = "adiabatic" if isinstance(cold, PrescribedBC) else cold
+
+    return [hot, cold]
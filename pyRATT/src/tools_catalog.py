@@ -0,0 +1,292 @@
+"""
+Contains the run catalog, a local SQLite database with one row per simulation run: its configuration, summary
+metrics (peak temperatures, heat load, runtime, etc., from Sim.stats) and where its result file (.sim/.csv) is.
+So finding and comparing runs across hundreds of results is a quick (indexed) query, without loading any of them:
+
+    catalog_run(Sim, result_file = "mysimulation.sim")
+    Runs = query_runs(material = "ALU6061", x_location = 0.2, T_peak = (">", 450.0))
+    Runs[["name", "T_peak", "heat_load", "result_file"]]
+
+Filters (see query_runs()) are:
+    column = value              equality (floats to within a relative 1e-9)
+    column = (op, value)        op is one of "<", "<=", ">", ">=", "=", "!=", "like"
+    column = [value, ...]       any of the values
+
+For sweeps, run_record() makes the row for a finished Sim (a plain dict, so it can be sent back from worker
+processes), and catalog_runs() inserts a whole batch of them in one transaction (see tools_stations.run_stations()
+and tools_surrogate.run_design()).
+
+Notes:
+    - The catalog lives in ~/.pyratt/catalog.sqlite by default, set the PYRATT_CATALOG environment variable (or
+    pass catalog) to use a different one
+    - It's opened in WAL mode with a busy timeout, so workers inserting at the same time just take turns
+    - The summary metrics come from Sim.stats (see tools_stats.py), so runs with store_history = False can be
+    cataloged too. "T_peak" is the hottest any node got, "T_surface_max"/"T_back_max" are the hot/back face peaks
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from .tools_run_cache import update_hash
+
+
+# Default location of the catalog
+DEFAULT_CATALOG = os.path.join(os.path.expanduser("~"), ".pyratt", "catalog.sqlite")
+
+# Catalog table columns, and their SQLite types
+CATALOG_COLUMNS = { "id":                   "INTEGER PRIMARY KEY AUTOINCREMENT",
+                    "created":              "TEXT",     # ISO timestamp of when the run was cataloged
+                    "name":                 "TEXT",
+                    "result_file":          "TEXT",     # absolute path to the result file (.sim pickle, .csv, ...)
+                    "run_key":              "TEXT",     # see tools_run_cache.run_key()
+                    "method":               "TEXT",     # run method ("run", "run_waveform", "run_duhamel", "run_lumped")
+                    "material":             "TEXT",     # first (exposed) wall component material
+                    "materials":            "TEXT",     # all of the wall component materials, comma separated
+                    "thickness":            "REAL",     # total wall thickness [m]
+                    "node_count":           "INTEGER",
+                    "x_location":           "REAL",
+                    "deflection_angle_deg": "REAL",
+                    "aerothermal_model":    "TEXT",
+                    "boundary_layer_model": "TEXT",
+                    "conduction_solver":    "TEXT",
+                    "wall_thermal_bcs":     "TEXT",
+                    "trajectory":           "TEXT",     # trajectory file name
+                    "trajectory_hash":      "TEXT",     # hash of the trajectory contents
+                    "mach_scale":           "REAL",
+                    "t_step":               "REAL",
+                    "t_start":              "REAL",
+                    "t_end":                "REAL",
+                    "T_peak":               "REAL",     # [K]
+                    "T_surface_max":        "REAL",     # [K]
+                    "time_surface_max":     "REAL",     # [s]
+                    "T_back_max":           "REAL",     # [K]
+                    "q_net_max":            "REAL",     # [W/m^2]
+                    "heat_load":            "REAL",     # [J/m^2]
+                    "T_limit":              "REAL",     # [K]
+                    "time_above_limit":     "REAL",     # hot face [s]
+                    "t_transition":         "REAL",     # [s]
+                    "energy_drift":         "REAL",     # see tools_energy.py
+                    "runtime":              "REAL",     # [s]
+                    "n_steps":              "INTEGER",
+                    "steps_per_s":          "REAL",
+                    "config":               "TEXT" }    # JSON of the simple (number/string) config entries
+
+# Indexed columns (and column combos), for the common queries
+CATALOG_INDEXES = [("material", "x_location"), ("x_location",), ("T_peak",), ("T_surface_max",), ("heat_load",),
+                    ("trajectory_hash",), ("run_key",), ("name",), ("created",)]
+
+# Comparison operators allowed in query_runs() filters
+QUERY_OPERATORS = ["<", "<=", ">", ">=", "=", "!=", "like"]
+
+
+
+def open_catalog(catalog = None):
+    """
+    Opens the catalog database, creating it (and its table/indexes) if needed.
+
+    Inputs:
+        catalog:    str, optional. Database file, from the argument, the PYRATT_CATALOG environment variable, or the default
+    Outputs:
+        connection: sqlite3.Connection
+    """
+
+    if catalog is None:
+        catalog = os.environ.get("PYRATT_CATALOG", DEFAULT_CATALOG)
+
+    if os.path.dirname(catalog):
+        os.makedirs(os.path.dirname(catalog), exist_ok=True)
+
+    connection = sqlite3.connect(catalog, timeout=60.0)
+    connection.execute("PRAGMA journal_mode=WAL")
+
+    columns = ", ".join(f"{name} {kind}" for name, kind in CATALOG_COLUMNS.items())
+    connection.execute(f"CREATE TABLE IF NOT EXISTS runs ({columns})")
+    for index in CATALOG_INDEXES:
+        connection.execute(f"CREATE INDEX IF NOT EXISTS idx_runs_{'_'.join(index)} ON runs ({', '.join(index)})")
+    connection.commit()
+
+    return connection
+
+
+
+def run_record(Sim, result_file = None, name = None):
+    """
+    Makes the catalog row for a finished simulation.
+
+    Inputs:
+        Sim:            Simulation Object, after a run
+        result_file:    str, optional. Where its results were saved
+        name:           str, optional. Defaults to the result file name
+    Outputs:
+        record:         dict, {column: value}
+    """
+
+    config = Sim.get_config()
+    Wall, Flight, stats = Sim.Aerosurface, Sim.Flight, Sim.stats
+
+    if Flight is not None:
+        h = hashlib.sha1()
+        update_hash(h, [Flight.time_raw, Flight.mach_raw, Flight.alt_raw])
+        trajectory_hash = h.hexdigest()
+        trajectory = os.path.basename(str(Flight.trajectory_file)) if getattr(Flight, "trajectory_file", None) else None
+    else:
+        trajectory_hash, trajectory = None, None
+
+    runtime = getattr(Sim, "runtime", None)
+    energy = getattr(Sim, "energy", None)
+
+    return {"created":              datetime.datetime.now().isoformat(timespec="seconds"),
+            "name":                 name if name is not None else (os.path.splitext(os.path.basename(result_file))[0] if result_file else None),
+            "result_file":          os.path.abspath(result_file) if result_file else None,
+            "run_key":              getattr(Sim, "run_cache_key", None),
+            "method":               getattr(Sim, "run_method", None),
+            "material":             str(Wall.materials[0]),
+            "materials":            ",".join(str(m) for m in Wall.materials),
+            "thickness":            float(np.sum(Wall.thicknesses)),
+            "node_count":           int(Wall.n_tot),
+            "x_location":           config["x_location"],
+            "deflection_angle_deg": config["deflection_angle_deg"],
+            "aerothermal_model":    config["aerothermal_model"],
+            "boundary_layer_model": config["boundary_layer_model"],
+            "conduction_solver":    config["conduction_solver"],
+            "wall_thermal_bcs":     ",".join(bc if isinstance(bc, str) else type(bc).__name__ for bc in config["wall_thermal_bcs"]),
+            "trajectory":           trajectory,
+            "trajectory_hash":      trajectory_hash,
+            "mach_scale":           getattr(Flight, "mach_scale", None),
+            "t_step":               config["t_step"],
+            "t_start":              config["t_start"],
+            "t_end":                float(stats["t_end"]),
+            "T_peak":               float(np.max(stats["T_max"])),
+            "T_surface_max":        float(stats["T_max"][0]),
+            "time_surface_max":     float(stats["t_T_max"][0]),
+            "T_back_max":           float(stats["T_max"][-1]),
+            "q_net_max":            float(stats["q_net_max"]) if stats["t_q_net_max"] is not None else None,
+            "heat_load":            float(stats["heat_load"]),
+            "T_limit":              Sim.T_limit,
+            "time_above_limit":     float(stats["time_above_limit"][0]) if stats["time_above_limit"] is not None else None,
+            "t_transition":         float(stats["t_transition"]) if stats["t_transition"] is not None else None,
+            "energy_drift":         float(energy["drift"]) if energy is not None else None,
+            "runtime":              runtime,
+            "n_steps":              int(stats["n_steps"]),
+            "steps_per_s":          stats["n_steps"] / runtime if runtime else None,
+            "config":               json.dumps({key: value for key, value in config.items() if _simple(value)}) }
+
+
+
+def _simple(value):
+    """ True for config values that go straight into JSON """
+
+    if isinstance(value, (list, tuple)):
+        return all(_simple(v) for v in value)
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+
+def catalog_runs(records, catalog = None):
+    """
+    Inserts a batch of run records (see run_record()) into the catalog, in one transaction.
+
+    Outputs:
+        ids:    int list, catalog ids of the new rows
+    """
+
+    columns = [name for name in CATALOG_COLUMNS if name != "id"]
+    sql = f"INSERT INTO runs ({', '.join(columns)}) VALUES ({', '.join('?'*len(columns))})"
+
+    connection = open_catalog(catalog)
+    try:
+        with connection:
+            ids = [connection.execute(sql, [record.get(name) for name in columns]).lastrowid for record in records]
+    finally:
+        connection.close()
+
+    return ids
+
+
+
+def catalog_run(Sim, result_file = None, name = None, catalog = None):
+    """ Adds a finished simulation to the catalog (see run_record()), returns its catalog id """
+
+    return catalog_runs([run_record(Sim, result_file, name)], catalog)[0]
+
+
+
+def query_runs(catalog = None, order_by = None, limit = None, **filters):
+    """
+    Looks up runs in the catalog, i.e.
+        query_runs(material = "ALU6061", x_location = 0.2, T_peak = (">", 450.0), order_by = "T_peak DESC")
+
+    Inputs:
+        catalog:    str, optional. Database file, see open_catalog()
+        order_by:   str, optional. Column to sort by, with an optional " DESC"
+        limit:      int, optional. Maximum number of runs returned
+        filters:    column = value, column = (op, value), or column = [values] (see module docstring)
+    Outputs:
+        runs:       pandas DataFrame, one row per run
+    """
+
+    clauses, params = [], []
+
+    for column, value in filters.items():
+        _check_column(column)
+
+        if isinstance(value, tuple):
+            op, value = value
+            if op not in QUERY_OPERATORS:
+                raise ValueError(f"Unsupported catalog query operator {op!r}, use one of {QUERY_OPERATORS}")
+            clauses.append(f"{column} {op.upper()} ?")
+            params.append(value)
+        elif isinstance(value, list):
+            clauses.append(f"{column} IN ({', '.join('?'*len(value))})")
+            params.extend(value)
+        elif isinstance(value, float):
+            # Floats to within round-off (still uses the index)
+            tol = 1e-9*max(1.0, abs(value))
+            clauses.append(f"{column} BETWEEN ? AND ?")
+            params.extend([value - tol, value + tol])
+        elif value is None:
+            clauses.append(f"{column} IS NULL")
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+
+    sql = "SELECT * FROM runs"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if order_by is not None:
+        _check_column(order_by.split()[0])
+        direction = order_by.split()[1].upper() if len(order_by.split()) > 1 else "ASC"
+        if direction not in ["ASC", "DESC"]:
+            raise ValueError(f"Unsupported catalog sort direction {direction!r}")
+        sql += f" ORDER BY {order_by.split()[0]} {direction}"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+
+    connection = open_catalog(catalog)
+    try:
+        return pd.read_sql_query(sql, connection, params=params)
+    finally:
+        connection.close()
+
+
+
+def _check_column(column):
+    """ Only known column names go into the SQL """
+
+    if column not in CATALOG_COLUMNS:
+        raise ValueError(f"Unknown catalog column {column!r}, see tools_catalog.CATALOG_COLUMNS")
+
+
+
+def load_run(result_file):
+    """ Loads a cataloged run's pickled Simulation (.sim) result file, i.e. load_run(Runs.result_file[0]) """
+
+    with open(result_file, "rb") as f:
+        return pickle.load(f)
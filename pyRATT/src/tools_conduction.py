@@ -1,4 +1,32 @@
 import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
+from types import SimpleNamespace
+from scipy.linalg import solve_banded, eigh_tridiagonal
+from scipy.signal import lfilter
+
+from . import constants
+from .obj_boundaryconditions import PrescribedBC
+from .tools_aerotherm import net_heat_flux_at, net_heat_flux_derivative_at
+
+
+# Stable timestep of each of the fixed-step explicit solvers, relative to explicit_timestep_limit() (forward Euler).
+# The limit for the real, negative eigenvalues of conduction is 2/lambda_max for Euler and RK2, and 2.785/lambda_max for RK4.
+# RK23 (adaptive) and RKC (stage count picked from the timestep) handle their own stability, as does the implicit solver.
+EXPLICIT_STABILITY_FACTORS = {  "explicit": 1.0, 
+                                "rk2":      1.0, 
+                                "rk4":      1.39 }
+
+# Number of wall modes kept by the "modal" solver, if the Sim doesnt specify one
+DEFAULT_MODAL_COUNT = 8
+
+# Smallest sub-step the RK23 solver will shrink to, as a fraction of the timestep, before giving up
+RK23_MIN_SUBSTEP_FRACTION = 1e-9
+
+# Cached wall eigenbases for the "modal" solver, keyed by WallStack.signature(). Only the MODAL_CACHE_SIZE most
+# recently used are kept, since sweeps over walls/meshes (or ablation, which changes the signature) would pile them up
+MODAL_CACHE_SIZE = 16
+_MODAL_CACHE = OrderedDict()
 
 
 
@@ -7,94 +35,782 @@ def get_new_wall_temps(Sim, i):
     Calculate the temperature rates of change of each of the wall elements 
     and use these to propagate wall temperature forward in time
 
+    Dispatches to the conduction solver specified by Sim.conduction_solver:
+        - "explicit": forward Euler (default, and what everything was validated with)
+        - "rk2":      Heun's 2nd order Runge-Kutta
+        - "rk4":      classic 4th order Runge-Kutta 
+        - "rk23":     Bogacki-Shampine 3(2) embedded pair, which adaptively sub-steps each timestep to
+                      keep the local error below Sim.integrator_tol [K]
+        - "rkc":      2nd order Runge-Kutta-Chebyshev. Picks its number of stages each step so it is stable
+                      for the timestep, and the stable step grows with the square of the stage count. 
+        - "implicit": backward Euler, unconditionally stable
+        - "modal":    reduced-order model, keeping only the Sim.modal_count slowest wall modes and 
+                      integrating them exactly across each step (see modal_wall_temps())
+
+    For the Runge-Kutta solvers, the aero state (h, T_recovery, T_inf) is held at its step i value, and the
+    convection and radiation are re-evaluated at each stage's wall temperature (see stage_heat_flux()). 
+
+    If Sim.surface_coupling is "semi_implicit", the "explicit" and "implicit" solvers instead take the 
+    convection and radiation at the new wall temperature, linearized (see semi_implicit_wall_temps()).
+
     Updates:
     --------
         - Sim.wall_temps[:,i+1], temps at next timestep
     """
 
+    solver = getattr(Sim, "conduction_solver", "explicit")
+
+    if getattr(Sim, "surface_coupling", "explicit") == "semi_implicit":
+        Sim.wall_temps[:,i+1] = semi_implicit_wall_temps(Sim, i)
+    elif solver == "explicit":
+        Sim.wall_temps[:,i+1] = explicit_wall_temps(Sim, i)
+    elif solver == "rk2":
+        Sim.wall_temps[:,i+1] = rk2_wall_temps(Sim, i)
+    elif solver == "rk4":
+        Sim.wall_temps[:,i+1] = rk4_wall_temps(Sim, i)
+    elif solver == "rk23":
+        Sim.wall_temps[:,i+1] = rk23_wall_temps(Sim, i)
+    elif solver == "rkc":
+        Sim.wall_temps[:,i+1] = rkc_wall_temps(Sim, i)
+    elif solver == "implicit":
+        Sim.wall_temps[:,i+1] = implicit_wall_temps(Sim, i)
+    elif solver == "modal":
+        Sim.wall_temps[:,i+1] = modal_wall_temps(Sim, i)
+    else:
+        raise ValueError(f"Unsupported conduction solver specified: {solver}")
+
+    # Force any prescribed-temperature faces
+    if getattr(Sim, "bc_histories", None) is not None:
+        apply_prescribed_temps(Sim, i)
+
+
+
+def boundary_heat_fluxes(Sim, q_net_in, i = None):
+    """
+    Parse the wall thermal boundary conditions and return the heat flux going into
+    the hot-wall (first) and cold-wall (last) nodes
+
+    Inputs:
+        Sim:        Simulation Object
+        q_net_in:   float (or array), net heat flux into the wall [W/m^2]
+        i:          Simulation Timestep, for prescribed heat flux faces (see obj_boundaryconditions.PrescribedBC). 
+                    Without it, prescribed faces get no heat flux, so boundary_heat_fluxes(Sim, 1.0) gives which 
+                    faces see the aero heat flux, and boundary_heat_fluxes(Sim, 0.0, i) just the prescribed ones.
+    Outputs:
+        q_hot:      heat flux into the first node [W/m^2]
+        q_cold:     heat flux into the last node [W/m^2]
+    """
+
+    # Outermost or Hot-wall Element
+    bc = Sim.wall_thermal_bcs[0]
+    if bc == "q_in_aerothermal":
+        q_hot = q_net_in
+    elif isinstance(bc, PrescribedBC):
+        q_hot = prescribed_heat_flux(Sim, 0, i)
+    elif bc == "adiabatic":
+        q_hot = 0.0
+    else:
+        raise Exception('Unsupported B.C type specified for first B.C.') 
+
+    # Inner Wall
+    bc = Sim.wall_thermal_bcs[1]
+    if bc == "q_in_aerothermal":
+        q_cold = q_net_in
+    elif bc == "adiabatic":
+        # No heat-flux. (Same as forcing the "internal" temperature to be in equilibrium with inner-most wall element)
+        q_cold = 0.0
+    elif isinstance(bc, PrescribedBC):
+        q_cold = prescribed_heat_flux(Sim, 1, i)
+    else:
+        raise Exception('Unsupported B.C type specified for second B.C.') 
+
+    return q_hot, q_cold
+
+
+
+def prescribed_heat_flux(Sim, face, i):
+    """ Heat flux into a prescribed face (0 hot, 1 cold) at timestep i. Prescribed-temperature faces get none, they're forced after the step instead """
+
+    if i is None or Sim.wall_thermal_bcs[face].kind != "q":
+        return 0.0
+
+    return Sim.bc_histories[face][i]
+
+
+
+def apply_prescribed_temps(Sim, i):
+    """
+    Forces any prescribed-temperature faces (see obj_boundaryconditions.PrescribedBC) to their temperature at step i+1, 
+    after the conduction solver has stepped (the implicit solvers already build it into their solve, see prescribed_temp_rows()). 
+    The heat flux it took to do that (from the face node's energy balance, with the conduction at the new temperatures) 
+    is written to Sim.q_net[i], for the hot face.
+
+    Updates:
+        Sim.wall_temps[0,i+1] and/or Sim.wall_temps[-1,i+1], Sim.q_net[i]
+    """
+
+    Wall = Sim.Aerosurface
+    T    = Sim.wall_temps
+
+    for face, node, neighbor, G in [(0, 0, 1, Wall.conductance[0]), (1, -1, -2, Wall.conductance[-1])]:
+
+        bc = Sim.wall_thermal_bcs[face]
+        if not (isinstance(bc, PrescribedBC) and bc.kind == "T"):
+            continue
+
+        T_bc = Sim.bc_histories[face][i+1]
+        T[node,i+1] = T_bc
+
+        if face == 0:
+            Sim.q_net[i] = Wall.capacitance[0]*(T_bc - T[0,i])/Sim.t_step - G*(T[1,i+1] - T_bc)
+
+
+
+def conduction_heat_rates(Wall, T):
+    """
+    Net conductive heat flow into each of the wall nodes [W/m^2], using the precomputed
+    WallStack conductances.
+
+    T can either be a 1D vector of nodal temps, or have additional trailing (batch) dimensions, i.e. 
+    T[k,...], in which case the same wall is solved for each of the batch entries.
+    """
+
+    # Reshape conductance so it broadcasts against any trailing batch dims
+    G = Wall.conductance.reshape((-1,) + (1,)*(np.ndim(T)-1))
+
+    # Heat flowing from node j+1 into node j
+    q_cond = G * (T[1:] - T[:-1])
+
+    q_in = np.zeros_like(T, dtype=float)
+    q_in[:-1] += q_cond
+    q_in[1:]  -= q_cond
+
+    return q_in
+
+
+
+def wall_temp_rates(Wall, T, q_hot, q_cold):
+    """
+    Temperature rate of change of each of the wall nodes [K/s], given the boundary heat fluxes
+    going into the first (hot-wall) and last (cold-wall) nodes.
+
+    This is the conduction "right-hand-side" used by all of the explicit solvers. 
+    """
+
+    q_in = conduction_heat_rates(Wall, T)
+    q_in[0]  += q_hot
+    q_in[-1] += q_cold
+
+    C = Wall.capacitance.reshape((-1,) + (1,)*(np.ndim(T)-1))
+
+    return q_in / C
+
+
+
+def explicit_wall_temps(Sim, i):
+    """ Forward-Euler step of the wall temperatures. Returns wall temps at step i+1 """
+
     #Aliases
     Tvec_wall = Sim.wall_temps[:,i]
-    q_net_in = Sim.q_net[i]
 
+    q_hot, q_cold = boundary_heat_fluxes(Sim, Sim.q_net[i], i)
+
+    # Update Temperatures
+    return Tvec_wall + wall_temp_rates(Sim.Aerosurface, Tvec_wall, q_hot, q_cold)*Sim.t_step
+
+
+
+def stage_heat_flux(Sim, i, T_w):
+    """
+    Net heat flux into the wall at timestep i, for a hot-wall temperature T_w. 
+
+    For aerothermal simulations this re-evaluates the convection and radiation at T_w (see 
+    tools_aerotherm.net_heat_flux_at()). Conduction-only simulations that don't have an aero 
+    state (like march_prescribed_flux()) just get their prescribed Sim.q_net[i].
+    """
+
+    if not hasattr(Sim, "h_coeff"):
+        return Sim.q_net[i]
+
+    return net_heat_flux_at(Sim, i, T_w)
+
+
+
+def stage_temp_rates(Sim, i, T):
+    """ 
+    Conduction right-hand-side, dT/dt, for the Runge-Kutta solvers at timestep i, evaluated at wall temps T.
+
+    Like the forward Euler solver, both faces see the heat flux evaluated at the hot-wall temperature.
+    """
+
+    q_hot, q_cold = boundary_heat_fluxes(Sim, stage_heat_flux(Sim, i, T[0]), i)
+
+    rates = wall_temp_rates(Sim.Aerosurface, T, q_hot, q_cold)
+
+    # Prescribed-temperature faces are held through the stages, and forced to their new value after the step
+    if getattr(Sim, "bc_histories", None) is not None:
+        for face, node in [(0, 0), (1, -1)]:
+            if isinstance(Sim.wall_thermal_bcs[face], PrescribedBC) and Sim.wall_thermal_bcs[face].kind == "T":
+                rates[node] = 0.0
+
+    return rates
+
+
+
+def rk2_wall_temps(Sim, i):
+    """ Heun's method (2nd order Runge-Kutta) step of the wall temperatures. Returns wall temps at step i+1 """
+
+    T  = Sim.wall_temps[:,i]
+    dt = Sim.t_step
+
+    k1 = stage_temp_rates(Sim, i, T)
+    k2 = stage_temp_rates(Sim, i, T + dt*k1)
+
+    return T + 0.5*dt*(k1 + k2)
+
+
+
+def rk4_wall_temps(Sim, i):
+    """ Classic 4th order Runge-Kutta step of the wall temperatures. Returns wall temps at step i+1 """
+
+    T  = Sim.wall_temps[:,i]
+    dt = Sim.t_step
+
+    k1 = stage_temp_rates(Sim, i, T)
+    k2 = stage_temp_rates(Sim, i, T + 0.5*dt*k1)
+    k3 = stage_temp_rates(Sim, i, T + 0.5*dt*k2)
+    k4 = stage_temp_rates(Sim, i, T + dt*k3)
+
+    return T + dt/6.0*(k1 + 2*k2 + 2*k3 + k4)
+
+
+
+def rk23_wall_temps(Sim, i):
+    """ 
+    Bogacki-Shampine 3(2) embedded Runge-Kutta pair, adaptively sub-stepping across the timestep.
+    Returns wall temps at step i+1.
+
+    The difference between the 3rd and 2nd order solutions estimates the local error, and sub-steps are 
+    resized to keep its max over the nodes below Sim.integrator_tol [K]. The last accepted sub-step size
+    is carried over to the next timestep (Sim.rk23_substep). 
+
+    Raises a RuntimeError if the error estimate goes non-finite (NaN/inf heat fluxes or temperatures), or the
+    sub-step has to shrink below RK23_MIN_SUBSTEP_FRACTION of the timestep, instead of looping forever.
+
+    Source: Bogacki, P., Shampine, L. F., "A 3(2) pair of Runge-Kutta formulas", 1989
+    """
+
+    tol     = getattr(Sim, "integrator_tol", 0.01)
+    T       = Sim.wall_temps[:,i]
+    t_left  = Sim.t_step
+    h       = min(getattr(Sim, "rk23_substep", t_left), t_left)
+
+    k1 = stage_temp_rates(Sim, i, T)
+
+    while t_left > 0.0:
+
+        h = min(h, t_left)
+
+        k2 = stage_temp_rates(Sim, i, T + 0.5*h*k1)
+        k3 = stage_temp_rates(Sim, i, T + 0.75*h*k2)
+        T_new = T + h*(2.0*k1 + 3.0*k2 + 4.0*k3)/9.0
+        k4 = stage_temp_rates(Sim, i, T_new)
+
+        # Embedded 2nd order solution, for error estimation
+        err = np.max(np.abs( h*(-5.0*k1/72.0 + k2/12.0 + k3/9.0 - k4/8.0) ))
+
+        # (NaNs never pass the error check, so would just shrink the sub-step forever)
+        if not np.isfinite(err):
+            raise RuntimeError(f"RK23 conduction solver error estimate went non-finite at t = {Sim.t_vec[i]:.3f} s, "
+                                "check the heat fluxes/boundary conditions for NaNs")
+
+        if err <= tol:
+            # Accept (First Same As Last, k4 becomes the next k1)
+            T = T_new
+            k1 = k4
+            t_left -= h
+
+        # Resize sub-step, with the usual safety factor and growth/shrink limits
+        h = h * min(5.0, max(0.2, 0.9*(tol/max(err, 1e-300))**(1.0/3.0)))
+
+        if h < RK23_MIN_SUBSTEP_FRACTION*Sim.t_step and t_left > h:
+            raise RuntimeError(f"RK23 conduction solver sub-step shrank below {RK23_MIN_SUBSTEP_FRACTION:g} of the timestep at t = {Sim.t_vec[i]:.3f} s, "
+                                f"integrator_tol = {tol:g} K can't be met")
+
+    Sim.rk23_substep = h
+
+    return T
+
+
+
+@lru_cache(maxsize=None)
+def rkc_coefficients(s, eps = 2.0/13.0):
+    """
+    Coefficients of the s-stage, 2nd order Runge-Kutta-Chebyshev method.
+
+    Outputs:
+        beta:       float, length of the real stability interval [-beta, 0]. Grows as ~0.65*s^2
+        mu, nu, mu_t, gam_t: numpy arrays, stage coefficients (indexed by stage j)
+
+    Source: Sommeijer, B. P., Shampine, L. F., Verwer, J. G., "RKC: An explicit solver for parabolic PDEs", 1998
+    """
+
+    w0 = 1.0 + eps/s**2
+
+    # Chebyshev polynomials of the first kind, and their 1st and 2nd derivatives, at w0
+    T   = np.zeros(s+1); dT  = np.zeros(s+1); ddT = np.zeros(s+1)
+    T[0], T[1] = 1.0, w0
+    dT[1] = 1.0
+    for j in range(2, s+1):
+        T[j]   = 2*w0*T[j-1] - T[j-2]
+        dT[j]  = 2*T[j-1] + 2*w0*dT[j-1] - dT[j-2]
+        ddT[j] = 4*dT[j-1] + 2*w0*ddT[j-1] - ddT[j-2]
+
+    w1 = dT[s] / ddT[s]
+
+    b = np.zeros(s+1)
+    b[2:] = ddT[2:] / dT[2:]**2
+    b[0] = b[1] = b[2]
+    a = 1.0 - b*T
+
+    mu = np.zeros(s+1); nu = np.zeros(s+1); mu_t = np.zeros(s+1); gam_t = np.zeros(s+1)
+    mu_t[1] = b[1]*w1
+    for j in range(2, s+1):
+        mu[j]    = 2*b[j]*w0 / b[j-1]
+        nu[j]    = -b[j] / b[j-2]
+        mu_t[j]  = 2*b[j]*w1 / b[j-1]
+        gam_t[j] = -a[j-1]*mu_t[j]
+
+    beta = (1.0 + w0) / w1
+
+    return beta, mu, nu, mu_t, gam_t
+
+
+
+def rkc_wall_temps(Sim, i):
+    """ 
+    2nd order Runge-Kutta-Chebyshev step of the wall temperatures. Returns wall temps at step i+1.
+
+    The number of stages is the smallest that makes the method stable for this step, based on a 
+    (Gershgorin) bound of the conduction operator's spectral radius, including the linearized 
+    convection and radiation at the exposed face(s).
+    """
+
+    T  = Sim.wall_temps[:,i]
+    dt = Sim.t_step
+
+    # Effective heat transfer coefficient at the hot wall (convection + linearized radiation)
+    h_eff = 4.0 * constants.SB_CONST * Sim.Aerosurface.elements[0].emis * T[0]**3
+    if hasattr(Sim, "h_coeff"):
+        h_eff += Sim.h_coeff[i]
+    h_cold = h_eff if Sim.wall_thermal_bcs[1] == "q_in_aerothermal" else 0.0
 
-    #Initialize Zeros Vector
-    dT_dt = np.zeros( (len(Sim.Aerosurface.elements),),  dtype=float)
+    spectral_radius = 2.0 / explicit_timestep_limit(Sim.Aerosurface, h_eff, h_cold)
 
-    #For all of the Elements in the Aerosurface Stack
-    for j, e in enumerate(Sim.Aerosurface.elements):
+    # Smallest stable stage count
+    s = 2
+    while rkc_coefficients(s)[0] < dt*spectral_radius:
+        s += 1
 
-        # Outermost or Hot-wall Element
-        if j == 0:
+    _, mu, nu, mu_t, gam_t = rkc_coefficients(s)
 
-            #Parse Boundary Condition Types
-            if Sim.wall_thermal_bcs[0] == "q_in_aerothermal":
-                dT_dt[j] = 1 / (e.dy*e.rho*e.cp) * (q_net_in + e.k*(Tvec_wall[1] - Tvec_wall[0]) / e.dy)
-            else:
-                raise Exception('Only "q_in_aerothermal" type supported for first B.C.') 
+    F0 = stage_temp_rates(Sim, i, T)
+    Y_prev2 = T
+    Y_prev  = T + mu_t[1]*dt*F0
 
-        # Inner Wall
-        elif j == len(Sim.Aerosurface.elements)-1:
-        
-            #Parse Boundary Condition Types
-            if Sim.wall_thermal_bcs[1] == "q_in_aerothermal":
-                dT_dt[j] = 1 / (e.dy*e.rho*e.cp) * (q_net_in + e.k*(Tvec_wall[j-1] - Tvec_wall[j]) / e.dy)
-            elif Sim.wall_thermal_bcs[1] == "adiabatic":
-                # No heat-flux. Accomplish by forcing the "internal" (i.e. inside the nosecone) temperature
-                # to be in equilibrium with inner-most wall element 
-                T_internal = Tvec_wall[-1] # Inner Wall BC
+    for j in range(2, s+1):
+        Y = (1.0 - mu[j] - nu[j])*T + mu[j]*Y_prev + nu[j]*Y_prev2 + mu_t[j]*dt*stage_temp_rates(Sim, i, Y_prev) + gam_t[j]*dt*F0
+        Y_prev2, Y_prev = Y_prev, Y
 
-                dT_dt[j] = e.k / (e.rho*e.cp* e.dy**2) * (T_internal - 2*Tvec_wall[j] + Tvec_wall[j-1])
-            else:
-                raise Exception('Unsupported B.C type specified for second B.C.') 
+    return Y_prev
 
 
-        # #Middle Elements
+
+def implicit_lhs_banded(Wall, t_step):
+    """
+    Left-hand-side matrix, (C + dt*K), for the backward-Euler conduction solve, in 
+    scipy.linalg.solve_banded format. Only depends on the wall and the timestep, so
+    compute it once (see Thermal_Sim_1D.sim_initialize)
+    """
+
+    lhs = t_step * Wall.conduction_matrix_banded()
+    lhs[1] += Wall.capacitance
+
+    return lhs
+
+
+
+def implicit_wall_temps(Sim, i):
+    """ 
+    Backward-Euler step of the wall temperatures. Returns wall temps at step i+1 
+
+    The boundary heat fluxes are still evaluated explicitly (at step i), only the
+    conduction itself is implicit.
+    """
+
+    #Aliases
+    Wall = Sim.Aerosurface
+    Tvec_wall = Sim.wall_temps[:,i]
+
+    q_hot, q_cold = boundary_heat_fluxes(Sim, Sim.q_net[i], i)
+
+    # Right hand side: C*T^n + dt*q_boundary
+    rhs = Wall.capacitance * Tvec_wall
+    rhs[0]  += Sim.t_step * q_hot
+    rhs[-1] += Sim.t_step * q_cold
+
+    lhs = Sim.implicit_lhs
+    if getattr(Sim, "bc_histories", None) is not None:
+        lhs = prescribed_temp_rows(Sim, i, lhs, rhs)
+
+    return solve_banded((1, 1), lhs, rhs)
+
+
+
+def prescribed_temp_rows(Sim, i, lhs, rhs):
+    """ 
+    Replaces the rows of any prescribed-temperature faces in a (banded) implicit system with T = T_bc at step i+1, 
+    so their neighbors see the prescribed temperature within the same step. Modifies rhs in place, returns the lhs
+    (a modified copy, if there are any).
+    """
+
+    for face, node, off_diag in [(0, 0, (0, 1)), (1, -1, (2, -2))]:
+
+        bc = Sim.wall_thermal_bcs[face]
+        if isinstance(bc, PrescribedBC) and bc.kind == "T":
+            lhs = lhs.copy()
+            lhs[1, node] = 1.0
+            lhs[off_diag] = 0.0
+            rhs[node] = Sim.bc_histories[face][i+1]
+
+    return lhs
+
+
+
+def semi_implicit_wall_temps(Sim, i):
+    """
+    Step of the wall temperatures with the surface heat flux(es) treated implicitly. Returns wall temps at step i+1 
+
+    Normally the convection, h*(T_r - T_w), and radiation, emis*SB*(T_inf^4 - T_w^4), are evaluated at the
+    old wall temperature, which is what limits the timestep at high heating (big h) on thin, low conductivity
+    skins. Here they get linearized about the wall temperature,
+        q(T) ~= q(T*) + dq/dT(T*) * (T - T*)
+    and the dq/dT part moves to the left hand side, so it acts like an extra (implicit) conductance to the flow.
+    With Sim.newton_iterations > 0, the linearization is redone about the new temperature and re-solved, to
+    pick up the curvature of the T^4 radiation term.
+
+    Works with the "implicit" solver (folded into the backward-Euler matrix), and the "explicit" solver (the 
+    exposed surface node(s) are updated point-implicitly, so h drops out of the explicit stability limit). 
+
+    Notes:
+        - For fins (both faces aerothermal), each face is linearized about its own temperature, rather than 
+        both using the hot-wall temperature
+        - The heat flux that actually got applied (with the linearization evaluated at the new temperature) 
+        is written back to Sim.q_conv[i], Sim.q_rad[i] and Sim.q_net[i]
+    """
+
+    #Aliases
+    Wall = Sim.Aerosurface
+    C    = Wall.capacitance
+    dt   = Sim.t_step
+    T_n  = Sim.wall_temps[:,i]
+
+    # Which faces see the aero heat flux, 1.0 or 0.0, and any prescribed heat fluxes
+    w_hot, w_cold = boundary_heat_fluxes(Sim, 1.0)
+    q_bc = np.array(boundary_heat_fluxes(Sim, 0.0, i))
+
+    # Explicit conduction into each node (only used by the explicit solver)
+    if Sim.conduction_solver == "explicit":
+        q_cond = conduction_heat_rates(Wall, T_n)
+
+    T_star = T_n[[0,-1]]
+
+    for n in range(getattr(Sim, "newton_iterations", 0) + 1):
+
+        # Linearized surface heat flux at each face, q ~= a + b*T
+        b = net_heat_flux_derivative_at(Sim, i, T_star) * np.array([w_hot, w_cold])
+        a = net_heat_flux_at(Sim, i, T_star) * np.array([w_hot, w_cold]) - b*T_star + q_bc
+
+        if Sim.conduction_solver == "implicit":
+            lhs = Sim.implicit_lhs.copy()
+            lhs[1,0]  -= dt*b[0]
+            lhs[1,-1] -= dt*b[1]
+
+            rhs = C * T_n
+            rhs[0]  += dt*a[0]
+            rhs[-1] += dt*a[1]
+
+            if Sim.bc_histories is not None:
+                lhs = prescribed_temp_rows(Sim, i, lhs, rhs)
+
+            T_new = solve_banded((1, 1), lhs, rhs)
+
+        elif Sim.conduction_solver == "explicit":
+            T_new = T_n + dt*q_cond/C
+            T_new[0]  = (C[0]*T_n[0]   + dt*(q_cond[0]  + a[0])) / (C[0]  - dt*b[0])
+            T_new[-1] = (C[-1]*T_n[-1] + dt*(q_cond[-1] + a[1])) / (C[-1] - dt*b[1])
+
         else:
-            dT_dt[j] = e.k/(e.rho*e.cp*e.dy**2) * (Tvec_wall[j+1] - 2*Tvec_wall[j] + Tvec_wall[j-1])
+            raise ValueError(f'Semi-implicit surface coupling not supported by the "{Sim.conduction_solver}" conduction solver')
 
+        T_star = T_new[[0,-1]]
 
-    # Update Temperatures
-    Sim.wall_temps[:,i+1] = Tvec_wall + dT_dt*Sim.t_step
+    # Record the hot-wall heat flux that was actually applied
+    Sim.q_net[i]  = a[0] + b[0]*T_new[0]
+    Sim.q_conv[i] = Sim.h_coeff[i] * (Sim.T_recovery[i] - T_new[0])
+    Sim.q_rad[i]  = Sim.q_net[i] - Sim.q_conv[i]
+
+    return T_new
+
+
+
+def modal_basis(Wall):
+    """
+    Eigen-decomposition of the wall's conduction operator, for the "modal" solver. Cached per wall.
+
+    The conduction equations are C*dT/dt = -K*T + (boundary fluxes), with C the (diagonal) capacitances 
+    and K the (symmetric, tridiagonal) conductance matrix. Symmetrizing with C^(-1/2)*K*C^(-1/2) = V*diag(lam)*V^T 
+    gives the wall modes phi = C^(-1/2)*V, which are C-orthonormal (phi^T*C*phi = I), so the modal 
+    amplitudes of a temperature profile are just z = phi^T*C*T, and each one decays independently at rate lam.
+
+    Outputs:
+        lam:    numpy float array, mode decay rates [1/s], slowest first (the first is the uniform, lam=0 mode)
+        phi:    numpy float 2D array, phi[k,j] is mode j at node k
+    """
+
+    key = Wall.signature()
+
+    if key not in _MODAL_CACHE:
+        C_isqrt = 1.0 / np.sqrt(Wall.capacitance)
+
+        lam, V = eigh_tridiagonal(Wall.conductance_sum * C_isqrt**2, -Wall.conductance * C_isqrt[:-1] * C_isqrt[1:])
+
+        # Round-off can make the zero mode very slightly negative
+        _MODAL_CACHE[key] = (np.maximum(lam, 0.0), C_isqrt[:,np.newaxis] * V)
+        while len(_MODAL_CACHE) > MODAL_CACHE_SIZE:
+            _MODAL_CACHE.popitem(last=False)
+
+    _MODAL_CACHE.move_to_end(key)
+
+    return _MODAL_CACHE[key]
+
+
+
+def modal_step_coefficients(lam, t_step):
+    """
+    Exact (exponential) integration of dz/dt = -lam*z + f across a step with constant f:
+        z^n+1 = E*z^n + G*f,   E = exp(-lam*dt),   G = (1 - exp(-lam*dt))/lam  (= dt for lam = 0)
+    """
+
+    E = np.exp(-lam*t_step)
+    G = np.full_like(lam, t_step)
+    decaying = lam*t_step > 1e-12
+    G[decaying] = -np.expm1(-lam[decaying]*t_step) / lam[decaying]
 
+    return E, G
+
+
+
+def modal_truncation_error(Wall, n_modes, wall_thermal_bcs = ["q_in_aerothermal","adiabatic"]):
+    """
+    Estimate of the hot-wall temperature error from dropping all but the n_modes slowest wall modes, 
+    per unit applied heat flux [K per W/m^2].
+
+    The dropped modes are fast, so under a (slowly varying) heat flux q they just sit at their quasi-steady
+    amplitudes, f_j*q/lam_j. Their summed contribution at the surface is what the reduced model misses.
+    Multiply by your peak heat flux to get a temperature.
+    """
+
+    lam, phi = modal_basis(Wall)
+    lam, phi = lam[n_modes:], phi[:, n_modes:]
+
+    f = phi[0].copy()
+    if wall_thermal_bcs[1] == "q_in_aerothermal":
+        f += phi[-1]
+
+    return np.abs(np.sum(phi[0] * f / lam))
+
+
+
+def modal_wall_temps(Sim, i):
+    """
+    Reduced-order (modal) step of the wall temperatures. Returns wall temps at step i+1 
+
+    Projects the current temperatures onto the Sim.modal_count slowest wall modes (see modal_basis()), 
+    integrates each modal amplitude exactly across the step, with the boundary heat fluxes held at their 
+    step i values, and reconstructs the temperatures. Unconditionally stable, with no time-discretization 
+    error in the conduction itself. The projection and reconstruction are each O(N*m) per step (N nodes, m modes
+    kept), so a step costs more than the O(N) banded solves, the savings come from the bigger timesteps it allows.
+
+    Keeping all the modes is an exact solution of the (spatially discretized) conduction equations.
+    """
+
+    #Aliases
+    Wall = Sim.Aerosurface
+    n_modes = getattr(Sim, "modal_count", DEFAULT_MODAL_COUNT)
+
+    lam, phi = modal_basis(Wall)
+    lam, phi = lam[:n_modes], phi[:, :n_modes]
+
+    q_hot, q_cold = boundary_heat_fluxes(Sim, Sim.q_net[i], i)
+
+    # Modal amplitudes and forcing
+    z = phi.T @ (Wall.capacitance * Sim.wall_temps[:,i])
+    f = phi[0]*q_hot + phi[-1]*q_cold
+
+    E, G = modal_step_coefficients(lam, Sim.t_step)
+
+    return phi @ (E*z + G*f)
+
+
+
+def march_prescribed_flux_modal(Wall, q_net, t_step, initial_temp, wall_thermal_bcs = ["q_in_aerothermal","adiabatic"], n_modes = DEFAULT_MODAL_COUNT, nodes = None):
+    """
+    Modal version of march_prescribed_flux(), for fast inner loops (optimization, Monte Carlo, etc.)
+
+    Since the modal amplitudes are independent, each one is a first order linear recurrence driven by the 
+    heat flux history, which gets run as a (compiled) scipy.signal.lfilter over the whole history at once. 
+    The temperatures are then only reconstructed at the nodes asked for. So past the (cached) eigen-decomposition,
+    the cost is O(n_modes) per step for the recurrences, plus O(len(nodes)*n_modes) per step for the reconstruction,
+    which is O(N*n_modes) when all N nodes are returned.
+
+    Inputs:
+        Wall:               WallStack object
+        q_net:              numpy float array, net heat flux into the wall at each timestep [W/m^2]
+        t_step:             float, timestep [s]
+        initial_temp:       float, initial (uniform) wall temperature [K]
+        wall_thermal_bcs:   see Thermal_Sim_1D
+        n_modes:            int, number of wall modes to keep
+        nodes:              int list, optional. Nodes to return the temperatures of (default all)
+    Outputs:
+        wall_temps:         numpy float 2D array, wall_temps[k,i] for k in nodes
+    """
+
+    q_net = np.asarray(q_net, dtype=float)
+
+    lam, phi = modal_basis(Wall)
+    lam, phi = lam[:n_modes], phi[:, :n_modes]
+
+    # Forcing of each mode per unit q_net
+    q_hot, q_cold = boundary_heat_fluxes(SimpleNamespace(wall_thermal_bcs = wall_thermal_bcs), 1.0)
+    f = phi[0]*q_hot + phi[-1]*q_cold
+
+    E, G = modal_step_coefficients(lam, t_step)
+
+    # z_j^n+1 = E_j*z_j^n + G_j*f_j*q^n, starting from zero (the uniform initial temp is added back after)
+    z = np.empty((lam.size, q_net.size), dtype=float)
+    for j in range(lam.size):
+        z[j] = lfilter([0.0, G[j]*f[j]], [1.0, -E[j]], q_net)
+
+    if nodes is not None:
+        phi = phi[nodes]
+
+    return initial_temp + phi @ z
+
+
+
+
+def march_prescribed_flux(Wall, q_net, t_step, initial_temp, wall_thermal_bcs = ["q_in_aerothermal","adiabatic"], conduction_solver = "implicit", set_surface_temp = None):
+    """
+    Marches the wall temperatures through a prescribed net heat flux history, with no aerothermal 
+    coupling. Handy for quick conduction-only checks (see tools_autoconfig.py), since this skips
+    all the aero stuff.
+
+    Inputs:
+        Wall:               WallStack object
+        q_net:              numpy float array, net heat flux into the wall at each timestep [W/m^2]
+        t_step:             float, timestep [s]
+        initial_temp:       float, initial wall temperature [K]
+        wall_thermal_bcs:   see Thermal_Sim_1D
+        conduction_solver:  see Thermal_Sim_1D
+        set_surface_temp:   float, optional. If specified, the hot-wall node is forced to this temperature 
+                            at every step (like validation_cases/transient_cond.py does)
+    Outputs:
+        wall_temps:         numpy float 2D array, wall_temps[k,i]
+    """
+
+    # Just enough of a Simulation object for the conduction solvers to run on
+    Sim = SimpleNamespace(Aerosurface = Wall, 
+                            q_net = np.asarray(q_net, dtype=float), 
+                            t_step = t_step,
+                            wall_thermal_bcs = wall_thermal_bcs, 
+                            conduction_solver = conduction_solver)
+    
+    Sim.wall_temps = np.zeros((Wall.n_tot, np.size(Sim.q_net)), dtype=float)
+    Sim.wall_temps[:,0] = initial_temp
+
+    if conduction_solver == "implicit":
+        Sim.implicit_lhs = implicit_lhs_banded(Wall, t_step)
+
+    for i in range(np.size(Sim.q_net)-1):
+
+        if set_surface_temp is not None:
+            Sim.wall_temps[0,i] = set_surface_temp
+
+        get_new_wall_temps(Sim, i)
+
+    return Sim.wall_temps
+
+
+
+def explicit_timestep_limit(Wall, h_hot = 0.0, h_cold = 0.0):
+    """
+    Largest stable timestep for the explicit (forward Euler) solver. 
+
+    Each node's new temperature is a weighted sum of its old temperature and its neighbors', and 
+    the solver stays stable (and non-oscillatory) as long as none of those weights go negative, i.e.
+        dt <= C_j / (sum of conductances to node j)
+    for all nodes j, where the convective heat transfer coefficient acts as an extra conductance at 
+    the exposed face(s). For a uniform wall this is the usual Fourier number criterion, F_0 <= 0.5 
+    on the interior, and F_0*(1+Bi) <= 1 on the surface element.
+
+    Inputs:
+        Wall:   WallStack object
+        h_hot:  float, heat transfer coefficient at the hot-wall face [W/m^2K]
+        h_cold: float, heat transfer coefficient at the cold-wall face [W/m^2K]
+    Outputs:
+        dt_max: float, largest stable explicit timestep [s]
+    """
+    
+    G_sum = Wall.conductance_sum.copy()
+    G_sum[0]  += h_hot
+    G_sum[-1] += h_cold
+
+    return np.min(Wall.capacitance / G_sum)
 
 
 
 def stability_criterion_check(Sim, i):
     """
     Stability criterion for the numerical stability of the solver. Will print warning to console
-    if this criterion is not satisfied
+    if this criterion is not satisfied (just once per simulation, so it doesnt flood the terminal)
 
     In my past experience this is a pretty accurate marker of when your timestep is too big,
-    or your element size is too small.  
+    or your element size is too small. Checks every node (see explicit_timestep_limit()), not just 
+    the surface element, since stretched/multi-material walls can have their smallest elements anywhere.
+
+    If you don't want to guess a timestep, see tools_autoconfig.auto_configure()
 
     Notes:
-        TODO: odifications to Stability Criterion Check Needed when Ablative is added
+        - When ablating, the wall arrays are remapped as the surface recedes (see tools_ablation.py), so this 
+        always checks the current, shrunken surface elements
     """
 
-    """ Carryover code from Matlab, for future work
-    If No Ablative, Structure is exposed
-    dy = SurfE.dy
-    rho_s = SurfE.rho
-    Cp_s = SurfE.cp
-    k_s = SurfE.k
-
-    If Ablative is exposed, more annoying to deal with but yeah
-    else:
-        dy = Abl.deltaVec(i)/(Sim.N - 1);
-        rho_s = Abl.rhoVec_tot(1,i);
-        Cp_s  = interp1(Abl.cpLUTab.Var1,Abl.cpLUTab.Var2, Abl.TVec(1,i), 'linear', 'extrap');
-        k_s = interp1(Abl.kLUTab.Var1,Abl.kLUTab.Var2, Abl.TVec(1,i),'linear', 'extrap');
-    """
+    # Only warn once, and only for the fixed-step explicit solvers (the rest handle their own stability)
+    solver = getattr(Sim, "conduction_solver", "explicit")
+    if getattr(Sim, "stability_warned", False) or solver not in EXPLICIT_STABILITY_FACTORS:
+        return
 
     #Aliasing
-    SurfE   = Sim.Aerosurface.elements[0]
     h       = Sim.h_coeff[i] 
-    dt      = Sim.t_step
+    h_cold  = h if Sim.wall_thermal_bcs[1] == "q_in_aerothermal" else 0.0
+
+    # With the semi-implicit surface coupling, the convection no longer limits the explicit timestep
+    if getattr(Sim, "surface_coupling", "explicit") == "semi_implicit":
+        h, h_cold = 0.0, 0.0
     
     # Perform Stability Check 
-    F_0 = (SurfE.k * dt) / (SurfE.rho * SurfE.cp * SurfE.dy**2)
-    Bi = (h * SurfE.dy) / SurfE.k
-
-    if ( F_0*(1+Bi) > .5):
-        print('~~WARNING~~: Stability Criterion not met. Consider decreasing timestep or number of wall nodes)')
+    if Sim.t_step > EXPLICIT_STABILITY_FACTORS[solver] * explicit_timestep_limit(Sim.Aerosurface, h, h_cold):
+        print(f'~~WARNING~~: Stability Criterion not met at t = {Sim.t_vec[i]:.3f} s. Consider decreasing timestep or number of wall nodes)')
+        Sim.stability_warned = True
 
@@ -0,0 +1,316 @@
+"""
+Contains the tools for running grid/timestep convergence studies on a simulation.
+
+Instead of hand-running a case at a bunch of different node_counts and t_step values,
+convergence_study() takes a Thermal_Sim_1D, builds a ladder of successively refined copies of it,
+runs them in parallel, and uses Richardson extrapolation to estimate the "exact" answer and the
+error of each level. It then reports the cheapest level that is within a requested tolerance.
+
+There are also built-in verification cases (see verification_study()), which run the conduction
+solver against the semi-infinite wall analytical solutions from Incropera (the same ones used in
+validation_cases/transient_cond.py), where we know the exact answer and can check the observed
+order of accuracy directly.
+
+Notes:
+    - For the flight cases, space and time are refined together. By default the timestep is refined by
+    r^2 for every r the element size is refined by, which keeps the Fourier number (and so explicit
+    stability) constant. Set time_refinement_ratio to change this.
+    - Since this uses multiprocessing, on Windows/macOS the script calling this needs the usual
+    if __name__ == "__main__": guard.
+
+References:
+    [1] Roache, P. J., Verification and Validation in Computational Science and Engineering, 1998
+    [2] Incropera et al., Fundamentals of Heat and Mass Transfer Sixth Edition, CH 5.7, Pg. 283-295
+"""
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import special
+
+from .materials_solid import MATERIALS_DICT
+from .obj_wallcomponents import WallStack
+from .tools_conduction import march_prescribed_flux
+
+
+
+def convergence_study(Sim, levels = 3, refinement_ratio = 2, time_refinement_ratio = None, T_tolerance = 1.0, n_workers = None):
+    """
+    Runs a refinement ladder of a simulation in parallel and performs Richardson extrapolation
+    on the peak hot-wall and cold-wall temperatures.
+
+    Inputs:
+        Sim:                    Thermal_Sim_1D object, the coarsest level of the ladder (doesn't need to be run)
+        levels:                 int, number of levels in the ladder (at least 3, for the observed order)
+        refinement_ratio:       int, factor the element size is refined by between levels
+        time_refinement_ratio:  float, factor the timestep is refined by between levels. Defaults to
+                                refinement_ratio^2 (constant Fourier number)
+        T_tolerance:            float, allowable error in the peak temperatures [K]
+        n_workers:              int, number of parallel processes. Defaults to one per CPU
+
+    Outputs:
+        results: dict, containing:
+            "levels":           list of dicts with node_counts, t_step, peak temps, runtime, and estimated errors
+            "observed_order":   dict, observed order of convergence for the hot and cold wall peak temps
+            "extrapolated":     dict, Richardson-extrapolated peak temps
+            "recommended":      int, index of the cheapest level meeting T_tolerance (None if none do)
+    """
+
+    if levels < 3:
+        raise ValueError("Need at least 3 levels to determine an observed order of convergence")
+
+    if time_refinement_ratio is None:
+        time_refinement_ratio = refinement_ratio**2
+
+    # Build the refinement ladder
+    base_config = Sim.get_config()
+    configs = []
+
+    for l in range(levels):
+        config = dict(base_config)
+        config["Aerosurface"] = refine_wall(Sim.Aerosurface, refinement_ratio**l)
+        config["t_step"] = Sim.t_step / time_refinement_ratio**l
+        configs.append(config)
+
+
+    # Run all levels in parallel
+    print(f"Running {levels} level convergence study...")
+    with ProcessPoolExecutor(max_workers = n_workers) as pool:
+        level_results = list(pool.map(_run_level, configs))
+
+
+    # Richardson Extrapolation
+    results = {"levels": level_results, "observed_order": {}, "extrapolated": {}}
+
+    for key in ["peak_T_hot", "peak_T_cold"]:
+        f = [lvl[key] for lvl in level_results]
+        p, f_ext = richardson_extrapolation(f, refinement_ratio)
+
+        results["observed_order"][key] = p
+        results["extrapolated"][key] = f_ext
+
+        for lvl in level_results:
+            lvl[key + "_error"] = abs(lvl[key] - f_ext)
+
+
+    # Cheapest level that meets the tolerance (the ladder is ordered cheapest first)
+    results["recommended"] = None
+    for l, lvl in enumerate(level_results):
+        if lvl["peak_T_hot_error"] <= T_tolerance and lvl["peak_T_cold_error"] <= T_tolerance:
+            results["recommended"] = l
+            break
+
+    print_convergence_summary(results)
+
+    return results
+
+
+
+def refine_wall(Wall, factor):
+    """
+    Returns a copy of a WallStack with each of its element sizes refined by factor (i.e. each
+    component goes from n to (n-1)*factor + 1 nodes). Geometric stretch factors are adjusted so the
+    refined mesh has the same node distribution, just with more nodes.
+    """
+
+    node_counts     = [int((n-1)*factor + 1) for n in Wall.node_counts]
+    stretch_factors = [s**(1.0/factor) if m == "geometric" else s for m, s in zip(Wall.mesh_types, Wall.stretch_factors)]
+
+    return WallStack(Wall.materials, Wall.thicknesses, node_counts,
+                        interface_resistances   = Wall.interface_resistances,
+                        mesh_types              = Wall.mesh_types,
+                        stretch_factors         = stretch_factors)
+
+
+
+def richardson_extrapolation(f, r):
+    """
+    Observed order of convergence and Richardson-extrapolated value, from the three finest
+    values of a refinement ladder.
+
+    Inputs:
+        f:      float list, quantity of interest at each level, coarsest first
+        r:      float, refinement ratio between levels
+    Outputs:
+        p:      float, observed order of convergence (nan if it can't be determined)
+        f_ext:  float, extrapolated value
+    """
+
+    f3, f2, f1 = f[-3], f[-2], f[-1]
+
+    # Already converged to machine precision (or not converging at all)
+    if f2 == f1 or f3 == f2:
+        return float("nan"), f1
+
+    # abs() handles oscillatory convergence
+    p = math.log(abs((f3 - f2) / (f2 - f1))) / math.log(r)
+
+    if p <= 0:
+        # Diverging, extrapolation is meaningless
+        return p, f1
+
+    return p, f1 + (f1 - f2) / (r**p - 1)
+
+
+
+def print_convergence_summary(results):
+    """ Prints a table of the convergence study results """
+
+    print("Level  Node Counts          t_step      Peak T_hot  (err)        Peak T_cold (err)        Runtime")
+    for l, lvl in enumerate(results["levels"]):
+        print(f"{l:<6} {str(lvl['node_counts']):<20} {lvl['t_step']:<11.4g} "
+                f"{lvl['peak_T_hot']:<11.5g} ({lvl['peak_T_hot_error']:<8.3g})  "
+                f"{lvl['peak_T_cold']:<11.5g} ({lvl['peak_T_cold_error']:<8.3g})  {lvl['runtime']:.1f} s")
+
+    print(f"Observed Order:  hot wall: {results['observed_order']['peak_T_hot']:.3g}, cold wall: {results['observed_order']['peak_T_cold']:.3g}")
+    print(f"Extrapolated Peak Temps:  hot wall: {results['extrapolated']['peak_T_hot']:.5g} K, cold wall: {results['extrapolated']['peak_T_cold']:.5g} K")
+
+    if results["recommended"] is None:
+        print("~~WARNING~~: No level met the requested tolerance. Consider more levels.")
+    else:
+        print(f"Cheapest level meeting tolerance: {results['recommended']}")
+
+
+
+def _run_level(config):
+    """ Worker function. Builds, runs, and summarizes a single level of the ladder """
+
+    # Import here to avoid a circular import (obj_simulation imports the tools modules)
+    from .obj_simulation import Thermal_Sim_1D
+
+    Sim = Thermal_Sim_1D(**config)
+
+    start = time.time()
+    Sim.run()
+    runtime = time.time() - start
+
+    return {    "node_counts":  Sim.Aerosurface.node_counts,
+                "t_step":       Sim.t_step,
+                "peak_T_hot":   float(Sim.stats["T_max"][0]),
+                "peak_T_cold":  float(Sim.stats["T_max"][-1]),
+                "runtime":      runtime }
+
+
+
+
+
+##########################################################################################
+# ---------------------------------------------------------------------------------------#
+#                               VERIFICATION CASES                                       #
+# ---------------------------------------------------------------------------------------#
+##########################################################################################
+
+
+def semi_infinite_set_temp(x, t, T_i, T_s, alp):
+    """
+    Analytical temperature distribution in a semi-infinite wall, with the surface instantaneously
+    set to T_s at t=0.
+
+    Inputs:
+        x:      float or numpy array, depth into the wall [m]
+        t:      float, time [s]
+        T_i:    float, initial wall temperature [K]
+        T_s:    float, surface temperature [K]
+        alp:    float, thermal diffusivity k/(rho*cp) [m^2/s]
+    """
+    return (T_i - T_s) * special.erf( x / (2*math.sqrt(alp*t)) ) + T_s
+
+
+
+def semi_infinite_set_flux(x, t, T_i, q_0, k, alp):
+    """
+    Analytical temperature distribution in a semi-infinite wall, with a constant heat flux q_0
+    imparted at the surface from t=0.
+
+    Inputs:
+        x:      float or numpy array, depth into the wall [m]
+        t:      float, time [s]
+        T_i:    float, initial wall temperature [K]
+        q_0:    float, surface heat flux [W/m^2]
+        k:      float, thermal conductivity [W/mK]
+        alp:    float, thermal diffusivity k/(rho*cp) [m^2/s]
+    """
+    return 2 * q_0 * math.sqrt(alp*t/math.pi) * np.exp( -x**2/(4*alp*t) ) / k   \
+        - q_0 * x * ( 1-special.erf( x/(2*math.sqrt(alp*t))) ) / k      \
+            + T_i
+
+
+
+def verification_study(case = "set_flux", material = "ALU6061", levels = 4, node_count = 11, refinement_ratio = 2,
+                        t_end = 5.0, fourier_number = 0.4, T_i = 300.0, T_s = 350.0, q_0 = 150000.0,
+                        conduction_solver = "implicit"):
+    """
+    Conduction-only verification against the semi-infinite wall analytical solutions.
+
+    The wall is made 6 diffusion lengths thick so it is effectively semi-infinite over t_end, and the
+    timestep is tied to the element size through a fixed Fourier number. The quantity compared is the
+    surface temperature at t_end for the "set_flux" case, and the temperature one diffusion length
+    deep for the "set_temp" case.
+
+    Since the Fourier number is fixed, the timestep shrinks by refinement_ratio^2 per level (on top of the
+    nodes going up by refinement_ratio), so each level costs ~refinement_ratio^3 times the last. With the
+    default ratio of 2, level 3 already takes 64x the steps of level 0 (~500x the work), so keep levels small.
+
+    Inputs:
+        case:               str, "set_flux" or "set_temp"
+        material:           str, material from materials_solid.py
+        levels:             int, number of refinement levels
+        node_count:         int, node count of the coarsest level
+        refinement_ratio:   int, element size refinement between levels
+        t_end:              float, time to compare at [s]
+        fourier_number:     float, k*dt/(rho*cp*dy^2), sets the timestep at each level
+        T_i, T_s, q_0:      floats, initial temp [K], set surface temp [K], set heat flux [W/m^2]
+        conduction_solver:  str, see Thermal_Sim_1D
+
+    Outputs:
+        results: dict containing the exact value, the simulated value and error at each level, and
+                 the observed order of accuracy between each pair of levels
+    """
+
+    k   = MATERIALS_DICT[material]["k"]
+    alp = k / (MATERIALS_DICT[material]["rho"] * MATERIALS_DICT[material]["cp"])
+
+    diff_length = math.sqrt(alp*t_end)
+    thickness = 6*diff_length
+
+    if case == "set_flux":
+        x_compare = 0.0
+        exact = semi_infinite_set_flux(x_compare, t_end, T_i, q_0, k, alp)
+    elif case == "set_temp":
+        x_compare = diff_length
+        exact = semi_infinite_set_temp(x_compare, t_end, T_i, T_s, alp)
+    else:
+        raise ValueError("Unsupported verification case. Use 'set_flux' or 'set_temp'")
+
+    results = {"case": case, "exact": exact, "levels": []}
+
+    for l in range(levels):
+
+        Wall = WallStack(materials=material, thicknesses=thickness, node_counts=(node_count-1)*refinement_ratio**l + 1)
+
+        # Timestep from the Fourier number, adjusted to land exactly on t_end
+        n_steps = int(math.ceil(t_end / (fourier_number * Wall.dy[0]**2 / alp)))
+        t_step = t_end / n_steps
+
+        if case == "set_flux":
+            wall_temps = march_prescribed_flux(Wall, np.full(n_steps+1, q_0), t_step, T_i, conduction_solver=conduction_solver)
+        else:
+            wall_temps = march_prescribed_flux(Wall, np.zeros(n_steps+1), t_step, T_i, conduction_solver=conduction_solver, set_surface_temp=T_s)
+
+        value = np.interp(x_compare, Wall.get_wall_coords(), wall_temps[:,-1])
+        results["levels"].append({"node_count": Wall.n_tot, "t_step": t_step, "value": value, "error": abs(value - exact)})
+
+    # Observed order of accuracy between successive levels, since we know the exact answer (NaN if either error
+    # is exactly zero, i.e. already down at round-off)
+    errors = [lvl["error"] for lvl in results["levels"]]
+    results["observed_order"] = [math.log(errors[l]/errors[l+1]) / math.log(refinement_ratio) if errors[l] > 0.0 and errors[l+1] > 0.0 else float("nan")
+                                    for l in range(levels-1)]
+
+    print(f"Verification case '{case}', exact value: {exact:.5g} K")
+    for lvl in results["levels"]:
+        print(f"    nodes = {lvl['node_count']:<6} t_step = {lvl['t_step']:<10.4g} value = {lvl['value']:<10.5g} error = {lvl['error']:.3g}")
+    print(f"    observed orders: {np.round(results['observed_order'], 2)}")
+
+    return results
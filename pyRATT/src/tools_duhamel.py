@@ -0,0 +1,259 @@
+"""
+Contains the Duhamel/response-function engine for walls with constant material properties.
+
+The conduction solvers are linear in the applied heat flux, so for a given wall, mesh, timestep and
+set of boundary conditions, the wall temperatures are just a convolution of the net heat flux history
+with the wall's impulse response:
+
+    T[:,n] = T_initial + sum_k( g[:, n-1-k] * q_net[k] )
+
+where g[:,m] is the temperature rise at every node, m steps after a single step of unit heat flux.
+This impulse response gets computed once (by running the actual conduction solver with a unit heat
+flux, so it is exactly the same discretization as a normal run) and cached, after which the temperature
+history for ANY heat flux history is a single FFT convolution.
+
+For aerothermal runs, the heat flux depends on the wall temperature through the convection, h*(T_r - T_w),
+and the radiation. Since T[:,n+1] only depends on the heat fluxes up to step n, the convolution (a Volterra sum)
+gets marched step by step along with the heat flux (see march_surface_temps()), the same as run() would: the heat
+flux at each step is evaluated at the wall temperature at the start of the step ("explicit" surface coupling), or
+linearized about it and treated implicitly ("semi_implicit", the g[0,0]*q(T_w) term of the current step moves to the
+left hand side, with Sim.newton_iterations re-linearizations). The sum over the older steps is done a block of steps
+at a time with FFTs, so it stays cheap for long trajectories.
+
+(Iterating whole-history guesses instead, T_w history -> heat flux history -> convolve -> new T_w history, is a lot
+simpler, but it diverges on stiff walls, i.e. thin, low conductivity skins.)
+
+Notes:
+    - The wall has to start at a uniform temperature (uniform temps are the "zero" the responses are relative to)
+    - Only the conduction solvers with fixed, linear steps can be used ("explicit", "rk2", "rk4", "implicit").
+    The adaptive ones ("rk23", "rkc") fall back to "implicit".
+    - In run_duhamel(), the aero state (h, T_recovery, T_inf) is evaluated by a (vectorized) aero pass over the 
+    trajectory at the current wall temperature guess, see tools_aerotherm.aerothermal_heatflux_history(). The first pass is at the initial (cold) wall temperature,
+    then it gets refreshed at the marched wall temperatures (which picks up the T_w dependence of h through the Eckert
+    reference temperature), until the wall temperatures stop changing between passes, up to max_aero_passes.
+"""
+
+import time
+from collections import OrderedDict
+
+import numpy as np
+from scipy.signal import fftconvolve
+
+from . import constants
+from .tools_aerotherm import aerothermal_heatflux_history
+from .tools_conduction import march_prescribed_flux
+
+
+# Steps per block of the marched Volterra sum (older blocks get summed with one FFT per block, see march_surface_temps())
+DUHAMEL_BLOCK_SIZE = 2048
+
+# Linear, fixed-step conduction solvers that the response functions can be built from
+LINEAR_SOLVERS = ["explicit", "rk2", "rk4", "implicit"]
+
+# Cached unit-step responses, keyed by wall/mesh/timestep/boundary conditions/solver. Each one is a (nodes x steps)
+# array, so only the RESPONSE_CACHE_SIZE most recently used are kept (sweeps over walls/meshes would pile them up otherwise)
+RESPONSE_CACHE_SIZE = 4
+_RESPONSE_CACHE = OrderedDict()
+
+
+
+def unit_step_response(Wall, t_step, n_steps, wall_thermal_bcs = ["q_in_aerothermal","adiabatic"], conduction_solver = "implicit"):
+    """
+    Temperature rise of every node, in response to a unit heat flux [1 W/m^2] applied from t=0,
+    at each of n_steps timesteps. Cached, and only recomputed if a longer response is needed.
+
+    Outputs:
+        S:  numpy float 2D array, S[k,n] [K per W/m^2]
+    """
+
+    if conduction_solver not in LINEAR_SOLVERS:
+        conduction_solver = "implicit"
+
+    key = (Wall.signature(), t_step, tuple(wall_thermal_bcs), conduction_solver)
+
+    if key not in _RESPONSE_CACHE or _RESPONSE_CACHE[key].shape[1] < n_steps:
+        _RESPONSE_CACHE[key] = march_prescribed_flux(Wall, np.ones(n_steps), t_step, 0.0, wall_thermal_bcs, conduction_solver)
+        while len(_RESPONSE_CACHE) > RESPONSE_CACHE_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+
+    _RESPONSE_CACHE.move_to_end(key)
+
+    return _RESPONSE_CACHE[key][:, :n_steps]
+
+
+
+def impulse_response(Wall, t_step, n_steps, wall_thermal_bcs = ["q_in_aerothermal","adiabatic"], conduction_solver = "implicit"):
+    """
+    Temperature rise of every node m steps after a single step of unit heat flux, g[k,m] [K per W/m^2].
+    This is just the difference of successive unit-step responses.
+    """
+
+    S = unit_step_response(Wall, t_step, n_steps + 1, wall_thermal_bcs, conduction_solver)
+
+    return np.diff(S, axis=1)
+
+
+
+def temperature_history(Wall, q_net, t_step, initial_temp, wall_thermal_bcs = ["q_in_aerothermal","adiabatic"], conduction_solver = "implicit"):
+    """
+    Wall temperature history for a prescribed net heat flux history, via FFT convolution with the
+    (cached) impulse response. Gives the same answer as march_prescribed_flux(), just much faster
+    once the response is cached.
+
+    Inputs:
+        Wall:               WallStack object
+        q_net:              numpy float array, net heat flux into the wall at each timestep [W/m^2]
+        t_step:             float, timestep [s]
+        initial_temp:       float, initial (uniform) wall temperature [K]
+        wall_thermal_bcs:   see Thermal_Sim_1D
+        conduction_solver:  see Thermal_Sim_1D (must be one of LINEAR_SOLVERS)
+    Outputs:
+        wall_temps:         numpy float 2D array, wall_temps[k,i]
+    """
+
+    n_steps = np.size(q_net)
+    g = impulse_response(Wall, t_step, n_steps, wall_thermal_bcs, conduction_solver)
+
+    wall_temps = np.empty((Wall.n_tot, n_steps), dtype=float)
+    wall_temps[:,0]  = initial_temp
+    wall_temps[:,1:] = initial_temp + fftconvolve(g, np.asarray(q_net, dtype=float)[np.newaxis,:], axes=1)[:, :n_steps-1]
+
+    return wall_temps
+
+
+
+def march_surface_temps(Sim, g_0):
+    """
+    Marches the hot-wall temperature history through the Volterra sum T_w[n+1] = T_initial + sum_k( g_0[n-k] * q[k] ),
+    with the heat flux q[n] evaluated from the (frozen) aero state at step n and the wall temperature T_w[n] (see
+    module docstring for the surface coupling). Raises as soon as the temperatures go non-finite.
+
+    Inputs:
+        Sim:    Simulation Object, with the aero state (Sim.h_coeff, Sim.T_recovery, Sim.T_inf) filled in
+        g_0:    numpy float array, hot-wall impulse response g[0,:]
+    Outputs:
+        T_w:    numpy float array, hot-wall temperature at each timestep [K]
+        q_net:  numpy float array, net heat flux applied over each step [W/m^2]
+    """
+
+    n_t = Sim.t_vec_size
+    T_0 = Sim.initial_temp
+    emis_sb = constants.SB_CONST * Sim.Aerosurface.elements[0].emis
+    semi_implicit = Sim.surface_coupling == "semi_implicit"
+    newton_iterations = getattr(Sim, "newton_iterations", 0)
+
+    # Plain float lists, numpy scalar indexing is slow for this per-step arithmetic
+    h, T_r, T_inf = Sim.h_coeff.tolist(), Sim.T_recovery.tolist(), Sim.T_inf.tolist()
+    g_00 = float(g_0[0])
+
+    T_w = np.empty(n_t, dtype=float)
+    T_w[0] = T_0
+    q = np.zeros(n_t, dtype=float)
+
+    for s in range(0, n_t-1, DUHAMEL_BLOCK_SIZE):
+        e = min(s + DUHAMEL_BLOCK_SIZE, n_t - 1)
+
+        # Contribution of all the steps before this block, at T_w[s+1:e+1]
+        history = fftconvolve(q[:s], g_0[:e])[s:e] if s > 0 else np.zeros(e - s)
+
+        # Newest-first impulse response, for the steps within this block
+        g_rev = g_0[e-s:0:-1]
+
+        T_n = float(T_w[s])
+        for n in range(s, e):
+
+            base = T_0 + history[n-s] + (g_rev[e-n:] @ q[s:n] if n > s else 0.0)
+
+            q_n = h[n]*(T_r[n] - T_n) + emis_sb*(T_inf[n]**4 - T_n**4)
+
+            if semi_implicit:
+                # Linearized about T_star, q ~= a + b*T, with the current step's g_0[0]*q taken implicitly
+                T_star = T_n
+                for _ in range(newton_iterations + 1):
+                    b = -h[n] - 4.0*emis_sb*T_star**3
+                    a = h[n]*(T_r[n] - T_star) + emis_sb*(T_inf[n]**4 - T_star**4) - b*T_star
+                    T_star = (base + g_00*a) / (1.0 - g_00*b)
+                q_n = a + b*T_star
+
+            q[n] = q_n
+            T_n = base + g_00*q_n
+            T_w[n+1] = T_n
+
+        if not np.all(np.isfinite(T_w[s+1:e+1])):
+            k = s + 1 + np.argmin(np.isfinite(T_w[s+1:e+1]))
+            raise RuntimeError(f"Duhamel wall temperatures went non-finite at t = {Sim.t_vec[k]:.3f} s, the surface heat flux coupling "
+                                'is unstable at this timestep. Try surface_coupling = "semi_implicit", or a smaller t_step')
+
+    # The last step's heat flux never gets used, but fill it in like the other run methods
+    q[-1] = h[-1]*(T_r[-1] - T_w[-1]) + emis_sb*(T_inf[-1]**4 - T_w[-1]**4)
+
+    return T_w, q
+
+
+
+def run_duhamel(Sim, T_tol = 0.01, max_aero_passes = 10):
+    """
+    Runs an aerothermal simulation using the response-function engine instead of the time-marching
+    loop in Thermal_Sim_1D.run(). Fills in the same result arrays.
+
+    Inputs:
+        Sim:            Simulation Object (initialized, not yet run)
+        T_tol:          float, aero passes stop once a pass changes the hot-wall temperature history by less than this [K]
+        max_aero_passes: int, max number of times the aero state gets evaluated across the trajectory (see module notes)
+
+    Updates:
+        Sim.wall_temps, Sim.q_conv, Sim.q_rad, Sim.q_net, and everything the aero models write out
+        Sim.duhamel_residuals, list of the max hot-wall temperature change over each aero pass
+    """
+
+    if getattr(Sim, "ablation_model", None) is not None:
+        raise ValueError("Ablation moves the wall mesh, so it can't be run with response functions. Use run() or run_waveform()")
+    if getattr(Sim, "bc_histories", None) is not None:
+        raise ValueError("Prescribed (tabulated) boundary conditions aren't supported by run_duhamel(). Use run()")
+
+    if Sim.conduction_solver not in LINEAR_SOLVERS:
+        print(f"Note: '{Sim.conduction_solver}' solver is not linear, building response functions with 'implicit' instead.")
+
+    print("Running Simulation (Duhamel)...")
+    start = time.time()
+
+    # Build/retrieve the impulse response for this wall and timestep
+    g = impulse_response(Sim.Aerosurface, Sim.t_step, Sim.t_vec_size, Sim.wall_thermal_bcs, Sim.conduction_solver)
+    print(f"    Response functions ready: {time.time()-start:.2f} s")
+
+    T_w = np.full(Sim.t_vec_size, Sim.initial_temp, dtype=float)
+    Sim.duhamel_residuals = []
+
+    for p in range(max_aero_passes):
+
+        # Aero pass over the whole trajectory, at the current wall temperature guess, then march the wall through it
+        aerothermal_heatflux_history(Sim, T_w)
+        T_w_new, q_net = march_surface_temps(Sim, g[0,:])
+
+        # Converged once re-doing the aero at the new wall temperatures doesn't change them anymore
+        pass_change = np.max(np.abs(T_w_new - T_w))
+        Sim.duhamel_residuals.append(pass_change)
+        T_w = T_w_new
+
+        print(f"    Aero pass {p+1}: max change in T_w = {pass_change:.3g} K, {time.time()-start:.2f} s elapsed")
+
+        if pass_change < T_tol:
+            break
+
+        # The aero passes should settle quickly (the T_w dependence of h is weak), so growing changes mean something's wrong
+        if p >= 2 and pass_change > Sim.duhamel_residuals[-2]:
+            raise RuntimeError(f"Duhamel aero passes are diverging (max change in T_w {Sim.duhamel_residuals[-2]:.3g} K, then {pass_change:.3g} K). "
+                                "Use run() or run_waveform()")
+    else:
+        print(f"~~WARNING~~: Duhamel aero passes did not converge in {max_aero_passes} passes (max change in T_w over the last pass {pass_change:.3g} K)")
+
+
+    # Final heat fluxes (the ones actually applied over each step) and full through-wall temperatures
+    Sim.q_net[:]  = q_net
+    Sim.q_conv[:] = Sim.h_coeff*(Sim.T_recovery - T_w)
+    Sim.q_rad[:]  = Sim.q_net - Sim.q_conv
+
+    Sim.wall_temps[:,0]  = Sim.initial_temp
+    Sim.wall_temps[:,1:] = Sim.initial_temp + fftconvolve(g, Sim.q_net[np.newaxis,:], axes=1)[:, :Sim.t_vec_size-1]
+
+    print(f"    Done: {time.time()-start:.2f} s")
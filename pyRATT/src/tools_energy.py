@@ -0,0 +1,185 @@
+"""
+Contains the energy conservation check (the "energy ledger"): the heat that went into the wall through its faces
+(the time-integrated boundary heat fluxes) should match the change in the wall's stored energy (sum of rho*cp*dy*T
+over the nodes). Any mismatch is reported as a drift, in Sim.energy:
+
+    E_0:        float, stored wall energy at the start [J/m^2]
+    E_wall:     float, stored wall energy at the last check [J/m^2]
+    Q_in:       float, net heat into the wall through its faces so far [J/m^2]
+    Q_abs:      float, total heat that went through the faces (either direction) so far [J/m^2]
+    drift:      float, (E_wall - E_0 - Q_in) as a fraction of Q_abs (or of the energy to heat the whole wall
+                by 1 K, whichever is bigger), at the last check
+    drift_max:  float, biggest |drift| seen at any check
+    t:          float, time of the last check [s]
+    n_steps:    int, number of steps taken
+
+The fluxes only get summed up each step (a few float operations), the wall energy is only checked every
+ENERGY_CHECK_INTERVAL steps, and at the end of the run, so it costs next to nothing.
+
+The forward Euler ("explicit") solver conserves energy to round-off, so with it the drift should be ~1e-12.
+What the ledger CAN catch is heat that the solver/coupling creates or loses, i.e. a solver going unstable, or
+one that doesn't put exactly Sim.q_net[i] into the wall over the step (the Runge-Kutta solvers re-evaluate the
+heat flux at each stage, so they show a small drift for a good timestep, and a growing one as it gets too big).
+What it CAN'T catch is error that just puts the heat in the wrong place: a too-coarse mesh or too-big timestep
+in a conservative scheme, or the "modal" solver dropping the fast wall modes (the uniform mode is always kept, so
+it conserves energy to round-off even with its temperatures a few K off). Those need a convergence check against
+a finer/full solution instead (see tools_convergence.py).
+
+With Thermal_Sim_1D(energy_tol = ...), a run fails fast (raises) when |drift| goes over energy_tol, or the wall
+temperatures go unphysical (NaN/inf, or below 0 K) from a solver going unstable, instead of finishing with garbage.
+
+Notes:
+    - Not tracked for ablating walls (energy leaves with the receding surface) or prescribed-temperature faces
+    (their heat flux isn't known), Sim.energy is None then
+    - run_waveform()/run_duhamel() get checked from the result arrays at the end of the run (history_energy())
+"""
+
+import numpy as np
+
+from .obj_boundaryconditions import PrescribedBC
+from .tools_conduction import boundary_heat_fluxes
+
+
+# Steps between checks of the stored wall energy (and the fail-fast checks)
+ENERGY_CHECK_INTERVAL = 100
+
+# Floor for the drift normalization, as a temperature rise of the whole wall [K]
+ENERGY_SCALE_TEMP = 1.0
+
+
+
+def initialize_energy(Sim):
+    """
+    Starts the energy ledger, from the wall at Sim.wall_temps[:,0], at Sim.t_vec[0].
+
+    Updates:
+        Sim.energy:         dict, see module docstring (None if not tracked)
+        Sim.energy_faces:   float tuple, which faces see the aero heat flux (see boundary_heat_fluxes())
+    """
+
+    Sim.energy = None
+
+    if Sim.ablation_model is not None or any(isinstance(bc, PrescribedBC) and bc.kind == "T" for bc in Sim.wall_thermal_bcs):
+        if Sim.energy_tol is not None:
+            print("Note: the energy conservation check isn't done for ablating walls or prescribed-temperature faces")
+        return
+
+    Sim.energy_faces = tuple(float(w) for w in boundary_heat_fluxes(Sim, 1.0))
+
+    E_0 = float(Sim.Aerosurface.capacitance @ Sim.wall_temps[:,0])
+    Sim.energy = {"E_0": E_0, "E_wall": E_0, "Q_in": 0.0, "Q_abs": 0.0, "drift": 0.0, "drift_max": 0.0,
+                    "t": Sim.t_vec[0], "n_steps": 0}
+
+
+
+def update_energy(Sim, i, j):
+    """
+    Adds the heat that went in through the wall faces over the step from timestep i to timestep j to the ledger,
+    and checks it every ENERGY_CHECK_INTERVAL steps. With Sim.energy_tol set, the wall temperatures also get (cheaply)
+    checked every step, since an unstable solver can go from fine to garbage in well under ENERGY_CHECK_INTERVAL steps.
+
+    Updates:
+        Sim.energy
+    """
+
+    ledger = Sim.energy
+    if ledger is None:
+        return
+
+    # Plain floats, numpy scalars are slow for this little arithmetic
+    dt = float(Sim.t_vec[j] - Sim.t_vec[i])
+    q  = float(Sim.q_net[i])
+    q_hot, q_cold = Sim.energy_faces[0]*q, Sim.energy_faces[1]*q
+
+    if Sim.bc_histories is not None:
+        q_hot_bc, q_cold_bc = boundary_heat_fluxes(Sim, 0.0, i)
+        q_hot, q_cold = q_hot + q_hot_bc, q_cold + q_cold_bc
+
+    ledger["Q_in"]  += (q_hot + q_cold)*dt
+    ledger["Q_abs"] += (abs(q_hot) + abs(q_cold))*dt
+    ledger["n_steps"] += 1
+
+    # Any node NaN, inf or below 0 K (NaNs fail the comparisons too, and any NaN/inf makes the sum one)
+    if Sim.energy_tol is not None:
+        T = Sim.wall_temps[:,j]
+        unphysical = not (0.0 < T.min() and T.sum() < np.inf)
+    else:
+        unphysical = False
+
+    if unphysical or ledger["n_steps"] % ENERGY_CHECK_INTERVAL == 0:
+        check_energy(Sim, j)
+
+
+
+def check_energy(Sim, j):
+    """
+    Compares the stored wall energy at timestep j to the ledger, and fails fast (if Sim.energy_tol is set)
+    on too much drift, or unphysical wall temperatures.
+
+    Updates:
+        Sim.energy["E_wall"], ["drift"], ["drift_max"], ["t"]
+    """
+
+    ledger = Sim.energy
+    if ledger is None:
+        return
+
+    T = Sim.wall_temps[:,j]
+    C = Sim.Aerosurface.capacitance
+
+    ledger["E_wall"] = float(C @ T)
+    ledger["drift"] = (ledger["E_wall"] - ledger["E_0"] - ledger["Q_in"]) / max(ledger["Q_abs"], np.sum(C)*ENERGY_SCALE_TEMP)
+    ledger["t"] = Sim.t_vec[j]
+
+    if np.isfinite(ledger["drift"]):
+        ledger["drift_max"] = max(ledger["drift_max"], abs(ledger["drift"]))
+
+    if Sim.energy_tol is None:
+        return
+
+    if not np.all(np.isfinite(T)) or np.min(T) < 0.0:
+        raise RuntimeError(f"Wall temperatures went unphysical (min {np.min(T):.4g} K, max {np.max(T):.4g} K) at t = {Sim.t_vec[j]:.3f} s, "
+                            "the conduction solver has gone unstable. Try a smaller t_step, or see tools_autoconfig.auto_configure()")
+
+    if abs(ledger["drift"]) > Sim.energy_tol:
+        raise RuntimeError(f"Energy conservation drift of {ledger['drift']:.3g} at t = {Sim.t_vec[j]:.3f} s is over energy_tol = {Sim.energy_tol:g} "
+                            f"(wall energy change {ledger['E_wall'] - ledger['E_0']:.5g} J/m^2, heat in {ledger['Q_in']:.5g} J/m^2)")
+
+
+
+def history_energy(Sim):
+    """
+    Whole-array version of initialize_energy() + update_energy() for every step, from the full result arrays,
+    for the run methods that solve the whole trajectory at once (run_waveform(), run_duhamel()). The drift gets
+    checked at every step.
+
+    Updates:
+        Sim.energy
+    """
+
+    initialize_energy(Sim)
+    ledger = Sim.energy
+
+    if ledger is None or Sim.t_vec_size < 2:
+        return
+
+    dt = np.diff(Sim.t_vec)
+    q_hot, q_cold = Sim.energy_faces[0] * Sim.q_net[:-1], Sim.energy_faces[1] * Sim.q_net[:-1]
+
+    if Sim.bc_histories is not None:
+        for face, q in [(0, q_hot), (1, q_cold)]:
+            if Sim.bc_histories[face] is not None:
+                q += Sim.bc_histories[face][:-1]
+
+    Q_in  = np.concatenate(([0.0], np.cumsum((q_hot + q_cold)*dt)))
+    Q_abs = np.concatenate(([0.0], np.cumsum((np.abs(q_hot) + np.abs(q_cold))*dt)))
+
+    C = Sim.Aerosurface.capacitance
+    E = C @ Sim.wall_temps
+    drift = (E - ledger["E_0"] - Q_in) / np.maximum(Q_abs, np.sum(C)*ENERGY_SCALE_TEMP)
+
+    ledger.update(Q_in = Q_in[-1], Q_abs = Q_abs[-1], n_steps = Sim.t_vec_size - 1,
+                    drift_max = float(np.max(np.abs(drift))) if np.all(np.isfinite(drift)) else np.inf)
+
+    # Fail-fast checks (and the final values) at the end
+    check_energy(Sim, -1)
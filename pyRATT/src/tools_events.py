@@ -0,0 +1,94 @@
+"""
+Contains the run loop side of the simulation events (see obj_events.py): checking them after each step,
+logging when they happen, and stopping the run early on terminal events.
+
+When a run stops early, all of the result arrays get cut down to the timesteps that were actually simulated,
+so the Sim looks just like a (shorter) complete run, i.e. for plotting or export_data_to_csv().
+
+Notes:
+    - Events are checked after every step of run(), and after every big step through the quiet phases
+    (see tools_phases.py), with the event time interpolated across it
+    - Only for run(). run_waveform()/run_duhamel() solve the whole trajectory at once
+"""
+
+from .obj_events import SimEvent
+
+
+# Per-step result arrays that get cut down when a run stops early (the last axis is time)
+RESULT_VARIABLES = ["t_vec", "mach", "alt", "q_conv", "q_rad", "q_net", "h_coeff", "p_inf", "T_inf", "rho_inf", "mu_inf",
+                    "u_inf", "qbar_inf", "Re_inf", "T_e", "T_te", "T_t", "T_recovery", "wall_temps", "bl_state",
+                    "recession", "recession_rate", "quiet", "quiet_end"]
+
+
+
+def initialize_events(Sim, events):
+    """
+    Resets the events for a new run.
+
+    Updates:
+        Sim.events:     SimEvent list being checked
+        Sim.event_log:  list of dicts, {"name", "t", "i"}, of every event that happened, in order
+        Sim.t_stop:     float, time a terminal event stopped the run at (None if it ran to the end)
+    """
+
+    Sim.events    = list(events) if events else []
+    Sim.event_log = []
+    Sim.t_stop    = None
+
+    for event in Sim.events:
+        if not isinstance(event, SimEvent):
+            raise TypeError(f"Events have to be obj_events.SimEvent objects, not {type(event)}")
+        event.reset()
+
+
+
+def check_events(Sim, i, j):
+    """
+    Checks the events at timestep j, after the wall was marched there from timestep i. 
+
+    Outputs:
+        stop:   bool, True if a terminal event happened
+    Updates:
+        Sim.event_log, Sim.t_stop, and the SimEvents' times
+    """
+
+    stop = False
+
+    for event in Sim.events:
+
+        if event.t_min is not None and Sim.t_vec[j] < event.t_min:
+            continue
+
+        v = event.value(Sim, j)
+
+        if event.crossed(v):
+            # Linear interpolation of the crossing time
+            t_i, t_j = Sim.t_vec[i], Sim.t_vec[j]
+            t = t_i + (t_j - t_i) * event.last / (event.last - v) if event.last != v else t_j
+
+            event.times.append(t)
+            Sim.event_log.append({"name": event.name, "t": t, "i": j})
+            print(f"Event: {event.name} at t = {t:.3f} s")
+
+            if event.terminal:
+                Sim.t_stop = t if Sim.t_stop is None else min(Sim.t_stop, t)
+                stop = True
+
+        event.last = v
+
+    return stop
+
+
+
+def truncate_results(Sim, n):
+    """ Cuts the result arrays down to the first n timesteps, after a run was stopped early """
+
+    for name in RESULT_VARIABLES:
+        values = getattr(Sim, name, None)
+        if values is not None:
+            setattr(Sim, name, values[..., :n].copy() if hasattr(values, "ndim") else values[:n])
+
+    if getattr(Sim, "bc_histories", None) is not None:
+        Sim.bc_histories = [h[:n] if h is not None else None for h in Sim.bc_histories]
+
+    Sim.t_vec_size = n
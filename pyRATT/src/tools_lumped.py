@@ -0,0 +1,219 @@
+"""
+Contains the lumped-capacitance solver, for fast screening of lots of configurations before paying for
+the full 1D conduction solve.
+
+If the wall conducts heat through its thickness much faster than the flow can put heat into it (small Biot
+number, Bi = h*L/k), the temperature through the wall is basically uniform, and the whole wall can be treated 
+as a single lump with a bulk temperature T:
+    C_total * dT/dt = q_net(T)
+where C_total is the total thermal capacitance of the wall [J/m^2K], and q_net is the aerothermal heat flux
+(convection + radiation) evaluated at T, on one face or both (fins).
+
+The aero is evaluated over the whole trajectory at once (vectorized, same as tools_waveform.py), and repeated
+at the new bulk temperature history until it stops changing. The lump itself gets marched with a linearized
+implicit step, so it's stable for any timestep.
+
+If the Biot number is too big for lumping to be valid anywhere along the trajectory, this falls back to 
+running the full 1D simulation instead.
+
+Notes:
+    - The Biot number uses the whole through-wall thermal resistance (all the components, and interface
+    resistances), and half of it if both faces are heated
+    - The check is done with the cold-wall heat transfer coefficient (first aero pass), which is the worst case
+    - Bi < 0.1 is the usual textbook limit, giving errors of a few % between the surface and bulk temperatures
+"""
+
+import time
+
+import numpy as np
+
+from . import constants
+from .tools_aerotherm import aerothermal_heatflux_history
+from .tools_conduction import boundary_heat_fluxes
+from .tools_energy import history_energy
+from .tools_events import RESULT_VARIABLES
+from .tools_run_cache import RUN_CACHE_EXTRAS
+from .tools_stats import history_stats, discard_history
+
+
+# Largest Biot number for which the lumped-capacitance approximation is considered valid
+BIOT_LIMIT = 0.1
+
+
+
+def wall_thermal_resistance(Wall):
+    """ Total thermal resistance through the wall [m^2K/W], from the hot face to the cold face (including any interface resistances) """
+
+    return np.sum(1.0/Wall.conductance) + 0.5*Wall.dy[0]/Wall.k[0] + 0.5*Wall.dy[-1]/Wall.k[-1]
+
+
+
+def biot_number(Sim, h):
+    """
+    Biot number of the wall, for a given heat transfer coefficient h [W/m^2K] (float or array).
+    Uses half the through-wall resistance if both faces are heated (symmetric heating).
+    """
+
+    w_hot, w_cold = boundary_heat_fluxes(Sim, 1.0)
+
+    return h * wall_thermal_resistance(Sim.Aerosurface) / (w_hot + w_cold)
+
+
+
+def march_lumped(Sim):
+    """
+    Marches the bulk wall temperature over the whole trajectory, with the aero state (Sim.h_coeff, 
+    Sim.T_recovery, Sim.T_inf) held at whatever is currently in the Sim.
+
+    Each step linearizes the net heat flux about the current temperature, q(T) ~= q(T_n) + dq/dT*(T - T_n),
+    and takes a backward Euler step with it, so big steps at peak heating don't go unstable.
+
+    Outputs:
+        T_bulk: numpy float array, bulk wall temperature at each timestep [K]
+    """
+
+    #Aliases
+    Wall    = Sim.Aerosurface
+    C       = np.sum(Wall.capacitance)
+    dt      = Sim.t_step
+    sigma_e = constants.SB_CONST * Wall.elements[0].emis
+
+    # Number of heated faces
+    w_hot, w_cold = boundary_heat_fluxes(Sim, 1.0)
+    n_faces = w_hot + w_cold
+
+    # Plain floats are a lot faster than numpy scalars in a loop
+    h, T_r, T_inf = Sim.h_coeff.tolist(), Sim.T_recovery.tolist(), Sim.T_inf.tolist()
+
+    T_bulk = np.empty(Sim.t_vec_size, dtype=float)
+    T = T_bulk[0] = Sim.initial_temp
+
+    for i in range(Sim.t_vec_size - 1):
+
+        q    = n_faces * (h[i]*(T_r[i] - T) + sigma_e*(T_inf[i]**4 - T**4))
+        dqdT = n_faces * (-h[i] - 4.0*sigma_e*T**3)
+
+        T = T + dt*q/(C - dt*dqdT)
+        T_bulk[i+1] = T
+
+    return T_bulk
+
+
+
+def run_lumped(Sim, T_tol = 0.05, max_iter = 20, Bi_limit = BIOT_LIMIT, fallback = "run_waveform"):
+    """
+    Runs a lumped-capacitance simulation (see module docstring), or the full 1D simulation if lumping isn't valid.
+
+    Inputs:
+        Sim:        Simulation Object (initialized, not yet run)
+        T_tol:      float, aero iterations stop once the bulk temperature history changes by less than this [K]
+        max_iter:   int, max number of aero iterations
+        Bi_limit:   float, largest Biot number for which the wall gets lumped
+        fallback:   string, which Thermal_Sim_1D run method to fall back to ("run_waveform", "run", ...)
+
+    Updates:
+        Sim.Bi: numpy float array, Biot number at each timestep (cold wall)
+        Sim.lumped_valid: bool, if the lumped solution was used
+        Sim.T_bulk: numpy float array, bulk (capacitance-weighted average) wall temperature at each timestep [K]
+        Sim.wall_temps, Sim.q_conv, Sim.q_rad, Sim.q_net, and everything the aero models write out. 
+            For a lumped solution, every node has the bulk temperature.
+        Sim.fallback_sim: the full 1D Thermal_Sim_1D, if it had to fall back to one (None otherwise)
+        Sim.stats, Sim.energy: summary statistics and energy ledger (see tools_stats.py, tools_energy.py), with the
+            result arrays dropped afterwards if Sim.store_history is False
+        Sim.runtime, Sim.run_method
+    """
+
+    start = time.time()
+    Sim.fallback_sim = None
+
+    # Things the lump can't do
+    if getattr(Sim, "ablation_model", None) is not None or getattr(Sim, "bc_histories", None) is not None:
+        print("~~WARNING~~: Lumped capacitance doesn't support ablation or prescribed B.C.s. Falling back to the full 1D simulation")
+        Sim.Bi, Sim.lumped_valid = None, False
+        run_fallback(Sim, "run" if getattr(Sim, "bc_histories", None) is not None else fallback)
+        finish_lumped(Sim, start)
+        return
+
+    # Cold-wall aero pass, which is both the Biot check and the first iteration
+    T_bulk = np.full(Sim.t_vec_size, Sim.initial_temp, dtype=float)
+    aerothermal_heatflux_history(Sim, T_bulk)
+
+    Sim.Bi = biot_number(Sim, Sim.h_coeff)
+    k_max = np.argmax(Sim.Bi)
+    Sim.lumped_valid = bool(Sim.Bi[k_max] <= Bi_limit)
+
+    if not Sim.lumped_valid:
+        print(f"~~WARNING~~: Lumped capacitance not valid (Bi = {Sim.Bi[k_max]:.3g} at t = {Sim.t_vec[k_max]:.2f} s, limit {Bi_limit:.3g}). "
+                "Falling back to the full 1D simulation")
+        run_fallback(Sim, fallback)
+        finish_lumped(Sim, start)
+        return
+
+    for n in range(max_iter):
+
+        T_new = march_lumped(Sim)
+        residual = np.max(np.abs(T_new - T_bulk))
+        T_bulk = T_new
+
+        if residual < T_tol:
+            break
+
+        aerothermal_heatflux_history(Sim, T_bulk)
+    else:
+        print(f"~~WARNING~~: Lumped capacitance aero iterations did not converge in {max_iter} iterations (residual {residual:.3g} K)")
+
+    # Results, consistent with the final bulk temperatures
+    Sim.T_bulk = T_bulk
+    Sim.wall_temps[:,:] = T_bulk[np.newaxis,:]
+
+    Sim.q_conv[:] = Sim.h_coeff*(Sim.T_recovery - T_bulk)
+    Sim.q_rad[:]  = constants.SB_CONST*Sim.Aerosurface.elements[0].emis*(Sim.T_inf**4 - T_bulk**4)
+    Sim.q_net[:]  = Sim.q_conv + Sim.q_rad
+
+    print(f"Lumped capacitance: Bi_max = {Sim.Bi[k_max]:.3g}, {n+1} aero iterations, {1e3*(time.time()-start):.1f} ms")
+
+    finish_lumped(Sim, start)
+
+
+
+def finish_lumped(Sim, start):
+    """ End-of-run bookkeeping, same as Thermal_Sim_1D's run methods: stats, energy ledger, dropping the history """
+
+    # (A fallback already has the full simulation's own)
+    if Sim.fallback_sim is None:
+        history_stats(Sim)
+        history_energy(Sim)
+    if not Sim.store_history:
+        discard_history(Sim)
+        if Sim.fallback_sim is not None:
+            discard_history(Sim.fallback_sim)
+
+    Sim.runtime, Sim.run_method = time.time() - start, "run_lumped"
+
+
+
+def run_fallback(Sim, fallback = "run_waveform"):
+    """ Runs the full 1D simulation with the same settings as Sim, and copies its results back into Sim """
+
+    # Avoid circular import, since obj_simulation imports the tools modules
+    from .obj_simulation import Thermal_Sim_1D
+
+    FullSim = Thermal_Sim_1D(**{**Sim.get_config(), "store_history": True})
+    getattr(FullSim, fallback)()
+
+    # Copy over all the time history results (same shapes, since its the same config), including the non-array ones
+    # (bl_state is a list) and the run diagnostics (stats, energy ledger, residuals, etc.)
+    for name, value in vars(FullSim).items():
+        if isinstance(value, np.ndarray) and np.shape(value)[-1:] == (Sim.t_vec_size,):
+            setattr(Sim, name, value)
+
+    for name in RESULT_VARIABLES + RUN_CACHE_EXTRAS:
+        if hasattr(FullSim, name):
+            setattr(Sim, name, getattr(FullSim, name))
+
+    # An ablating full simulation has its own (receded) copy of the wall, see tools_ablation.initialize_ablation()
+    if FullSim.ablation_model is not None:
+        Sim.Aerosurface = FullSim.Aerosurface
+
+    Sim.T_bulk = Sim.Aerosurface.capacitance @ FullSim.wall_temps / np.sum(Sim.Aerosurface.capacitance)
+    Sim.fallback_sim = FullSim
@@ -0,0 +1,256 @@
+"""
+Contains the incremental (online) simulation tools, for when the trajectory isn't known up front, i.e.
+hardware-in-the-loop rigs or replaying flight telemetry live. Instead of a whole trajectory file,
+(t, mach, alt) samples get pushed in as they show up, and the wall gets marched up to each one:
+
+    Sim = Thermal_Sim_1D(AeroSurf, None, AirModel(), x_location=0.2, deflection_angle_deg=7.0, t_step=0.001)
+    Sim.start_online(t0, mach0, alt0)
+    for t, mach, alt in telemetry:
+        wall_temps = Sim.advance_to(t, mach, alt)
+
+How it works:
+    - The Sim's arrays are shrunk down to a 2-step "window" (steps 0 and 1), so all of the usual step-by-step
+    (Sim, i) functions (aero, conduction solvers, ablation) run exactly as in run(), always at i = 0. After each
+    step the new wall state gets shifted back into step 0. So nothing grows with flight time.
+    - Mach and altitude are linearly interpolated between samples, and the wall is marched in fixed steps of
+    Sim.t_step, up to the last step at or before the sample time (the leftover carries over to the next sample)
+    - The history is kept in fixed-size ring buffers (the last history_size steps), see online_history(). The summary
+    statistics (Sim.stats, see tools_stats.py) cover the whole run
+
+For streams, serve_queue() and serve_socket() are asyncio front-ends that feed advance_to() from an
+asyncio.Queue, or a local socket (one "t,mach,alt" line in, one "t,T_hot,T_cold" line back).
+
+Notes:
+    - The stagnation heating models ("fay_riddell", "swept_cylinder", "sutton_graves") precompute over the
+    whole trajectory, so they can't be run online. Neither can prescribed (tabulated) boundary conditions.
+    - Samples at or before the current sim time are ignored (late/duplicate telemetry)
+    - To keep the per-step cost down, the oblique shock angle comes from the closed-form solution (same as 
+    run_waveform()) rather than the rootsolve run() uses, so results can differ very slightly from run()
+    - Latency per sample is the per-step cost (~0.1 ms with the default aero model) times the number of 
+    Sim.t_step steps between samples
+"""
+
+import asyncio
+
+import numpy as np
+
+from .tools_aerotherm import get_net_heat_flux, STAGNATION_HEATING_MODELS
+from .tools_conduction import get_new_wall_temps, stability_criterion_check
+from .tools_ablation import ablation_step
+from .tools_stats import initialize_stats, update_stats
+from .tools_energy import initialize_energy, update_energy
+
+
+# Heating models that precompute over the whole trajectory (see tools_aero.get_stagnation_history())
+TRAJECTORY_HEATING_MODELS = STAGNATION_HEATING_MODELS
+
+# Per-step results kept in the online history ring buffers
+ONLINE_HISTORY_VARIABLES = ["mach", "alt", "q_conv", "q_rad", "q_net", "h_coeff", "T_recovery"]
+
+# Default number of steps kept in the history ring buffers
+DEFAULT_HISTORY_SIZE = 10000
+
+
+
+def start_online(Sim, t0, mach0, alt0, history_size = DEFAULT_HISTORY_SIZE):
+    """
+    Sets a Simulation up for online stepping, starting from the wall at Sim.initial_temp at time t0.
+    Can be called again to restart.
+
+    Inputs:
+        Sim:            Simulation Object
+        t0:             float, start time [s]
+        mach0, alt0:    float, Mach number [] and altitude [m] at t0
+        history_size:   int, number of steps kept in the history ring buffers
+    Updates:
+        Sim is re-initialized as a 2-step window (see module docstring)
+        Sim.online_t:        float, current sim time [s]
+        Sim.online_sample:   (t, mach, alt) of the last sample pushed in
+        Sim.online_buffers:  dict of the history ring buffers
+        Sim.online_count:    int, number of steps taken
+        Sim.stats:           summary statistics over the whole online run (not just the history), see tools_stats.py
+        Sim.energy:          energy conservation ledger over the whole online run, see tools_energy.py
+    """
+
+    if Sim.aerothermal and Sim.aerothermal_model in TRAJECTORY_HEATING_MODELS:
+        raise ValueError(f'The "{Sim.aerothermal_model}" heating model precomputes over the whole trajectory, and can\'t be run online')
+    if Sim.bc_histories is not None:
+        raise ValueError("Prescribed (tabulated) boundary conditions aren't supported by the online simulation")
+    if Sim.conduction_solver == "rk23":
+        print('Note: the adaptive "rk23" solver still takes whole Sim.t_step steps online (substepping internally as needed)')
+
+    # Re-initialize as a 2-step window, without touching the Sim's own start/end times
+    t_start, t_end = Sim.t_start, Sim.t_end
+    Sim.t_start, Sim.t_end = t0, t0 + 1.5*Sim.t_step
+    try:
+        Sim.sim_initialize()
+    finally:
+        Sim.t_start, Sim.t_end = t_start, t_end
+
+    Sim.closed_form_shock = True
+
+    Sim.t_vec[:] = [t0, t0 + Sim.t_step]
+    Sim.mach[:]  = mach0
+    Sim.alt[:]   = alt0
+
+    Sim.online_t      = float(t0)
+    Sim.online_sample = (float(t0), float(mach0), float(alt0))
+    Sim.online_count  = 0
+
+    initialize_stats(Sim)
+    initialize_energy(Sim)
+
+    Sim.online_buffers = {name: np.zeros(history_size, dtype=float) for name in ["t"] + ONLINE_HISTORY_VARIABLES}
+    Sim.online_buffers["wall_temps"] = np.zeros((Sim.Aerosurface.n_tot, history_size), dtype=float)
+    if Sim.ablation_model is not None:
+        Sim.online_buffers["recession"] = np.zeros(history_size, dtype=float)
+
+
+
+def advance_to(Sim, t, mach, alt):
+    """
+    Marches the wall from the current sim time up to (the last Sim.t_step step at or before) time t, with
+    Mach and altitude linearly interpolated from the last sample to this one.
+
+    Inputs:
+        Sim:        Simulation Object (set up with start_online())
+        t:          float, sample time [s]
+        mach, alt:  float, Mach number [] and altitude [m] at time t
+    Outputs:
+        wall_temps: numpy float array, current wall temperatures (a view, copy it to keep it) [K]
+    Updates:
+        Sim.online_t, Sim.online_sample, the history ring buffers, Sim.stats, Sim.energy
+    """
+
+    t_prev, mach_prev, alt_prev = Sim.online_sample
+
+    if t <= t_prev:
+        return Sim.wall_temps[:,0]
+
+    # Linear interpolation weights from the last sample to this one
+    slope_mach = (mach - mach_prev) / (t - t_prev)
+    slope_alt  = (alt - alt_prev) / (t - t_prev)
+
+    t_step = Sim.t_step
+    buffers = Sim.online_buffers
+    size = buffers["t"].size
+
+    # Small tolerance, so float round-off doesn't skip a step that lands right on the sample
+    while Sim.online_t + t_step <= t + 1e-9*t_step:
+
+        t_i = Sim.online_t
+        t_next = t_i + t_step
+
+        Sim.t_vec[0], Sim.t_vec[1] = t_i, t_next
+        Sim.mach[0], Sim.mach[1] = mach_prev + slope_mach*(t_i - t_prev), mach_prev + slope_mach*(t_next - t_prev)
+        Sim.alt[0],  Sim.alt[1]  = alt_prev + slope_alt*(t_i - t_prev), alt_prev + slope_alt*(t_next - t_prev)
+
+        # Same step as run(), at i = 0
+        if Sim.aerothermal:
+            get_net_heat_flux(Sim, 0)
+
+        stability_criterion_check(Sim, 0)
+
+        get_new_wall_temps(Sim, 0)
+
+        if Sim.ablation_model is not None:
+            ablation_step(Sim, 0)
+
+        # Record step 0 (same layout as the run() result arrays: fluxes at t_i, evaluated at the wall temps at t_i)
+        j = Sim.online_count % size
+        buffers["t"][j] = t_i
+        for name in ONLINE_HISTORY_VARIABLES:
+            buffers[name][j] = getattr(Sim, name)[0]
+        buffers["wall_temps"][:,j] = Sim.wall_temps[:,0]
+        if Sim.ablation_model is not None:
+            buffers["recession"][j] = Sim.recession[0]
+
+        update_stats(Sim, 0, 1)
+        update_energy(Sim, 0, 1)
+
+        # Shift the new wall state back into step 0
+        Sim.wall_temps[:,0] = Sim.wall_temps[:,1]
+        if Sim.ablation_model is not None:
+            Sim.recession[0] = Sim.recession[1]
+
+        Sim.online_t = t_next
+        Sim.online_count += 1
+
+    Sim.online_sample = (float(t), float(mach), float(alt))
+
+    return Sim.wall_temps[:,0]
+
+
+
+def online_history(Sim):
+    """
+    The online history, oldest to newest, as copies of the ring buffers (the last history_size steps, at most).
+
+    Outputs:
+        history:    dict, of numpy float arrays "t", "mach", "alt", "q_conv", "q_rad", "q_net", "h_coeff",
+                    "T_recovery" (and "recession" if ablating), and "wall_temps" (2D, wall_temps[k,n])
+    """
+
+    size = Sim.online_buffers["t"].size
+    idx = np.arange(max(0, Sim.online_count - size), Sim.online_count) % size
+
+    return {name: values[..., idx] for name, values in Sim.online_buffers.items()}
+
+
+
+async def serve_queue(Sim, samples, results = None):
+    """
+    asyncio front-end, steps the Sim with the (t, mach, alt) samples from an asyncio.Queue until a None shows up.
+
+    Inputs:
+        Sim:        Simulation Object (set up with start_online())
+        samples:    asyncio.Queue, of (t, mach, alt) tuples, and None to stop
+        results:    asyncio.Queue, optional. Gets (sim time, wall temperatures copy) after every sample
+    """
+
+    while True:
+        sample = await samples.get()
+
+        if sample is None:
+            break
+
+        wall_temps = advance_to(Sim, *sample)
+
+        if results is not None:
+            results.put_nowait((Sim.online_t, wall_temps.copy()))
+
+
+
+async def serve_socket(Sim, host = "127.0.0.1", port = 8765, path = None):
+    """
+    asyncio front-end, serves the Sim over a local socket (TCP on host/port, or a unix socket if path is given).
+    Each "t,mach,alt" line in gets a "t_sim,T_hot,T_cold" line back. Runs until cancelled, i.e.
+
+        asyncio.run(serve_socket(Sim))
+
+    Inputs:
+        Sim:    Simulation Object (set up with start_online())
+    """
+
+    async def handle(reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    t, mach, alt = (float(v) for v in line.decode().split(","))
+                except ValueError:
+                    writer.write(b"error: expected t,mach,alt\n")
+                    continue
+
+                wall_temps = advance_to(Sim, t, mach, alt)
+                writer.write(f"{Sim.online_t},{wall_temps[0]},{wall_temps[-1]}\n".encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    if path is not None:
+        server = await asyncio.start_unix_server(handle, path=path)
+    else:
+        server = await asyncio.start_server(handle, host, port)
+
+    async with server:
+        await server.serve_forever()
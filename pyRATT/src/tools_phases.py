@@ -0,0 +1,171 @@
+"""
+Contains the flight phase detection, for skipping through the parts of a trajectory where (almost) nothing happens.
+
+Full trajectories have long stretches with basically no aerothermal heating (sitting on the pad, subsonic coast,
+drifting down under parachute), where run() would otherwise still do the full shock/Eckert/etc. evaluation
+at every single Sim.t_step. With Thermal_Sim_1D(quiet_step = ...), these "quiet" phases get marched with
+big steps instead:
+    1) Quiet phases are picked out up front from the trajectory, where the Mach number OR the freestream
+       dynamic pressure is below its threshold (see QUIET_THRESHOLDS, quiet_phase_mask())
+    2) In a quiet phase, the aero gets evaluated once per big step (of Sim.quiet_step seconds), and the wall is
+       marched across it with a single backward-Euler step, with the surface heat flux linearized about the
+       wall temperature (like the "semi_implicit" surface coupling), so it's stable for any step size.
+       If the wall turns out to be getting heated (convective heat flux above its threshold) after all, or the
+       big step changes a wall temperature by more than the "dT" threshold (the aero is only evaluated at the 
+       start of it, so it can't follow a wall that's changing quickly), the normal step is taken instead. 
+       Cooling on its own doesn't count, so a hot wall slowly cooling off during the coast/descent still gets
+       big steps.
+    3) As soon as the trajectory leaves the quiet phase, it's back to normal steps
+
+The result arrays still get filled at every Sim.t_step: the wall temperatures are linearly interpolated across
+each big step, and the aero results are held at the start of it (which is what got used).
+
+Notes:
+    - Conduction through the wall still gets resolved (unlike a lumped approximation), so the soak-back into
+    the structure after the heating ends, which is usually where the back-face peak temperature happens, is kept
+    - Not used with ablation or prescribed boundary conditions (their histories are per-step), or for
+    conduction-only runs (no aero to skip)
+    - Only for run(). run_waveform()/run_duhamel() already do the aero over the whole trajectory at once
+"""
+
+import numpy as np
+from scipy.linalg import solve_banded
+
+from .tools_aero import get_freestream
+from .tools_aerotherm import get_net_heat_flux, net_heat_flux_at, net_heat_flux_derivative_at
+from .tools_conduction import boundary_heat_fluxes, implicit_lhs_banded
+
+
+# Default quiet phase thresholds. Quiet if below the Mach OR the dynamic pressure [Pa] threshold, and
+# taking big steps as long as the convective heating [W/m^2] stays below its threshold and no wall temperature 
+# changes by more than dT [K] across a big step
+QUIET_THRESHOLDS = {"mach": 0.8, "qbar": 1000.0, "q_conv": 5000.0, "dT": 2.0}
+
+# Per-step aero results that get held across a big step
+HELD_VARIABLES = ["q_conv", "q_rad", "q_net", "h_coeff", "T_recovery", "T_inf", "T_t", "T_e", "T_te", "Re_inf", "qbar_inf"]
+
+
+
+def quiet_phase_mask(Sim):
+    """
+    Picks out the quiet phases of the trajectory, from the Mach number and freestream dynamic pressure.
+
+    Outputs:
+        quiet:  numpy bool array, True at the timesteps that are in a quiet phase
+    """
+
+    thresholds = {**QUIET_THRESHOLDS, **(Sim.quiet_thresholds or {})}
+
+    _, _, rho_inf, u_inf = get_freestream(np.clip(Sim.alt, -5004, 81020), Sim.AirModel, mach=Sim.mach)
+    qbar = 0.5*rho_inf*u_inf**2
+
+    return (Sim.mach < thresholds["mach"]) | (qbar < thresholds["qbar"])
+
+
+
+def initialize_phases(Sim):
+    """
+    Sets up the quiet phase skipping, if Sim.quiet_step is specified.
+
+    Updates:
+        Sim.quiet:          numpy bool array, see quiet_phase_mask() (None if not skipping)
+        Sim.quiet_end:      numpy int array, index of the end of the quiet phase each timestep is in
+        Sim.quiet_lhs:      dict, cached backward-Euler matrices for the big steps, by step size
+    """
+
+    Sim.quiet = None
+
+    if Sim.quiet_step is None:
+        return
+
+    if not Sim.aerothermal or Sim.ablation_model is not None or Sim.bc_histories is not None:
+        print("Note: quiet phase skipping isn't used for conduction-only, ablating or prescribed B.C. simulations")
+        return
+
+    Sim.quiet = quiet_phase_mask(Sim)
+    Sim.quiet_lhs = {}
+
+    # Index where each quiet phase ends (first loud step after it, or the last step)
+    n = Sim.t_vec_size
+    loud = np.append(np.flatnonzero(~Sim.quiet), n-1)
+    Sim.quiet_end = loud[np.searchsorted(loud, np.arange(n))]
+
+    quiet_time = np.count_nonzero(Sim.quiet[:-1]) * Sim.t_step
+    print(f"Quiet phases: {quiet_time:.1f} of {Sim.t_vec[-1] - Sim.t_vec[0]:.1f} s, marched with {Sim.quiet_step} s steps")
+
+
+
+def quiet_phase_step(Sim, i):
+    """
+    Takes a big step across a quiet phase, starting at timestep i (see module docstring). Falls back to a
+    normal step if the convective heating is above its threshold (cooling is fine), or if the big step changes
+    the wall temperatures by more than the dT threshold.
+
+    Outputs:
+        j:  int, the timestep the wall was marched to, or None to fall back to a normal step (the aero at i
+            has already been evaluated then, so the normal step doesn't need to redo it)
+    Updates:
+        Sim.wall_temps[:,i+1:j+1], and the aero results (held) at i to j-1
+    """
+
+    thresholds = {**QUIET_THRESHOLDS, **(Sim.quiet_thresholds or {})}
+
+    # Aero at the start of the step
+    get_net_heat_flux(Sim, i)
+
+    if Sim.q_conv[i] > thresholds["q_conv"]:
+        return None
+
+    K = max(1, int(round(Sim.quiet_step / Sim.t_step)))
+    j = min(i + K, Sim.quiet_end[i])
+
+    T_j = large_step_wall_temps(Sim, i, Sim.t_vec[j] - Sim.t_vec[i])
+
+    if np.max(np.abs(T_j - Sim.wall_temps[:,i])) > thresholds["dT"]:
+        return None
+
+    Sim.wall_temps[:,j] = T_j
+
+    # Fill in between
+    if j > i + 1:
+        w = (Sim.t_vec[i+1:j] - Sim.t_vec[i]) / (Sim.t_vec[j] - Sim.t_vec[i])
+        Sim.wall_temps[:,i+1:j] = Sim.wall_temps[:,[i]] + w*(Sim.wall_temps[:,[j]] - Sim.wall_temps[:,[i]])
+
+        for name in HELD_VARIABLES:
+            getattr(Sim, name)[i+1:j] = getattr(Sim, name)[i]
+        Sim.bl_state[i+1:j] = [Sim.bl_state[i]]*(j - i - 1)
+
+    return j
+
+
+
+def large_step_wall_temps(Sim, i, dt):
+    """
+    Backward-Euler step of dt of the wall temperatures, with the surface heat flux(es) linearized about the wall
+    temperature at i (see tools_conduction.semi_implicit_wall_temps()). Returns the wall temps dt later.
+    """
+
+    #Aliases
+    Wall = Sim.Aerosurface
+    T_n  = Sim.wall_temps[:,i]
+
+    # Big step matrices only depend on the step size (same every step, but the last one in each phase)
+    key = round(dt, 12)
+    if key not in Sim.quiet_lhs:
+        Sim.quiet_lhs[key] = implicit_lhs_banded(Wall, dt)
+
+    # Linearized surface heat flux at each aero face, q ~= a + b*T
+    w = np.array(boundary_heat_fluxes(Sim, 1.0))
+    T_star = T_n[[0,-1]]
+    b = net_heat_flux_derivative_at(Sim, i, T_star) * w
+    a = net_heat_flux_at(Sim, i, T_star) * w - b*T_star
+
+    lhs = Sim.quiet_lhs[key].copy()
+    lhs[1,0]  -= dt*b[0]
+    lhs[1,-1] -= dt*b[1]
+
+    rhs = Wall.capacitance * T_n
+    rhs[0]  += dt*a[0]
+    rhs[-1] += dt*a[1]
+
+    return solve_banded((1, 1), lhs, rhs)
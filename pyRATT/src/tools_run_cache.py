@@ -0,0 +1,238 @@
+"""
+Contains the (opt-in) run cache, so that re-running an identical simulation just loads the results from last time,
+instead of re-simulating them. With Thermal_Sim_1D(use_run_cache = True), run()/run_waveform()/run_duhamel() first
+look the simulation up in the cache, and save their results to it if it wasn't there.
+
+Runs are keyed (content-addressed) by a hash of everything that goes into them (see run_key()):
+    - the whole simulation configuration (Sim.get_config()), going down into the objects it's made of, so the wall
+    stack (including the material property entries actually used), air model, prescribed B.C. tables, etc.
+    - the trajectory *contents* (not the file name), and the simulation time points
+    - the run method and its options
+    - the pyRATT code itself (a hash of the source files), so results from older code never get re-used
+So changing anything at all is a miss, and a fresh run.
+
+Since sweeps (tools_stations.py, tools_surrogate.py, tools_convergence.py) build each of their simulations from
+Sim.get_config(), a base Sim with use_run_cache = True makes the whole sweep cached too, so an interrupted sweep
+that gets restarted skips straight over the runs it already finished.
+
+Each run gets saved as a single pickle file, named by its key. The cache is kept under a maximum total size, by
+throwing out the least recently used runs (cache hits bump the file's modification time).
+
+Notes:
+    - The cache lives in ~/.cache/pyratt/runs by default, set the PYRATT_RUN_CACHE_DIR environment variable
+    (or pass run_cache_dir) to put it somewhere else. It's safe to delete at any time.
+    - The maximum size is RUN_CACHE_MAX_MB, or the PYRATT_RUN_CACHE_MB environment variable
+    - run(events = ...) isn't cached, since the events are arbitrary functions (see obj_events.py)
+    - Writes are atomic (see tools_trajectory_cache.py), so parallel sweep workers are fine
+"""
+
+import glob
+import hashlib
+import os
+import pickle
+import types
+
+import numpy as np
+
+from .tools_events import RESULT_VARIABLES
+from .tools_trajectory_cache import _atomic_write
+
+
+# Default location of the cache
+DEFAULT_RUN_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pyratt", "runs")
+
+# Default maximum total size of the cache [MB]
+RUN_CACHE_MAX_MB = 2000.0
+
+# Non-result-array things a run sets on the Sim, that also get saved/restored
+RUN_CACHE_EXTRAS = ["t_vec_size", "stats", "stats_peak", "energy", "t_stop", "burned_through", "waveform_residuals", "duhamel_residuals",
+                    "runtime", "run_method"]
+
+# Attributes that don't change the results (file locations, cache settings, lazily-built helpers), left out of the key
+KEY_SKIP_ATTRIBUTES = ["use_run_cache", "run_cache_dir", "trajectory_file", "use_cache", "cache_dir", "reader", "reader_options",
+                        "filename", "lookup_table_csv", "Cp_interp"]
+
+# Hash of the pyRATT source code, computed once (see code_version())
+_CODE_VERSION = None
+
+
+
+def get_run_cache_dir(run_cache_dir = None):
+    """ Run cache directory, from the argument, the PYRATT_RUN_CACHE_DIR environment variable, or the default """
+
+    if run_cache_dir is None:
+        run_cache_dir = os.environ.get("PYRATT_RUN_CACHE_DIR", DEFAULT_RUN_CACHE_DIR)
+
+    return run_cache_dir
+
+
+
+def code_version():
+    """ Hash of all of the pyRATT source files, so that changing the code invalidates the cached runs """
+
+    global _CODE_VERSION
+
+    if _CODE_VERSION is None:
+        h = hashlib.sha1()
+        for filename in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+            with open(filename, "rb") as f:
+                h.update(os.path.basename(filename).encode() + f.read())
+        _CODE_VERSION = h.hexdigest()
+
+    return _CODE_VERSION
+
+
+
+def update_hash(h, obj, seen = None):
+    """
+    Adds a (deterministic) fingerprint of obj to the hashlib object h, going down into containers, numpy arrays,
+    and the attributes of objects (minus private ones and KEY_SKIP_ATTRIBUTES).
+    """
+
+    seen = set() if seen is None else seen
+
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes, np.generic)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+    elif isinstance(obj, np.ndarray):
+        h.update(f"ndarray:{obj.dtype.str}:{obj.shape};".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}[{len(obj)}];".encode())
+        for value in obj:
+            update_hash(h, value, seen)
+
+    elif isinstance(obj, dict):
+        h.update(f"dict[{len(obj)}];".encode())
+        for key in sorted(obj, key=repr):
+            if key in KEY_SKIP_ATTRIBUTES:
+                continue
+            update_hash(h, key, seen)
+            update_hash(h, obj[key], seen)
+
+    elif isinstance(obj, (types.FunctionType, types.BuiltinFunctionType, type)):
+        h.update(f"function:{obj.__module__}.{obj.__qualname__};".encode())
+
+    elif id(obj) in seen:
+        h.update(b"seen;")
+
+    elif hasattr(obj, "__dict__"):
+        seen.add(id(obj))
+        h.update(f"object:{type(obj).__qualname__};".encode())
+        update_hash(h, {key: value for key, value in vars(obj).items() if not key.startswith("_")}, seen)
+
+    else:
+        h.update(f"{type(obj).__qualname__}:{obj!r};".encode())
+
+
+
+def run_key(Sim, method, run_kwargs = None):
+    """
+    Content hash of everything that goes into a run (see module docstring)
+
+    Inputs:
+        Sim:        Simulation Object
+        method:     str, run method name ("run", "run_waveform", "run_duhamel")
+        run_kwargs: dict, optional. Options passed to the run method
+    Outputs:
+        key:        str, hex digest
+    """
+
+    h = hashlib.sha1()
+
+    update_hash(h, [code_version(), method, run_kwargs or {}])
+    update_hash(h, Sim.get_config())
+    update_hash(h, [Sim.t_vec, Sim.mach, Sim.alt])
+
+    return h.hexdigest()
+
+
+
+def load_cached_run(Sim, method, run_kwargs = None):
+    """
+    Loads the results of an identical run from the cache into Sim, if there is one.
+
+    Outputs:
+        hit:    bool, True if the results were loaded (and the run can be skipped)
+    Updates:
+        Sim.run_cache_key:  str, key of the run (used by save_cached_run())
+        Sim's result arrays, Sim.stats, etc. on a hit
+    """
+
+    Sim.run_cache_key = run_key(Sim, method, run_kwargs)
+    filename = os.path.join(get_run_cache_dir(Sim.run_cache_dir), Sim.run_cache_key + ".pkl")
+
+    try:
+        with open(filename, "rb") as f:
+            results = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return False
+
+    # Mark as recently used, for the LRU eviction
+    try:
+        os.utime(filename)
+    except OSError:
+        pass
+
+    for name, value in results.items():
+        if name == "wall_recession":
+            Sim.Aerosurface.set_recession(value)
+        else:
+            setattr(Sim, name, value)
+
+    print(f"Loaded the results of an identical {method}() from the run cache ({Sim.run_cache_key[:12]}), skipping the simulation")
+
+    return True
+
+
+
+def save_cached_run(Sim):
+    """ Saves the results of a run (keyed by the load_cached_run() lookup beforehand) to the cache, then trims the cache """
+
+    run_cache_dir = get_run_cache_dir(Sim.run_cache_dir)
+    os.makedirs(run_cache_dir, exist_ok=True)
+
+    results = {name: getattr(Sim, name) for name in RESULT_VARIABLES + RUN_CACHE_EXTRAS if hasattr(Sim, name)}
+    if Sim.ablation_model is not None:
+        results["wall_recession"] = Sim.Aerosurface.recession
+
+    _atomic_write(os.path.join(run_cache_dir, Sim.run_cache_key + ".pkl"), lambda f: pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+    trim_run_cache(run_cache_dir)
+
+
+
+def trim_run_cache(run_cache_dir = None, max_mb = None):
+    """
+    Throws out the least recently used runs until the cache is under its maximum size.
+
+    Inputs:
+        run_cache_dir:  str, optional. Cache directory, see get_run_cache_dir()
+        max_mb:         float, optional. Maximum total size [MB], defaults to the PYRATT_RUN_CACHE_MB environment
+                        variable, or RUN_CACHE_MAX_MB
+    """
+
+    run_cache_dir = get_run_cache_dir(run_cache_dir)
+    if max_mb is None:
+        max_mb = float(os.environ.get("PYRATT_RUN_CACHE_MB", RUN_CACHE_MAX_MB))
+
+    entries = []
+    for filename in glob.glob(os.path.join(run_cache_dir, "*.pkl")):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, filename))
+
+    total = sum(size for _, size, _ in entries)
+
+    # Oldest first
+    for _, size, filename in sorted(entries):
+        if total <= max_mb*1e6:
+            break
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        total -= size
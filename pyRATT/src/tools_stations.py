@@ -0,0 +1,70 @@
+"""
+Contains the tools for running a set of "stations" along a vehicle (i.e. a nose tip, plus a bunch of
+points downstream along the nosecone or fin) over the same trajectory, in one go.
+
+Each station is just a dict of the Thermal_Sim_1D settings that differ from a base simulation, i.e.
+    stations = [ Rocket.tip_station(),                                          # stagnation point
+                 {"x_location": 0.05}, {"x_location": 0.2}, {"x_location": 0.5} ]   # flat plate stations
+
+All the stations fly the same trajectory, so the freestream and stagnation point (post normal shock)
+states are only computed once, and shared (see tools_aero.get_stagnation_history()). Each station is 
+then solved over the whole trajectory at once with the vectorized solvers (run_waveform() by default).
+"""
+
+import time
+
+from .tools_catalog import catalog_runs, run_record
+
+
+def run_stations(Sim, stations, method = "run_waveform", catalog = None, **run_kwargs):
+    """
+    Runs a set of stations that share a base simulation's trajectory and settings.
+
+    Inputs:
+        Sim:        Simulation Object, the base simulation. Each station is built from Sim.get_config()
+        stations:   list of dicts, the settings that differ for each station (any Thermal_Sim_1D argument)
+        method:     string, which run method to use for each station ("run_waveform", "run_duhamel" or "run")
+        catalog:    str or True, optional. If given, all the stations get recorded in this run catalog (True for
+                    the default one), see tools_catalog.py
+        run_kwargs: passed on to the run method
+
+    Outputs:
+        Sims:       list of the (run) Simulation Objects, one per station
+    """
+
+    # Avoid circular import, since obj_simulation imports the tools modules
+    from .obj_simulation import Thermal_Sim_1D
+
+    Sims = []
+    start = time.time()
+
+    for n, station in enumerate(stations):
+
+        config = Sim.get_config()
+        config.update(station)
+
+        print(f"Station {n+1}/{len(stations)}: {station}")
+        StationSim = Thermal_Sim_1D(**config)
+        getattr(StationSim, method)(**run_kwargs)
+
+        Sims.append(StationSim)
+
+    print_station_summary(stations, Sims)
+
+    if catalog is not None:
+        catalog_runs([run_record(S, name=f"station {n+1}: {station}") for n, (station, S) in enumerate(zip(stations, Sims))],
+                        None if catalog is True else catalog)
+    print(f"    {len(stations)} stations done: {time.time()-start:.2f} s")
+
+    return Sims
+
+
+
+def print_station_summary(stations, Sims):
+    """ Prints the peak hot-wall temperature and heat flux of each station (from the summary statistics, so it works with store_history = False) """
+
+    print("\n Station Summary:")
+    print(f"    {'station':<50s} {'T_w max [K]':>12s} {'t [s]':>8s} {'q_net max [W/m^2]':>20s}")
+
+    for station, S in zip(stations, Sims):
+        print(f"    {str(station):<50s} {S.stats['T_max'][0]:>12.2f} {S.stats['t_T_max'][0]:>8.2f} {S.stats['q_net_max']:>20.4g}")
@@ -0,0 +1,161 @@
+"""
+Contains the streaming summary statistics, the handful of numbers that get pulled out of every run (peak
+temperatures and when, peak heat flux, heat load, time over the temperature limit, transition time),
+accumulated step by step as the simulation runs, into Sim.stats:
+
+    Sim = Thermal_Sim_1D(..., T_limit = 450.0, store_history = False)
+    Sim.run()
+    Sim.stats["T_max"][-1], Sim.stats["heat_load"]
+
+Since they don't need the full result arrays, they also work for online runs (see tools_online.py), and
+with Thermal_Sim_1D(store_history = False) the (multi-MB, for long trajectories) per-step result arrays get
+dropped at the end of the run, keeping only these. Handy for big sweeps.
+
+Stats (Sim.stats dict):
+    T_max:              numpy float array, peak temperature of each wall node [K]
+    t_T_max:            numpy float array, time of the peak temperature of each wall node [s]
+    q_net_max:          float, peak net heat flux [W/m^2]
+    t_q_net_max:        float, time of the peak net heat flux [s]
+    heat_load:          float, time-integrated net heat flux [J/m^2]
+    time_above_limit:   numpy float array, time each wall node spent above Sim.T_limit [s] (None if no T_limit)
+    t_transition:       float, first time the boundary layer was turbulent [s] (None if it never was)
+    t_end:              float, time the stats go up to [s]
+    n_steps:            int, number of steps taken
+
+Notes:
+    - Heat fluxes are held over each step (the same as the conduction solvers use them), and wall temperatures
+    are linear across each step, for the heat load and time above limit
+    - run_waveform()/run_duhamel() solve the whole trajectory at once, so their stats get computed from the
+    result arrays at the end instead (history_stats()), before they're dropped
+"""
+
+import numpy as np
+
+from .tools_events import RESULT_VARIABLES
+
+
+
+def initialize_stats(Sim):
+    """
+    Resets the statistics to the start of a run (wall at Sim.wall_temps[:,0], at Sim.t_vec[0]).
+
+    Updates:
+        Sim.stats:      dict, see module docstring
+        Sim.stats_peak: float, hottest wall temperature at the current step (just so update_stats() doesn't redo it)
+    """
+
+    T_0 = Sim.wall_temps[:,0]
+
+    Sim.stats = {   "T_max":            T_0.copy(),
+                    "t_T_max":          np.full(T_0.shape, Sim.t_vec[0]),
+                    "q_net_max":        -np.inf,
+                    "t_q_net_max":      None,
+                    "heat_load":        0.0,
+                    "time_above_limit": np.zeros(T_0.shape) if Sim.T_limit is not None else None,
+                    "t_transition":     None,
+                    "t_end":            Sim.t_vec[0],
+                    "n_steps":          0 }
+
+    Sim.stats_peak = np.max(T_0)
+
+
+
+def update_stats(Sim, i, j):
+    """
+    Adds the step from timestep i to timestep j (j = i+1, except for the quiet phase big steps) to the statistics.
+
+    Updates:
+        Sim.stats
+    """
+
+    stats = Sim.stats
+    t_i, t_j = Sim.t_vec[i], Sim.t_vec[j]
+
+    # Heat flux (evaluated at i, held over the step)
+    q = Sim.q_net[i]
+    stats["heat_load"] += q*(t_j - t_i)
+    if q > stats["q_net_max"]:
+        stats["q_net_max"], stats["t_q_net_max"] = q, t_i
+
+    if stats["t_transition"] is None and Sim.bl_state[i]:
+        stats["t_transition"] = t_i
+
+    # Node peak temperatures (wall temps are linear across the step, so the peak is at one of the ends)
+    T_i, T_j = Sim.wall_temps[:,i], Sim.wall_temps[:,j]
+    hotter = T_j > stats["T_max"]
+    np.copyto(stats["T_max"], T_j, where=hotter)
+    np.copyto(stats["t_T_max"], t_j, where=hotter)
+
+    # Only bother with the time above limit on steps that get above it (each step starts where the last one ended)
+    if Sim.T_limit is not None:
+        peak_i, Sim.stats_peak = Sim.stats_peak, T_j.max()
+        if max(peak_i, Sim.stats_peak) > Sim.T_limit:
+            stats["time_above_limit"] += (t_j - t_i) * fraction_above(T_i, T_j, Sim.T_limit)
+
+    stats["t_end"] = t_j
+    stats["n_steps"] += 1
+
+
+
+def fraction_above(T_i, T_j, T_limit):
+    """ Fraction of a step that linearly varying temperature(s) spent above T_limit """
+
+    dT = np.abs(T_j - T_i)
+    partial = (np.maximum(T_i, T_j) - T_limit) / np.where(dT > 0.0, dT, 1.0)
+
+    return np.where(np.minimum(T_i, T_j) >= T_limit, 1.0, np.clip(partial, 0.0, 1.0))
+
+
+
+def history_stats(Sim):
+    """
+    Whole-array version of initialize_stats() + update_stats() for every step, from the full result arrays,
+    for the run methods that solve the whole trajectory at once (run_waveform(), run_duhamel()).
+
+    Updates:
+        Sim.stats
+    """
+
+    initialize_stats(Sim)
+    stats = Sim.stats
+
+    t, T = Sim.t_vec, Sim.wall_temps
+    dt = np.diff(t)
+
+    if t.size < 2:
+        return
+
+    # Heat flux, held over each step (the last one never gets used)
+    q = Sim.q_net[:-1]
+    stats["heat_load"] = float(np.sum(q*dt))
+    k = np.argmax(q)
+    stats["q_net_max"], stats["t_q_net_max"] = q[k], t[k]
+
+    turbulent = np.flatnonzero(np.asarray(Sim.bl_state[:-1], dtype=bool))
+    if turbulent.size:
+        stats["t_transition"] = t[turbulent[0]]
+
+    k = np.argmax(T, axis=1)
+    stats["T_max"] = T[np.arange(T.shape[0]), k]
+    stats["t_T_max"] = t[k]
+
+    if Sim.T_limit is not None:
+        stats["time_above_limit"] = np.sum(dt * fraction_above(T[:,:-1], T[:,1:], Sim.T_limit), axis=1)
+
+    stats["t_end"] = t[-1]
+    stats["n_steps"] = t.size - 1
+
+
+
+def discard_history(Sim):
+    """
+    Drops the per-step result arrays (Thermal_Sim_1D(store_history = False)), keeping only Sim.stats.
+    Plotting/exporting the results won't work afterwards, but the Sim can be re-initialized and re-run as usual.
+    """
+
+    for name in RESULT_VARIABLES:
+        if hasattr(Sim, name):
+            setattr(Sim, name, None)
+
+    Sim.aero_history_cache = None
+    Sim.bc_histories = None
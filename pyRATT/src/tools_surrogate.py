@@ -0,0 +1,277 @@
+"""
+Contains the tools for building a surrogate (regression) model of the peak wall temperatures from a batch of
+simulations, so "what if" questions can be answered in microseconds instead of re-running the sim.
+
+The general idea:
+    1) Generate a Latin-hypercube design over the skin (first wall component) material and thickness, x_location, 
+       deflection angle, and a trajectory Mach scale factor (see FlightProfile.scaled())
+    2) Run a simulation at each design point, in parallel (each one is a modified copy of a base simulation)
+    3) Fit a Gaussian-process regression to the peak surface and peak bondline temperatures, which gives an
+       uncertainty (standard deviation) along with each prediction
+    4) Save it to a .npz, see obj_surrogate.ThermalSurrogate for loading and querying it
+
+i.e.
+    Surrogate = build_surrogate(Sim, n_samples = 200, materials = ["ALU6061", "FIBERGLASS"])
+    Surrogate.save("my_surrogate.npz")
+    mean, std = Surrogate.predict(thickness = 0.003, x_location = 0.2, deflection_angle_deg = 7.0, 
+                                    mach_scale = 1.1, material = "ALU6061")
+
+Notes:
+    - The bondline is the interface between the first and second wall components, or the back face of the
+    wall if there's only one component
+    - The GP uses a squared-exponential kernel with a lengthscale per input (continuous inputs are normalized to
+    [0, 1], the material is one-hot encoded), with the hyperparameters fit by maximizing the marginal likelihood
+    - The parallel runs use multiprocessing, so on Windows, anything calling this has to be inside an 
+    if __name__ == "__main__": block (like nogui_run.py)
+    - Only trust it inside the ranges it was trained on
+"""
+
+import contextlib
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import minimize
+from scipy.stats import qmc
+
+from .obj_simulation import Thermal_Sim_1D
+from .obj_surrogate import ThermalSurrogate
+from .obj_wallcomponents import WallStack
+from .tools_catalog import catalog_runs, run_record
+
+
+# Default ranges of the continuous design variables
+SURROGATE_RANGES = {    "thickness":            (0.001, 0.006),     # [m], of the first wall component
+                        "x_location":           (0.05, 0.5),        # [m]
+                        "deflection_angle_deg": (3.0, 15.0),        # [deg]
+                        "mach_scale":           (0.8, 1.2) }        # [], see FlightProfile.scaled()
+
+# Outputs the surrogate is fit to
+SURROGATE_OUTPUTS = ["T_surface_max", "T_bondline_max"]
+
+
+
+def latin_hypercube_design(n_samples, ranges = SURROGATE_RANGES, materials = None, seed = None):
+    """
+    Latin-hypercube design over the continuous ranges, with the materials (if any) assigned evenly, in a
+    random order, across the samples.
+
+    Inputs:
+        n_samples:  int, number of design points
+        ranges:     dict, {name: (min, max)} of the continuous design variables
+        materials:  str list, materials to spread over the design points (None keeps the base wall's material)
+        seed:       int, random seed, for repeatable designs
+    Outputs:
+        design:     list of dicts, {name: value} for each design point (including "material" if given)
+    """
+
+    names = list(ranges)
+    lower = np.array([ranges[n][0] for n in names], dtype=float)
+    upper = np.array([ranges[n][1] for n in names], dtype=float)
+
+    samples = qmc.scale(qmc.LatinHypercube(d=len(names), seed=seed).random(n_samples), lower, upper)
+
+    design = [dict(zip(names, row.tolist())) for row in samples]
+
+    if materials:
+        rng = np.random.default_rng(seed)
+        for point, m in zip(design, rng.permutation(np.arange(n_samples) % len(materials))):
+            point["material"] = materials[m]
+
+    return design
+
+
+
+def design_point_config(base_config, point):
+    """ Thermal_Sim_1D arguments for a single design point, as a modified copy of the base simulation's """
+
+    config = dict(base_config)
+    Wall = config["Aerosurface"]
+
+    # Swap out the first (skin) component's material/thickness, keep the rest of the stack
+    materials   = list(Wall.materials)
+    thicknesses = list(Wall.thicknesses)
+    materials[0]   = point.get("material", materials[0])
+    thicknesses[0] = point.get("thickness", thicknesses[0])
+
+    config["Aerosurface"] = WallStack(materials, thicknesses, list(Wall.node_counts),
+                                        interface_resistances   = Wall.interface_resistances,
+                                        mesh_types              = Wall.mesh_types,
+                                        stretch_factors         = Wall.stretch_factors)
+
+    if "mach_scale" in point:
+        config["Flight"] = config["Flight"].scaled(point["mach_scale"])
+
+    for name in ["x_location", "deflection_angle_deg"]:
+        if name in point:
+            config[name] = point[name]
+
+    return config
+
+
+
+def bondline_index(Wall):
+    """ Index of the bondline node, the first node of the second component (or the back face, for a single component wall) """
+
+    if len(Wall.materials) > 1:
+        return int(np.argmax(Wall.component_idx == 1))
+    return Wall.n_tot - 1
+
+
+
+def run_design_point(args):
+    """
+    Runs the simulation for a single design point, and returns its peak temperatures. Top level function, 
+    so that it can be sent off to the worker processes. Console output of the run is swallowed.
+
+    Inputs:
+        args:   tuple, (base_config, point, method, record), if record, the results also get the run catalog
+                row ("record", see tools_catalog.run_record())
+    Outputs:
+        results: dict, {output name: value}
+    """
+
+    base_config, point, method, record = args
+
+    Sim = Thermal_Sim_1D(**design_point_config(base_config, point))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        getattr(Sim, method)()
+
+    results = { "T_surface_max":    float(Sim.stats["T_max"][0]),
+                "T_bondline_max":   float(Sim.stats["T_max"][bondline_index(Sim.Aerosurface)]) }
+
+    if record:
+        results["record"] = run_record(Sim, name=f"design point: {point}")
+
+    return results
+
+
+
+def run_design(Sim, design, method = "run_waveform", max_workers = None, catalog = None):
+    """
+    Runs all of the design points (in parallel), as modified copies of Sim.
+
+    Inputs:
+        Sim:            Simulation Object, the base simulation
+        design:         list of dicts, see latin_hypercube_design()
+        method:         string, which run method to use ("run_waveform", "run", ...)
+        max_workers:    int, number of worker processes (None uses all the cores, 1 runs them here, in series)
+        catalog:        str or True, optional. If given, all the design points get recorded in this run catalog
+                        (True for the default one), in one go at the end, see tools_catalog.py
+    Outputs:
+        Y:  numpy float 2D array, Y[n, k] is output k (see SURROGATE_OUTPUTS) of design point n
+    """
+
+    print(f"Running {len(design)} design points...")
+    start = time.time()
+
+    jobs = [(Sim.get_config(), point, method, catalog is not None) for point in design]
+
+    if max_workers == 1:
+        results = list(map(run_design_point, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(run_design_point, jobs))
+
+    print(f"    Done: {time.time()-start:.2f} s")
+
+    if catalog is not None:
+        catalog_runs([r["record"] for r in results], None if catalog is True else catalog)
+
+    return np.array([[r[name] for name in SURROGATE_OUTPUTS] for r in results], dtype=float)
+
+
+
+def gp_kernel(X1, X2, lengthscales, signal_var):
+    """ Squared-exponential (ARD) kernel matrix between two sets of (encoded) inputs """
+
+    d = (X1[:,np.newaxis,:] - X2[np.newaxis,:,:]) / lengthscales
+    return signal_var * np.exp(-0.5*np.sum(d**2, axis=-1))
+
+
+
+def fit_gp(X, y):
+    """
+    Fits a Gaussian process to a single output, by maximizing the log marginal likelihood over the kernel
+    lengthscales, signal variance and noise variance (the output is normalized first).
+
+    Inputs:
+        X:  numpy float 2D array, encoded inputs (see ThermalSurrogate.encode())
+        y:  numpy float array, output values
+    Outputs:
+        gp: dict, everything ThermalSurrogate needs to make predictions with it
+    """
+
+    y_mean, y_std = np.mean(y), max(np.std(y), 1e-12)
+    y_n = (y - y_mean) / y_std
+    n, d = X.shape
+
+    def neg_log_likelihood(log_params):
+        lengthscales, signal_var, noise_var = np.exp(log_params[:d]), np.exp(log_params[d]), np.exp(log_params[d+1])
+
+        K = gp_kernel(X, X, lengthscales, signal_var) + (noise_var + 1e-10)*np.eye(n)
+        try:
+            c = cho_factor(K, lower=True)
+        except np.linalg.LinAlgError:
+            return 1e10
+
+        alpha = cho_solve(c, y_n)
+        return 0.5*y_n @ alpha + np.sum(np.log(np.diag(c[0])))
+
+    x0 = np.concatenate([np.log(0.5*np.ones(d)), [0.0, np.log(1e-3)]])
+    bounds = [(np.log(0.01), np.log(100.0))]*d + [(np.log(1e-2), np.log(1e2)), (np.log(1e-8), np.log(1.0))]
+    log_params = minimize(neg_log_likelihood, x0, method="L-BFGS-B", bounds=bounds).x
+
+    lengthscales, signal_var, noise_var = np.exp(log_params[:d]), np.exp(log_params[d]), np.exp(log_params[d+1])
+    K_inv = np.linalg.inv(gp_kernel(X, X, lengthscales, signal_var) + (noise_var + 1e-10)*np.eye(n))
+    alpha = K_inv @ y_n
+
+    # Leave-one-out residuals come for free with a GP, good check of how well it fits
+    loo_rmse = y_std * np.sqrt(np.mean((alpha / np.diag(K_inv))**2))
+
+    return {    "lengthscales": lengthscales,
+                "signal_var":   signal_var,
+                "noise_var":    noise_var,
+                "alpha":        alpha,
+                "K_inv":        K_inv,
+                "y_mean":       y_mean,
+                "y_std":        y_std,
+                "loo_rmse":     loo_rmse }
+
+
+
+def build_surrogate(Sim, n_samples = 100, ranges = SURROGATE_RANGES, materials = None, seed = None, 
+                        method = "run_waveform", max_workers = None):
+    """
+    Generates a design, runs it, and fits the surrogate (see module docstring).
+
+    Inputs:
+        Sim:        Simulation Object, the base simulation that all the design points are copies of
+        n_samples:  int, number of simulations to run
+        ranges:     dict, {name: (min, max)} of the continuous design variables, see SURROGATE_RANGES
+        materials:  str list, skin materials to include (None keeps the base wall's)
+        seed:       int, random seed for the design
+        method:     string, which run method each design point gets run with
+        max_workers:int, number of worker processes
+    Outputs:
+        Surrogate:  obj_surrogate.ThermalSurrogate
+    """
+
+    design = latin_hypercube_design(n_samples, ranges, materials, seed)
+    Y = run_design(Sim, design, method, max_workers)
+
+    Surrogate = ThermalSurrogate(ranges, materials)
+    X = Surrogate.encode(design)
+
+    print("Fitting surrogate...")
+    for k, name in enumerate(SURROGATE_OUTPUTS):
+        Surrogate.gps[name] = fit_gp(X, Y[:,k])
+        print(f"    {name}: leave-one-out RMS error {Surrogate.gps[name]['loo_rmse']:.3g} K")
+
+    Surrogate.X_train = X
+    Surrogate.Y_train = Y
+
+    return Surrogate
@@ -0,0 +1,108 @@
+"""
+Contains the binary trajectory cache, so that parsing big trajectory .csv's (i.e. the 21k+ row HiFIRE-5 
+profile) only happens once, instead of every time a FlightProfile gets made (in every process of a sweep).
+
+The parsed, unit-converted columns get saved as a single 2D .npy array, named by the hash of the file's
+contents (and which columns were pulled out). Loading memory-maps it, so it takes microseconds, and every
+process that loads the same trajectory shares the same (read-only) memory through the OS page cache, rather 
+than each one having its own copy.
+
+Hashing the whole file every time would defeat the point, so a small ".key" file, named by the file's path, 
+size and modification time, points to the content hash. If the file gets modified, its mtime changes, and
+the content gets re-hashed (and re-parsed, if the contents actually changed). Both keys also include the
+reader, its options and its code version (see tools_trajectory_readers.reader_version()), so changing how a file
+gets parsed re-parses it too.
+
+Notes:
+    - The cache lives in ~/.cache/pyratt/trajectories by default, set the PYRATT_CACHE_DIR environment 
+    variable (or pass cache_dir) to put it somewhere else. It's safe to delete at any time.
+    - Writes are atomic (write to a temp file, then rename), so parallel workers building the same cache are fine
+"""
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+
+# Default location of the cache
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pyratt", "trajectories")
+
+# Already loaded (memory-mapped) trajectories in this process, keyed the same as the .key files
+_LOADED = {}
+
+
+
+def get_cache_dir(cache_dir = None):
+    """ Trajectory cache directory, from the argument, the PYRATT_CACHE_DIR environment variable, or the default """
+
+    if cache_dir is None:
+        cache_dir = os.environ.get("PYRATT_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+    return cache_dir
+
+
+
+def load_cached_trajectory(filepath, columns, parse, cache_dir = None):
+    """
+    Loads a parsed trajectory from the cache, parsing and caching it first if needed.
+
+    Inputs:
+        filepath:   str, trajectory file
+        columns:    list, names of the columns being pulled out, and anything else that changes the parse (the
+                    reader, its options and code version). Part of the key, so these all get cached separately
+        parse:      function, parse(filepath) -> numpy float 2D array data[column, row], only called on a cache miss
+        cache_dir:  str, optional. Cache directory, see get_cache_dir()
+    Outputs:
+        data:       numpy float 2D array (read-only, memory-mapped), data[column, row]
+    """
+
+    cache_dir = get_cache_dir(cache_dir)
+    stat = os.stat(filepath)
+
+    # Quick key, from the path, size and modification time (no reading the file)
+    stat_key = hashlib.sha1(f"{os.path.abspath(filepath)}|{stat.st_size}|{stat.st_mtime_ns}|{columns}".encode()).hexdigest()
+
+    if stat_key in _LOADED:
+        return _LOADED[stat_key]
+
+    key_file = os.path.join(cache_dir, stat_key + ".key")
+
+    try:
+        with open(key_file, "r") as f:
+            data = np.load(os.path.join(cache_dir, f.read().strip() + ".npy"), mmap_mode="r")
+
+    except (OSError, ValueError):
+        # Cache miss, hash the contents, and parse if this content hasn't been seen before
+        os.makedirs(cache_dir, exist_ok=True)
+
+        with open(filepath, "rb") as f:
+            content_hash = hashlib.sha1(f.read() + repr(columns).encode()).hexdigest()
+
+        npy_file = os.path.join(cache_dir, content_hash + ".npy")
+        if not os.path.exists(npy_file):
+            _atomic_write(npy_file, lambda f: np.save(f, np.ascontiguousarray(parse(filepath), dtype=float)))
+
+        _atomic_write(key_file, lambda f: f.write(content_hash.encode()))
+
+        data = np.load(npy_file, mmap_mode="r")
+
+    _LOADED[stat_key] = data
+
+    return data
+
+
+
+def _atomic_write(filename, write):
+    """ Writes a file through a temporary file in the same directory, then renames it into place """
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
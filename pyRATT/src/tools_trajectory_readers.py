@@ -0,0 +1,266 @@
+"""
+Contains the trajectory file readers, which get the time, Mach and altitude histories out of the various
+flight simulation outputs. Readers are picked by name with FlightProfile(..., reader = name), or detected
+from the file (see detect_reader()).
+
+Implemented Readers
+------------------------------
+1) rasaero:     RASAero II Flight Data .csv export ("Time (sec)", "Mach Number", "Altitude (ft)")
+2) openrocket:  OpenRocket simulation .csv export (the "# Time (s),Altitude (m),..." commented header). Uses 
+                the "Mach number" column if it was exported, otherwise computes it from "Total velocity" and 
+                the standard atmosphere speed of sound.
+3) csv:         any .csv, with the columns mapped by reader options, i.e.
+                    FlightProfile("my_traj.csv", reader = "csv", 
+                                  reader_options = {"time": "t", "mach": "M", "alt": "h_km", "alt_units": "km"})
+4) parquet:     same as "csv", but for .parquet files (needs pyarrow or fastparquet installed)
+
+For in-memory arrays (sweeps, Monte Carlo, etc.), skip the files entirely, see FlightProfile.from_arrays().
+
+All readers only parse the columns that are actually needed, and the .csv readers read in chunks, so big files
+with lots of columns don't blow up in memory. New readers can be added with the register_trajectory_reader() 
+decorator.
+"""
+
+import hashlib
+import inspect
+
+import numpy as np
+import pandas as pd
+
+from . import constants
+
+
+# Registry of the implemented trajectory readers, see register_trajectory_reader()
+TRAJECTORY_READERS = {}
+
+# Rows per chunk, for the chunked .csv readers
+CSV_CHUNKSIZE = 100000
+
+# Unit conversions to meters, for the altitude column
+ALT_UNITS = {"m": 1.0, "ft": constants.FT2M, "km": 1000.0}
+
+# Unit conversions to m/s, for velocity columns
+VELOCITY_UNITS = {"m/s": 1.0, "ft/s": constants.FT2M, "km/h": 1.0/3.6}
+
+# Source code hashes of the readers, computed once (see reader_version())
+_READER_VERSIONS = {}
+
+
+
+def register_trajectory_reader(name):
+    """
+    Decorator that adds a trajectory reader to the registry. i.e.
+
+        @register_trajectory_reader("my_format")
+        def read_my_format(filepath, extra_columns, **options):
+            ...
+
+    All readers have the same interface, reader(filepath, extra_columns, **options), and return a 2D numpy 
+    float array, data[column, row], with rows of time [s], Mach [], altitude [m], then any extra_columns (as-is).
+    """
+
+    def decorator(reader):
+        TRAJECTORY_READERS[name] = reader
+        return reader
+
+    return decorator
+
+
+
+def read_trajectory(filepath, reader = None, extra_columns = (), **options):
+    """
+    Reads a trajectory file with the given (or detected) reader, and cleans it up for the rest of the code.
+
+    Outputs:
+        data:   numpy float 2D array, data[column, row], see register_trajectory_reader()
+    """
+
+    if reader is None:
+        reader = detect_reader(filepath)
+
+    if reader not in TRAJECTORY_READERS:
+        raise ValueError(f"Unsupported trajectory reader: {reader}. Supported readers: {list(TRAJECTORY_READERS)}")
+
+    data = np.asarray(TRAJECTORY_READERS[reader](filepath, list(extra_columns), **options), dtype=float)
+
+    return clean_trajectory(data)
+
+
+
+def reader_version(reader):
+    """
+    Hash of the source code that parses a trajectory with the given reader (this module, and the reader's own
+    module if it was registered from somewhere else). Part of the trajectory cache key, so that cached
+    trajectories get re-parsed when the parsing code changes.
+    """
+
+    if reader not in _READER_VERSIONS:
+        h = hashlib.sha1()
+        for filename in sorted({__file__, inspect.getsourcefile(TRAJECTORY_READERS[reader])}):
+            with open(filename, "rb") as f:
+                h.update(f.read())
+        _READER_VERSIONS[reader] = h.hexdigest()
+
+    return _READER_VERSIONS[reader]
+
+
+
+def clean_trajectory(data):
+    """ Drops rows with missing time/mach/alt, sorts by time, and floors the Mach number (Mach = 0.0 breaks a lot of the math later) """
+
+    data = data[:, np.all(np.isfinite(data[:3]), axis=0)]
+    data = data[:, np.argsort(data[0], kind="stable")]
+
+    data[1] = np.where(data[1] == 0.0, 0.001, data[1])
+
+    return data
+
+
+
+def detect_reader(filepath):
+    """ Picks a reader from the file extension and the first line of the file """
+
+    if str(filepath).lower().endswith(".parquet"):
+        return "parquet"
+
+    with open(filepath, "r", errors="replace") as f:
+        first_line = f.readline()
+
+    if first_line.startswith("#"):
+        return "openrocket"
+    if "Time (sec)" in first_line and "Mach Number" in first_line:
+        return "rasaero"
+
+    raise ValueError(f"Couldn't figure out the trajectory file format of {filepath}, specify the reader "
+                        f"(one of {list(TRAJECTORY_READERS)})")
+
+
+
+def read_csv_columns(filepath, columns, chunksize = CSV_CHUNKSIZE, **read_csv_kwargs):
+    """
+    Reads only the given columns of a .csv, in chunks, straight into numpy arrays.
+
+    Outputs:
+        data:   numpy float 2D array, data[column, row], in the order of columns
+    """
+
+    chunks = [chunk[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float).T
+                for chunk in pd.read_csv(filepath, usecols=columns, chunksize=chunksize, **read_csv_kwargs)]
+
+    return np.hstack(chunks) if chunks else np.empty((len(columns), 0))
+
+
+
+def unit_conversion(units, conversions, quantity):
+    """ Conversion factor for the given units, from one of the unit tables above. Unknown units are an error, not a guess """
+
+    if units not in conversions:
+        raise ValueError(f"Unsupported {quantity} units in trajectory: {units!r}. Supported units: {list(conversions)}")
+
+    return conversions[units]
+
+
+
+def mapped_columns(data, alt_units = "m", time_scale = 1.0, mach_from_velocity = False):
+    """ Converts the (time, mach or velocity, alt, extras...) columns of a mapped reader to the standard units """
+
+    data[2] *= unit_conversion(alt_units, ALT_UNITS, "altitude")
+    data[0] *= time_scale
+
+    if mach_from_velocity:
+        data[1] = mach_from_speed(data[1], data[2])
+
+    return data
+
+
+
+def mach_from_speed(speed, alt):
+    """ Mach number from a speed [m/s] and altitude [m], with the standard atmosphere speed of sound """
+
+    # Avoid import cost unless it's needed
+    from ambiance import Atmosphere
+
+    return speed / Atmosphere(np.clip(alt, -5004, 81020)).speed_of_sound
+
+
+
+@register_trajectory_reader("rasaero")
+def read_rasaero(filepath, extra_columns, chunksize = CSV_CHUNKSIZE):
+    """ RASAero II Flight Data .csv export """
+
+    data = read_csv_columns(filepath, ['Time (sec)', 'Mach Number', 'Altitude (ft)'] + extra_columns, chunksize)
+    data[2] *= constants.FT2M
+
+    return data
+
+
+
+@register_trajectory_reader("openrocket")
+def read_openrocket(filepath, extra_columns, chunksize = CSV_CHUNKSIZE):
+    """
+    OpenRocket simulation .csv export. The column names are in the first commented line, and event lines 
+    (i.e. "# Event APOGEE occurred at t=12.3 seconds") are skipped. Units are pulled out of the column names.
+    """
+
+    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+        header = f.readline().lstrip("#").strip()
+
+    # OpenRocket puts zero width spaces in unitless columns, i.e. "Mach number (​)"
+    names = [n.strip().replace("\u200b", "") for n in header.split(",")]
+    find = lambda prefix: next((n for n in names if n.lower().startswith(prefix.lower())), None)
+
+    time_col, alt_col, mach_col, vel_col = find("Time"), find("Altitude"), find("Mach number"), find("Total velocity")
+
+    if time_col is None or alt_col is None or (mach_col is None and vel_col is None):
+        raise ValueError("OpenRocket export needs the Time, Altitude, and either Mach number or Total velocity columns")
+
+    columns = [time_col, mach_col if mach_col is not None else vel_col, alt_col] + extra_columns
+
+    data = read_csv_columns(filepath, columns, chunksize, comment="#", header=None, names=names)
+
+    alt_units = alt_col.split("(")[-1].rstrip(")").strip()
+    data[2] *= unit_conversion(alt_units, ALT_UNITS, "altitude")
+
+    if mach_col is None:
+        vel_units = vel_col.split("(")[-1].rstrip(")").strip()
+        data[1] = mach_from_speed(data[1] * unit_conversion(vel_units, VELOCITY_UNITS, "velocity"), data[2])
+
+    return data
+
+
+
+@register_trajectory_reader("csv")
+def read_mapped_csv(filepath, extra_columns, time = "time", mach = None, alt = "alt", velocity = None, 
+                    alt_units = "m", time_scale = 1.0, chunksize = CSV_CHUNKSIZE, **read_csv_kwargs):
+    """
+    Generic .csv, with the time/mach/alt column names given as reader options. If there's no Mach column, 
+    give a velocity [m/s] column instead and it gets computed from the standard atmosphere.
+    """
+
+    if mach is None and velocity is None:
+        raise ValueError('The "csv" trajectory reader needs either a mach or velocity column specified')
+
+    data = read_csv_columns(filepath, [time, mach if mach is not None else velocity, alt] + extra_columns, chunksize, **read_csv_kwargs)
+
+    return mapped_columns(data, alt_units, time_scale, mach_from_velocity = mach is None)
+
+
+
+@register_trajectory_reader("parquet")
+def read_mapped_parquet(filepath, extra_columns, time = "time", mach = None, alt = "alt", velocity = None, 
+                        alt_units = "m", time_scale = 1.0):
+    """ Same as the "csv" reader, for .parquet files. Only the needed columns get read. """
+
+    if mach is None and velocity is None:
+        raise ValueError('The "parquet" trajectory reader needs either a mach or velocity column specified')
+
+    columns = [time, mach if mach is not None else velocity, alt] + extra_columns
+
+    try:
+        df = pd.read_parquet(filepath, columns=columns)
+    except ImportError:
+        raise ImportError('Reading .parquet trajectories needs pyarrow (or fastparquet) installed, i.e. "pip install pyarrow"')
+
+    data = df[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float).T
+
+    return mapped_columns(data, alt_units, time_scale, mach_from_velocity = mach is None)
@@ -0,0 +1,151 @@
+"""
+Contains the waveform-relaxation solver, which solves the whole trajectory at once instead of
+step-by-step.
+
+The aero side of things only "sees" the wall through the hot-wall temperature (the Eckert reference
+temperature, and the T_recovery - T_w and radiation driving temperature differences), and only weakly.
+So instead of alternating aero -> conduction at every single timestep (lots of tiny, slow, scalar Python
+calls), this alternates over entire histories:
+    1) evaluate h, T_recovery, etc. over the whole trajectory at once (numpy arrays), at the current
+       guess for the hot-wall temperature history
+    2) solve the conduction over the whole trajectory, with the aero state from 1) held fixed, but with
+       the convection and radiation still responding to the wall temperature as it's marched
+    3) repeat until the hot-wall temperature history stops changing
+
+The first guess is the wall sitting at its initial temperature, so the first iteration is a cold-wall
+aero pass. It usually only takes a few iterations, since h is only weakly dependent on T_w.
+
+Step 2) is where the time goes. For the "explicit" and "implicit" conduction solvers (with nothing moving the mesh
+or prescribing the faces), the conduction is linear in the surface heat flux, so it gets batched: the wall's impulse 
+response is built once (cached, see tools_duhamel.py), the hot-wall temperature is marched through it with only 
+scalar arithmetic per step (the older steps get summed a block at a time with FFTs), and the through-wall temperatures
+come out of a single FFT convolution at the end. The rest (Runge-Kutta solvers, ablation, prescribed B.C.s) still 
+step the full conduction solver through a per-step Python loop, which is ~20 us per step.
+
+Notes:
+    - For arrays, the oblique shock angle comes from the closed-form beta-theta-mach solution, rather than
+    the rootsolve used in the step-by-step run(), so results can differ very slightly from run()
+    - tools_duhamel.run_duhamel() is the same batched march, without the per-step fallback
+"""
+
+import time
+
+import numpy as np
+from scipy.signal import fftconvolve
+
+from . import constants
+from .tools_aerotherm import aerothermal_heatflux_history, net_heat_flux_at
+from .tools_conduction import get_new_wall_temps, stability_criterion_check, implicit_lhs_banded
+from .tools_ablation import initialize_ablation, ablation_step
+from .tools_duhamel import impulse_response, march_surface_temps
+
+
+# Conduction solvers that hold the surface heat flux fixed across each step, so step 2) can be batched (see module docstring)
+BATCHED_SOLVERS = ["explicit", "implicit"]
+
+
+
+def march_frozen_aero(Sim):
+    """
+    Marches the wall temperatures over the whole trajectory with the Sim's conduction solver, with the aero
+    state (Sim.h_coeff, Sim.T_recovery, Sim.T_inf) held at whatever is currently in the Sim. The convection
+    and radiation still get re-evaluated at the wall temperature each step (see net_heat_flux_at()).
+
+    Updates:
+        Sim.wall_temps, Sim.q_net (and Sim.recession, if ablating)
+    """
+
+    if Sim.conduction_solver in BATCHED_SOLVERS and Sim.ablation_model is None and Sim.bc_histories is None:
+        march_frozen_aero_batched(Sim)
+        return
+
+    # Every pass starts from the un-ablated wall
+    if Sim.ablation_model is not None:
+        initialize_ablation(Sim)
+        if Sim.conduction_solver == "implicit":
+            Sim.implicit_lhs = implicit_lhs_banded(Sim.Aerosurface, Sim.t_step)
+
+    for i in range(Sim.t_vec_size - 1):
+
+        Sim.q_net[i] = net_heat_flux_at(Sim, i, Sim.wall_temps[0,i])
+
+        stability_criterion_check(Sim, i)
+
+        get_new_wall_temps(Sim, i)
+
+        if Sim.ablation_model is not None:
+            ablation_step(Sim, i)
+
+
+
+def march_frozen_aero_batched(Sim):
+    """
+    Same as march_frozen_aero(), but with the conduction done through the wall's (cached) impulse response 
+    instead of stepping the solver (see module docstring). Gives the same answer, just faster.
+
+    Updates:
+        Sim.wall_temps, Sim.q_net
+    """
+
+    n_t = Sim.t_vec_size
+    g = impulse_response(Sim.Aerosurface, Sim.t_step, n_t, Sim.wall_thermal_bcs, Sim.conduction_solver)
+
+    # Worst case (highest h) of the per-step stability check
+    stability_criterion_check(Sim, int(np.argmax(Sim.h_coeff)))
+
+    _, Sim.q_net[:] = march_surface_temps(Sim, g[0,:])
+
+    Sim.wall_temps[:,1:] = Sim.initial_temp + fftconvolve(g, Sim.q_net[np.newaxis,:], axes=1)[:, :n_t-1]
+
+
+
+def run_waveform(Sim, T_tol = 0.05, max_iter = 20):
+    """
+    Runs an aerothermal simulation using waveform relaxation (see module docstring), instead of the
+    time-marching loop in Thermal_Sim_1D.run(). Fills in the same result arrays.
+
+    Inputs:
+        Sim:        Simulation Object (initialized, not yet run)
+        T_tol:      float, iterations stop once the hot-wall temperature history changes by less than this [K]
+        max_iter:   int, max number of iterations
+
+    Updates:
+        Sim.wall_temps, Sim.q_conv, Sim.q_rad, Sim.q_net, and everything the aero models write out
+        Sim.waveform_residuals, list of the max hot-wall temperature change at each iteration
+    """
+
+    if not getattr(Sim, "aerothermal", True):
+        raise ValueError('run_waveform() needs a "q_in_aerothermal" hot face, conduction-only simulations should just use run()')
+
+    print("Running Simulation (Waveform Relaxation)...")
+    start = time.time()
+
+    T_w = np.full(Sim.t_vec_size, Sim.initial_temp, dtype=float)
+    Sim.waveform_residuals = []
+
+    for n in range(max_iter):
+
+        # 1) Aero over the whole trajectory, at the current wall temperature history
+        aerothermal_heatflux_history(Sim, T_w)
+
+        # 2) Conduction over the whole trajectory
+        Sim.wall_temps[:,0] = Sim.initial_temp
+        march_frozen_aero(Sim)
+
+        # 3) Convergence check
+        dT = np.abs(Sim.wall_temps[0,:] - T_w)
+        residual = np.max(dT)
+        Sim.waveform_residuals.append(residual)
+        T_w = Sim.wall_temps[0,:].copy()
+
+        print(f"    Iteration {n+1}: max change in T_w = {residual:.3g} K (at t = {Sim.t_vec[np.argmax(dT)]:.2f} s), {time.time()-start:.2f} s elapsed")
+
+        if residual < T_tol:
+            break
+    else:
+        print(f"~~WARNING~~: Waveform relaxation did not converge in {max_iter} iterations (residual {residual:.3g} K)")
+
+    # Final heat fluxes, consistent with the final wall temperatures
+    Sim.q_conv[:] = Sim.h_coeff*(Sim.T_recovery - T_w)
+    Sim.q_rad[:]  = constants.SB_CONST*Sim.Aerosurface.elements[0].emis*(Sim.T_inf**4 - T_w**4)
+    Sim.q_net[:]  = Sim.q_conv + Sim.q_rad
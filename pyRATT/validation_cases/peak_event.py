@@ -0,0 +1,91 @@
+import sys
+import os
+import numpy as np
+import time
+
+#todo: this is super goofy- find better way to do this
+sys.path.append(os.path.dirname(os.getcwd()))
+
+try:
+    from pyRATT.src.obj_simulation import Thermal_Sim_1D
+    from pyRATT.src.obj_flightprofile import FlightProfile
+    from pyRATT.src.obj_wallcomponents import WallStack
+    from pyRATT.src.materials_gas import AirModel
+    from pyRATT.src.obj_events import peak_passed
+except:
+    print("\n Run this script from the main pyRATT directory using 'python3 validation_cases/peak_event.py")
+    quit()
+
+
+
+'''
+
+USAGE:  From the main pyRATT directory run: "python3 validation_cases/peak_event.py"
+
+
+ABOUT:
+    This checks that the peak_passed() event doesn't stop a run before the real peak.
+
+    The example trajectory (example_files/example_ascent_traj_M2245_to_M1378.csv) eases off for a few seconds
+    before its main heat pulse, so the hot wall of the example nosecone (1 cm SS316, x = 0.2 m) turns around at
+    ~5-6 s on a small hump, before peaking at ~497 K at ~11.7 s. 
+
+    The full run is compared to one stopped by peak_passed(). The stopped run has to make it past the real
+    peak, and get the same peak temperature and time as the full run.
+
+    What it shows: the event goes off at ~14.9 s (once the heat flux has dropped below 20% of its peak and the
+    wall has cooled 1 K), and the peak matches the full run exactly. 
+
+'''
+
+
+
+################################# MAIN ########################################
+
+
+if __name__ == "__main__":
+
+
+    ###### INPUTS/PARAMETERS ######
+
+    # Same as example_files/example_nosecone.py
+    def example_sim():
+        AeroSurf = WallStack(materials="SS316", thicknesses=0.01, node_counts = 10)
+        Flight   = FlightProfile( "example_files/example_ascent_traj_M2245_to_M1378.csv" )
+        return Thermal_Sim_1D(AeroSurf, Flight, AirModel(),
+                                x_location = 0.2, 
+                                deflection_angle_deg = 7.0, 
+                                t_step = 0.005,
+                                t_end = 25.1,
+                                initial_temp = 281.25,
+                                boundary_layer_model = 'transition')
+
+
+
+    ##### SETUP AND SIMULATIONS #######
+
+    start=time.time()
+
+    FullSim = example_sim()
+    FullSim.run()
+
+    PeakEvent = peak_passed()
+    StoppedSim = example_sim()
+    StoppedSim.run(events = [PeakEvent])
+
+    print("Elapsed Time for Sim Runs: ", time.time() - start)
+
+
+
+    ################################# RESULTS ########################################
+
+    i_peak = np.argmax(FullSim.wall_temps[0])
+    T_peak, t_peak = FullSim.wall_temps[0, i_peak], FullSim.t_vec[i_peak]
+
+    print(f"\nFull run:      hot wall peak of {T_peak:.2f} K at t = {t_peak:.3f} s")
+    print(f"Stopped run:   hot wall peak of {PeakEvent.state['T_peak']:.2f} K at t = {PeakEvent.state['t_peak']:.3f} s, stopped at t = {StoppedSim.t_stop:.3f} s")
+
+    if StoppedSim.t_stop > t_peak and np.isclose(PeakEvent.state["T_peak"], T_peak):
+        print("PASS: the run was stopped after the real peak")
+    else:
+        print("FAIL: the run was stopped before the real peak")
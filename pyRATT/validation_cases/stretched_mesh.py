@@ -0,0 +1,122 @@
+import sys
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+import time
+
+#todo: this is super goofy- find better way to do this
+sys.path.append(os.path.dirname(os.getcwd()))
+
+try:
+    from pyRATT.src.obj_wallcomponents import WallStack
+    from pyRATT.src.tools_conduction import march_prescribed_flux
+except:
+    print("\n Run this script from the main pyRATT directory using 'python3 validation_cases/stretched_mesh.py")
+    quit()
+
+
+
+'''
+
+USAGE:  From the main pyRATT directory run: "python3 validation_cases/stretched_mesh.py"
+
+
+ABOUT:
+    This checks how many nodes the stretched (non-uniform) wall meshes save, compared to the usual uniform mesh.
+
+    A 1 cm carbon fiber wall gets a constant 50 kW/m^2 on its hot face (adiabatic back face), so there's a steep
+    temperature gradient right at the hot face. The hot and back face temperatures of a few coarse meshes are 
+    compared to a 400-node uniform reference mesh at several times:
+        - 40 nodes, uniform (the "usual" mesh)
+        - 8 nodes, uniform
+        - 8 nodes, geometric (stretch factor 1.3)
+        - 8 nodes, tanh (stretch factor 2.0)
+
+    What it shows (implicit solver, 5 ms steps):
+        - The 8-node uniform mesh runs 17 K cold at the hot face at 2 s, and is still ~4 K off at 30 s.
+        - The 8-node geometric mesh is within ~0.1 K at 2 s and ~2.3 K at 30 s (the big back elements catch up 
+        with it once the heat soaks through), with the back face within ~0.5 K. 
+        - The 40-node uniform mesh is still the most accurate (<0.5 K), so stretching buys the most when the 
+        node count is tight and the gradient is steep.
+        - The 8-node tanh mesh clusters nodes at both faces, which wastes them here (7-10 K hot). It's meant 
+        for components with interfaces on both sides.
+    For a conductive wall (e.g. 1 cm SS316 at 150 kW/m^2) everything is within ~1 K and stretching doesn't buy much.
+
+'''
+
+
+
+################################# MAIN ########################################
+
+
+if __name__ == "__main__":
+
+
+    ###### INPUTS/PARAMETERS ######
+
+    material    = "CARBONFIBER"
+    thickness   = 0.01      #[m]
+    q_0         = 50000.0   #[W/m^2] Heat flux into the hot face
+    T_i         = 300.0     #[K] Initial Material Temperature
+    t_step      = 0.005     #[s]
+    t_end       = 30.0      #[s]
+
+    # Times to compare at
+    t_compare = np.array([2.0, 5.0, 10.0, 20.0, 30.0])
+
+    # Reference mesh, and the meshes being checked
+    reference_mesh = {"node_counts": 400}
+    meshes = {  "40 uniform":       {"node_counts": 40},
+                "8 uniform":        {"node_counts": 8},
+                "8 geometric 1.3":  {"node_counts": 8, "mesh_types": "geometric", "stretch_factors": 1.3},
+                "8 tanh 2.0":       {"node_counts": 8, "mesh_types": "tanh", "stretch_factors": 2.0} }
+
+    ### DERIVED VALUES
+    n_steps = int(round(t_end/t_step))
+    q_net   = np.full(n_steps+1, q_0)
+    i_compare = np.round(t_compare/t_step).astype(int)
+    t_vec   = np.arange(n_steps+1)*t_step
+
+
+
+    ##### SETUP AND SIMULATIONS #######
+
+    def hot_and_back_temps(**mesh):
+        """ Hot and back face temperature histories for a given mesh """
+        Wall = WallStack(materials=material, thicknesses=thickness, **mesh)
+        wall_temps = march_prescribed_flux(Wall, q_net, t_step, T_i, conduction_solver="implicit")
+        return wall_temps[[0,-1],:]
+
+    start=time.time()
+    T_ref = hot_and_back_temps(**reference_mesh)
+    T_meshes = {name: hot_and_back_temps(**mesh) for name, mesh in meshes.items()}
+    print("Elapsed Time for Sim Runs: ", time.time() - start)
+
+
+
+    ################################# RESULTS ########################################
+
+    print(f"\nError vs. the {reference_mesh['node_counts']}-node uniform reference [K], at t = {t_compare} s")
+    for name, T in T_meshes.items():
+        err = T[:,i_compare] - T_ref[:,i_compare]
+        print(f"    {name:<16} hot face: {np.round(err[0], 2)}    back face: {np.round(err[1], 2)}")
+
+
+
+    ################################# PLOTTING ########################################
+
+    fig, axs = plt.subplots(2, 1, sharex=True)
+
+    for face, ax in enumerate(axs):
+        for name, T in T_meshes.items():
+            ax.plot(t_vec, T[face,:] - T_ref[face,:], label = name)
+
+        ax.set_ylabel("Error vs. Reference (K)")
+        ax.set_title(["Hot Face", "Back Face"][face])
+        ax.grid()
+
+    axs[0].legend()
+    axs[1].set_xlabel("Time (s)")
+    fig.suptitle(f"Stretched Meshes - {thickness*100:g} cm {material}, {q_0/1000:g} kW/m^2")
+
+    plt.show()